@@ -4,64 +4,97 @@ Comprehensive KiCad Schematic Analyzer
 Analyzes wrx-power-can-hat-MANUAL.kicad_sch and creates component inventory
 """
 
-import re
 import json
 from pathlib import Path
 from collections import defaultdict
 
-def parse_kicad_schematic(filepath):
-    """Parse KiCad schematic and extract all components"""
+from kicad_tools.cache import FileSnapshot, cached_result, load_cached
+from kicad_tools.columnar import ColumnarFile, cached_export, export_schematic
+from kicad_tools.rules import RULES_DIR, check_parsed, failures, format_results, load_rules
+from kicad_tools.schematic import sheet_items
+
+RULES_FILE = RULES_DIR / "wrx-power-can-hat.design_rules"
+
+def _symbol_record(sym):
+    """Component dict for one placed symbol, read from its own block only"""
+    at = sym.floats('at') or (0.0, 0.0)
+    properties = sym.properties()
+    return {
+        'reference': properties.get('Reference', '?'),
+        'value': properties.get('Value', '?'),
+        'lib_id': sym.get('lib_id'),
+        'position': (at[0], at[1]),
+        'rotation': at[2] if len(at) > 2 else 0.0,
+        'unit': int(sym.get('unit', 1)),
+        'mirror': sym.get('mirror'),
+        'uuid': sym.get('uuid'),
+        'properties': properties,
+        'pins': {pin[1]: pin.get('uuid') for pin in sym.children('pin') if len(pin) > 1},
+    }
 
+def _extract(parsed):
     components = []
     labels = []
-    global_labels = []
-    wires = []
-
-    with open(filepath, 'r', encoding='utf-8') as f:
-        content = f.read()
-
-    # Extract all symbol instances (components)
-    symbol_pattern = r'\(symbol\s+\(lib_id\s+"([^"]+)"\)\s+\(at\s+([\d.]+)\s+([\d.]+)'
-    for match in re.finditer(symbol_pattern, content):
-        lib_id = match.group(1)
-        x = match.group(2)
-        y = match.group(3)
-
-        # Find the reference and value for this symbol
-        start_pos = match.start()
-        # Search forward from symbol start to find reference
-        ref_match = re.search(r'\(property\s+"Reference"\s+"([^"]+)"', content[start_pos:start_pos+2000])
-        val_match = re.search(r'\(property\s+"Value"\s+"([^"]+)"', content[start_pos:start_pos+2000])
-
-        reference = ref_match.group(1) if ref_match else "?"
-        value = val_match.group(1) if val_match else "?"
-
-        components.append({
-            'reference': reference,
-            'value': value,
-            'lib_id': lib_id,
-            'position': (float(x), float(y))
-        })
-
-    # Extract local labels
-    label_pattern = r'\(label\s+"([^"]+)"\s+\(at\s+([\d.]+)\s+([\d.]+)'
-    for match in re.finditer(label_pattern, content):
-        labels.append({
-            'name': match.group(1),
-            'position': (float(match.group(2)), float(match.group(3)))
-        })
-
-    # Extract global labels
-    global_label_pattern = r'\(global_label\s+"([^"]+)"'
-    for match in re.finditer(global_label_pattern, content):
-        global_labels.append(match.group(1))
+    global_labels = set()
+
+    for node in sheet_items(parsed.root):
+        if node.tag == 'symbol' and node.get('lib_id') is not None:
+            components.append(_symbol_record(node))
+        elif node.tag == 'label' and len(node) > 1:
+            at = node.floats('at') or (0.0, 0.0)
+            labels.append({
+                'name': node[1],
+                'position': (at[0], at[1])
+            })
+        elif node.tag == 'global_label' and len(node) > 1:
+            global_labels.add(node[1])
+
+    return {
+        'components': components,
+        'labels': labels,
+        'global_labels': sorted(global_labels)  # Unique global labels
+    }
+
+def parse_kicad_schematic(filepath):
+    """
+    Parse KiCad schematic and extract all components
+
+    One pass of the shared parser gives every symbol as its own block, so
+    properties, pin UUIDs, unit and mirror come from that symbol's real
+    extent. The result is cached per file content.
+    """
+    return cached_result(filepath, 'analyze-schematic', _extract)
+
+def load_schematic_data(columnar_file):
+    """Rebuild the parse_kicad_schematic() summary from a columnar export"""
+
+    with ColumnarFile(columnar_file) as columns:
+        components = [{
+            'reference': row['reference'] or '?',
+            'value': row['value'] or '?',
+            'lib_id': row['lib_id'],
+            'position': (row['x'], row['y'])
+        } for row in columns.rows('components', ('reference', 'value', 'lib_id', 'x', 'y'))]
+        names, kinds = columns['labels']['name'], columns['labels']['kind']
+        xs, ys = columns['labels']['x'], columns['labels']['y']
+        labels = [{'name': names[i], 'position': (xs[i], ys[i])}
+                  for i, kind in enumerate(kinds) if kind == 'label']
+        global_labels = sorted({names[i] for i, kind in enumerate(kinds) if kind == 'global_label'})
 
     return {
         'components': components,
         'labels': labels,
-        'global_labels': list(set(global_labels))  # Unique global labels
+        'global_labels': global_labels
     }
 
+def analyze(schematic_path, rules):
+    """
+    (load_schematic_data() summary, rule results) of one schematic, both
+    taken from the same parse so they describe the same symbols
+    """
+    snapshot = FileSnapshot(schematic_path)
+    return load_schematic_data(cached_export(snapshot)), check_parsed(snapshot, rules)
+
 def categorize_components(components):
     """Categorize components by type"""
 
@@ -98,90 +131,64 @@ def categorize_components(components):
 
     return dict(categories)
 
-def check_design_requirements(data):
-    """Check against design requirements from SCHEMATIC_DESIGN.md"""
-
-    required_components = {
-        'Input Protection': {
-            'F1': {'type': 'Fuse', 'value': '5A', 'required': True},
-            'D1': {'type': 'Diode', 'value': 'SMBJ18A', 'required': True},
-            'D2': {'type': 'Diode', 'value': 'SS34', 'required': True},
-            'LED1': {'type': 'LED', 'value': 'Green', 'required': True},
-            'R1': {'type': 'Resistor', 'value': '1k', 'required': True},
-        },
-        'Power Supply': {
-            'U1': {'type': 'IC', 'value': 'TPS54560', 'required': True},
-            'U6': {'type': 'IC', 'value': 'AMS1117-3.3', 'required': True},
-            'L1': {'type': 'Inductor', 'value': '33µH', 'required': True},
-        },
-        'Power Management': {
-            'U3': {'type': 'IC', 'value': 'ATtiny85', 'required': True},
-            'Q1': {'type': 'MOSFET', 'value': 'IRLB8721', 'required': True},
-            'Q2': {'type': 'MOSFET', 'value': '2N7002', 'required': True},
-            'Q3': {'type': 'MOSFET', 'value': '2N7002', 'required': True},
-        },
-        'CAN Bus Interface': {
-            'U4': {'type': 'IC', 'value': 'MCP2515', 'required': True},
-            'U5': {'type': 'IC', 'value': 'SN65HVD230', 'required': True},
-            'Y1': {'type': 'Crystal', 'value': '16MHz', 'required': True},
-            'R8': {'type': 'Resistor', 'value': '120', 'required': True},
-        },
-        'Ignition Detection': {
-            'U2': {'type': 'IC', 'value': 'LTV-817S', 'required': True},
-            'R6': {'type': 'Resistor', 'value': '10k', 'required': True},
-            'R7': {'type': 'Resistor', 'value': '10k', 'required': True},
-        },
-        'Connectors': {
-            'J1': {'type': 'Connector', 'pins': 8, 'desc': 'ISO-A Power', 'required': True},
-            'J2': {'type': 'Connector', 'pins': 40, 'desc': 'Raspberry Pi GPIO', 'required': True},
-            'J3': {'type': 'Connector', 'pins': 16, 'desc': 'OBD-II', 'required': True},
-        }
-    }
+def check_design_requirements(data, rule_results):
+    """Sort the part results of design_rules/wrx-power-can-hat.design_rules by group"""
 
-    components = data['components']
-    comp_dict = {c['reference']: c for c in components}
+    # First symbol of each reference, as the rules see it
+    comp_dict = {}
+    for comp in data['components']:
+        comp_dict.setdefault(comp['reference'], comp)
 
     results = {}
     missing = []
     found = []
     value_mismatch = []
 
-    for category, items in required_components.items():
-        results[category] = {}
-        for ref, spec in items.items():
-            if ref in comp_dict:
-                comp = comp_dict[ref]
-                status = 'FOUND'
-
-                # Check value match
-                expected_val = spec.get('value', '')
-                actual_val = comp['value']
-
-                if expected_val and expected_val.lower() not in actual_val.lower():
-                    status = 'VALUE_MISMATCH'
-                    value_mismatch.append({
-                        'ref': ref,
-                        'expected': expected_val,
-                        'actual': actual_val
-                    })
-
-                results[category][ref] = {
-                    'status': status,
-                    'value': actual_val,
-                    'position': comp['position']
-                }
-                found.append(ref)
-            else:
-                results[category][ref] = {
-                    'status': 'MISSING',
-                    'expected': spec.get('value', '?')
-                }
-                if spec.get('required', False):
-                    missing.append(ref)
+    for result in rule_results:
+        rule = result.rule
+        if rule.kind != 'part':
+            continue
+        ref = rule.subject
+        category = results.setdefault(rule.group, {})
+        if result.status in ('missing', 'warning'):
+            category[ref] = {
+                'status': 'MISSING',
+                'expected': rule.spec.get('value', '?')
+            }
+            # Optional parts are reported but not required
+            if result.status == 'missing':
+                missing.append(ref)
+            continue
+
+        comp = comp_dict.get(ref)
+        status = 'FOUND'
+        if result.status == 'mismatch':
+            status = 'VALUE_MISMATCH'
+            value_mismatch.append({
+                'ref': ref,
+                'detail': result.detail
+            })
+        if comp is None:
+            # The rules found the part but the component data has no such
+            # reference: take the value the rules saw instead of guessing
+            category[ref] = {
+                'status': status,
+                'value': result.detail if result.status == 'ok' else '?',
+                'position': None,
+                'detail': f"{result.detail} (not in component data)".strip()
+            }
+        else:
+            category[ref] = {
+                'status': status,
+                'value': comp['value'],
+                'position': comp['position'],
+                'detail': result.detail
+            }
+        found.append(ref)
 
     return results, missing, found, value_mismatch
 
-def generate_report(data, design_check):
+def generate_report(data, design_check, rule_results):
     """Generate comprehensive analysis report"""
 
     categories = categorize_components(data['components'])
@@ -231,9 +238,7 @@ def generate_report(data, design_check):
             if status == 'MISSING':
                 report.append(f"  {marker} {ref:8} MISSING - Expected: {info.get('expected', '?')}")
             elif status == 'VALUE_MISMATCH':
-                # Find expected value from value_mismatch list
-                expected = next((item['expected'] for item in value_mismatch if item['ref'] == ref), '?')
-                report.append(f"  {marker} {ref:8} VALUE MISMATCH - Expected: {expected}, Got: {info['value']}")
+                report.append(f"  {marker} {ref:8} MISMATCH - {info['detail']}")
             else:
                 report.append(f"  {marker} {ref:8} OK - {info['value']}")
 
@@ -250,9 +255,9 @@ def generate_report(data, design_check):
         report.append("")
 
     if value_mismatch:
-        report.append(f"⚠ VALUE MISMATCHES ({len(value_mismatch)}):")
+        report.append(f"⚠ MISMATCHES ({len(value_mismatch)}):")
         for item in value_mismatch:
-            report.append(f"  - {item['ref']}: Expected '{item['expected']}', Got '{item['actual']}'")
+            report.append(f"  - {item['ref']}: {item['detail']}")
         report.append("")
 
     # Critical signals check
@@ -261,16 +266,10 @@ def generate_report(data, design_check):
     report.append("=" * 80)
     report.append("")
 
-    critical_signals = [
-        '12V_IN', '12V_FUSED', '12V_IGN', '12V_SWITCHED', 'GND',
-        '+5V', '+3.3V',
-        'IGN_DETECT', 'GATE_CTRL', 'SHUTDOWN_REQ',
-        'SPI_MISO', 'SPI_MOSI', 'SPI_SCLK', 'SPI_CE0',
-        'CAN_INT', 'CAN_TX', 'CAN_RX', 'CANH', 'CANL'
-    ]
-
-    found_signals = [s for s in critical_signals if s in data['global_labels']]
-    missing_signals = [s for s in critical_signals if s not in data['global_labels']]
+    # Critical signals are the (net ...) rules, checked against every net name
+    net_results = [r for r in rule_results if r.rule.kind == 'net']
+    found_signals = [r.rule.subject for r in net_results if r.status == 'ok']
+    missing_signals = [r.rule.subject for r in net_results if r.status != 'ok']
 
     report.append(f"Found Critical Signals ({len(found_signals)}):")
     for sig in found_signals:
@@ -283,6 +282,19 @@ def generate_report(data, design_check):
             report.append(f"  ✗ {sig}")
         report.append("")
 
+    # Pin bindings, forbidden connections and net conflicts
+    report.append("=" * 80)
+    report.append("DESIGN RULE VIOLATIONS")
+    report.append("=" * 80)
+    report.append("")
+
+    connection_failures = [r for r in failures(rule_results) if r.rule.kind in ('pin', 'forbid', 'isolate')]
+    if connection_failures:
+        report.extend(format_results(connection_failures))
+    else:
+        report.append("  ✓ No pin, forbidden connection or net conflict violations")
+    report.append("")
+
     # Connector analysis
     report.append("=" * 80)
     report.append("CONNECTOR ANALYSIS")
@@ -323,10 +335,10 @@ def generate_checklist(missing, value_mismatch, data):
 
     # Value mismatches
     if value_mismatch:
-        checklist.append(f"PRIORITY {priority}: FIX COMPONENT VALUES")
+        checklist.append(f"PRIORITY {priority}: FIX COMPONENT MISMATCHES")
         checklist.append("-" * 80)
         for item in value_mismatch:
-            checklist.append(f"  [ ] Change {item['ref']} from '{item['actual']}' to '{item['expected']}'")
+            checklist.append(f"  [ ] Fix {item['ref']}: {item['detail']}")
         checklist.append("")
         priority += 1
 
@@ -374,13 +386,15 @@ def main():
     schematic_file = Path(r"C:\Users\eckma\projects\SubaruDash\pcb\wrx-power-can-hat-MANUAL.kicad_sch")
 
     print("Parsing KiCad schematic...")
-    data = parse_kicad_schematic(schematic_file)
+    parsed = load_cached(schematic_file, strict=False)
+    data = _extract(parsed)
 
     print("Checking design requirements...")
-    design_check = check_design_requirements(data)
+    rule_results = check_parsed(parsed, load_rules(RULES_FILE))
+    design_check = check_design_requirements(data, rule_results)
 
     print("Generating report...")
-    report = generate_report(data, design_check)
+    report = generate_report(data, design_check, rule_results)
 
     print("Generating checklist...")
     checklist = generate_checklist(design_check[1], design_check[3], data)
@@ -403,12 +417,17 @@ def main():
         json.dump(data, f, indent=2)
     print(f"[OK] Component data saved to: {json_file}")
 
+    # Same data plus pins and nets as memory-mappable columns
+    columnar_file = schematic_file.parent / "schematic_data.kcol"
+    export_schematic(schematic_file, columnar_file)
+    print(f"[OK] Columnar data saved to: {columnar_file}")
+
     print("\n" + "=" * 80)
     print("ANALYSIS COMPLETE!")
     print("=" * 80)
     print(f"\nTotal Components Found: {len(data['components'])}")
     print(f"Missing Required Components: {len(design_check[1])}")
-    print(f"Value Mismatches: {len(design_check[3])}")
+    print(f"Mismatches: {len(design_check[3])}")
     print(f"\nReview the files above for detailed analysis and action items.")
 
 if __name__ == "__main__":
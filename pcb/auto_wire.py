@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+"""
+Auto-wire a schematic with any strategy of the kicad_tools.autowire engine,
+or benchmark all of them side by side
+
+The benchmark runs every strategy on the same sheet (MANUAL by default)
+and reports runtime, wire count, total length, junctions, labels, the
+wire check's cross-net findings and the nets of the result compared with
+the design table.
+
+Written wiring goes through the kicad_tools.simplify post-pass (collinear
+runs merged, redundant junctions dropped) unless --no-simplify is given.
+
+Usage (from pcb/):
+    python auto_wire.py --list
+    python auto_wire.py steiner wrx-power-can-hat-AUTO.kicad_sch out.kicad_sch [--no-simplify]
+    python auto_wire.py --bench [wrx-power-can-hat-MANUAL.kicad_sch]
+"""
+
+import sys
+import time
+from pathlib import Path
+
+from kicad_tools.autowire import STRATEGIES, Sheet, insert, render, run
+from kicad_tools.model import SchematicModel
+from kicad_tools.netlist import build_netlist, compare
+from kicad_tools.sexpr import parse
+from kicad_tools.wirecheck import report
+from design_tables import PIN_CONNECTIONS
+
+PCB_DIR = Path(__file__).resolve().parent
+BENCH_INPUT = PCB_DIR / "wrx-power-can-hat-MANUAL.kicad_sch"
+
+
+def wire_file(name, input_file, output_file, connections=PIN_CONNECTIONS, simplify=True):
+    """Wire input_file with one strategy and write output_file; returns the Wiring"""
+    sheet = Sheet.load(input_file)
+    print(f"Found {len(sheet.model.symbols)} component instances, {len(sheet.placed)} placed pins")
+    wiring = run(name, sheet, connections)
+    print(f"{name}: {wiring.summary()} in {wiring.elapsed * 1000:.0f} ms")
+    if simplify and wiring.segments:
+        wiring.simplify(sheet)
+        print(f"simplified: {wiring.summary()}")
+    for net, ref, pin in wiring.failed:
+        print(f"Warning: could not connect {ref} pin {pin} on net {net}")
+    if wiring.unplaced:
+        print(f"Warning: {len(wiring.unplaced)} pin(s) not found on the sheet: "
+              f"{', '.join(f'{ref}.{pin}' for ref, pin in wiring.unplaced)}")
+
+    # Check the generated wires for cross-net contacts before writing
+    report(wiring.check(sheet, connections), "generated wires")
+
+    with open(output_file, 'w', encoding='utf-8') as f:
+        f.write(insert(sheet.content, render(wiring, project=Path(output_file).stem)))
+    print(f"[OK] Saved to: {output_file}")
+    return wiring
+
+
+def benchmark(input_file, connections=PIN_CONNECTIONS):
+    """Run every strategy on one sheet; returns [(name, Wiring, findings, NetDiff)]"""
+    sheet = Sheet.load(input_file)
+    rows = []
+    for name in STRATEGIES:
+        wiring = run(name, sheet, connections)
+        findings = wiring.check(sheet, connections)
+        root = parse(insert(sheet.content, render(wiring)), strict=False)
+        diff = compare(build_netlist(SchematicModel.from_root(root), root), connections)
+        rows.append((name, wiring, findings, diff))
+    return rows
+
+
+def print_benchmark(input_file, rows):
+    print(f"Benchmark on {Path(input_file).name}")
+    print()
+    print(f"{'Strategy':13} {'ms':>8} {'wires':>6} {'length mm':>10} {'junct':>6} {'labels':>6} "
+          f"{'findings':>9} {'nets ok':>8} {'short':>6}")
+    print("-" * 81)
+    for name, wiring, findings, diff in rows:
+        print(f"{name:13} {wiring.elapsed * 1000:>8.1f} {len(wiring.segments):>6} {wiring.length:>10.1f} "
+              f"{len(wiring.junctions):>6} {len(wiring.labels):>6} {len(findings):>9} "
+              f"{diff.matched:>3}/{diff.expected:<4} {len(diff.shorts):>6}")
+
+
+def main():
+    args = [a for a in sys.argv[1:] if not a.startswith('--')]
+    if '--list' in sys.argv:
+        for name, func in STRATEGIES.items():
+            print(f"  {name:13} {func.__doc__}")
+        return 0
+    if '--bench' in sys.argv:
+        input_file = args[0] if args else BENCH_INPUT
+        started = time.perf_counter()
+        print_benchmark(input_file, benchmark(input_file))
+        print(f"\nTotal {time.perf_counter() - started:.1f} s")
+        return 0
+    if len(args) != 3:
+        print(__doc__)
+        return 1
+    name, input_file, output_file = args
+    wiring = wire_file(name, input_file, output_file, simplify='--no-simplify' not in sys.argv)
+    return 1 if wiring.failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
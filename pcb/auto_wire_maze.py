@@ -0,0 +1,23 @@
+#!/usr/bin/env python3
+"""
+Maze-routed auto-wiring script for KiCad schematic
+Routes every PIN_CONNECTIONS net around symbol bodies and other nets' wires
+on the 1.27mm grid (A* with a bend penalty), so no two nets touch
+"""
+
+import sys
+
+from auto_wire import wire_file
+
+def main():
+    input_file = "C:/Users/eckma/projects/SubaruDash/pcb/wrx-power-can-hat-AUTO.kicad_sch"
+    output_file = "C:/Users/eckma/projects/SubaruDash/pcb/wrx-power-can-hat-MAZE.kicad_sch"
+
+    print("Maze routing with obstacle avoidance...")
+    wiring = wire_file('maze', input_file, output_file)
+    print()
+    print("Next: Open in KiCad and run ERC")
+    return 1 if wiring.failed else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
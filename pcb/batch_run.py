@@ -0,0 +1,301 @@
+#!/usr/bin/env python3
+"""
+Batch runner for the schematic and board scripts
+
+Expands globs, fans the analysis, cleanup and layout operations out over a
+process pool and merges every result into one report. Each worker imports
+the scripts once and then handles many files, so interpreter startup is paid
+per worker instead of per file.
+
+Operations (chosen by file type unless --ops is given):
+    analyze  .kicad_sch  component inventory (from the cached columnar export)
+                         + design requirement check
+    cleanup  .kicad_sch  label/no-connect cleanup of split board schematics
+    wires    .kicad_sch  sweep-line short/overlap check of the wiring
+    rules    .kicad_sch  design_rules/*.design_rules whose (files ...) match
+    simplify .kicad_sch  merge collinear wires, drop redundant junctions (--ops only)
+    layout   .kicad_pcb  board summary + layout table keepout check
+
+Nothing is written unless --write is given (cleanup and simplify rewrite the
+schematic, layout applies the board's placement tables).
+
+Usage (from pcb/ or the repo root):
+    python pcb/batch_run.py "pcb/boards/*/*.kicad_pcb" "pcb/wrx-power-can-hat-*.kicad_sch"
+    python batch_run.py --ops analyze --jobs 4 --json batch_report.json "*.kicad_sch"
+"""
+
+import argparse
+import contextlib
+import glob
+import io
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+PCB_DIR = Path(__file__).resolve().parent
+sys.path.insert(0, str(PCB_DIR))
+sys.path.insert(0, str(PCB_DIR / "boards"))
+
+import analyze_schematic
+import cleanup_schematics
+import layout_power_hat_v10
+from kicad_tools.watch import BoardModel
+from kicad_tools.placement import PlacementTransaction, PlacementConflict, keepout_conflicts
+from kicad_tools.rules import check_file as check_rules, failures, format_results, load_rules, rule_files
+from kicad_tools.simplify import simplify_file
+from kicad_tools.wirecheck import check_file, format_findings
+
+# Signal sets used by cleanup, keyed by schematic file stem
+CLEANUP_SIGNALS = {
+    'power-hat': cleanup_schematics.POWER_HAT_SIGNALS | cleanup_schematics.SHARED_SIGNALS,
+    'can-hat': cleanup_schematics.CAN_HAT_SIGNALS | cleanup_schematics.SHARED_SIGNALS,
+}
+
+# Compiled design rule sets, loaded once per worker
+RULE_SETS = [load_rules(path) for path in rule_files()]
+ANALYZE_RULES = load_rules(analyze_schematic.RULES_FILE)
+
+# Layout scripts whose placement tables apply to a board, keyed by file stem
+LAYOUTS = {
+    'power-hat': layout_power_hat_v10,
+}
+
+DEFAULT_OPS = {
+    '.kicad_sch': ('analyze', 'cleanup', 'wires', 'rules'),
+    '.kicad_pcb': ('layout',),
+}
+
+# Operations that only run when named in --ops
+OPTIONAL_OPS = {
+    '.kicad_sch': ('simplify',),
+}
+
+
+def analyze_file(path, write):
+    data, rule_results = analyze_schematic.analyze(path, ANALYZE_RULES)
+    _, missing, found, value_mismatch = analyze_schematic.check_design_requirements(data, rule_results)
+    summary = [
+        f"{len(data['components'])} components, {len(data['labels'])} labels, "
+        f"{len(data['global_labels'])} global labels",
+        f"{len(found)} required found, {len(missing)} missing, {len(value_mismatch)} mismatches",
+    ]
+    if missing:
+        summary.append(f"Missing: {', '.join(missing)}")
+    return 'ok', summary, {
+        'components': len(data['components']),
+        'missing': missing,
+        'value_mismatch': value_mismatch,
+    }
+
+
+def cleanup_file(path, write):
+    signals = CLEANUP_SIGNALS.get(Path(path).stem)
+    if signals is None:
+        return 'skipped', ["no signal set for this schematic"], {}
+    stats = cleanup_schematics.cleanup_schematic(path, signals, Path(path).stem, write=write)
+    summary = [
+        f"labels {stats['labels_before']} -> {stats['labels_kept']}, "
+        f"global labels {stats['global_labels_before']} -> {stats['global_labels_kept']}, "
+        f"{stats['no_connects_removed']} no-connects removed",
+        "written" if write else "dry run (use --write to apply)",
+    ]
+    return 'ok', summary, stats
+
+
+def wires_file(path, write):
+    findings = check_file(path)
+    data = {'findings': [f._asdict() for f in findings]}
+    if not findings:
+        return 'ok', ["No shorts or overlaps"], data
+    return 'warning', [f"{len(findings)} wire problem(s)"] + format_findings(findings, limit=5), data
+
+
+def rules_file(path, write):
+    rule_sets = [rules for rules in RULE_SETS if rules.applies_to(path)]
+    if not rule_sets:
+        return 'skipped', ["no design rules for this schematic"], {}
+    summary = []
+    data = {}
+    for rules in rule_sets:
+        results = check_rules(path, rules)
+        bad = failures(results)
+        summary.append(f"{rules.name}: {len(results) - len(bad)}/{len(results)} rules pass")
+        summary.extend(line.strip() for line in format_results(bad)[:10])
+        data[rules.name] = [{'kind': r.rule.kind, 'subject': r.rule.subject, 'status': r.status,
+                             'detail': r.detail} for r in bad]
+    return ('warning' if any(data.values()) else 'ok'), summary, data
+
+
+def simplify_wiring_file(path, write):
+    content, stats = simplify_file(path)
+    summary = [", ".join(f"{name} {before} -> {after}" for name, (before, after) in stats.items())]
+    if write and stats['bytes'][0] != stats['bytes'][1]:
+        Path(path).write_text(content, encoding='utf-8')
+        summary.append("written")
+    elif not write:
+        summary.append("dry run (use --write to apply)")
+    return 'ok', summary, stats
+
+
+def layout_file(path, write):
+    model = BoardModel(path)
+    model.refresh()
+    summary = model.summary()
+    data = {'components': len(model.refs), 'routed_nets': len(model.routed_nets())}
+
+    layout = LAYOUTS.get(Path(path).stem)
+    if layout is None:
+        return 'ok', summary, data
+
+    offset = (layout.BOARD_OFFSET_X, layout.BOARD_OFFSET_Y)
+    tables = set(layout.FRONT_LAYER_POSITIONS) | set(layout.BACK_LAYER_POSITIONS)
+    placed = {ref: pos for ref, pos in model.positions.items() if ref in tables}
+    current = keepout_conflicts(placed, layout.KEEPOUTS, offset)
+    data['keepout_conflicts'] = [c.reference for c in current]
+    summary.append(f"{len(current)} placed part(s) inside keepouts" if current else "Keepouts clear")
+
+    content = Path(path).read_text(encoding='utf-8')
+    transaction = PlacementTransaction(content, offset=offset, keepouts=layout.KEEPOUTS)
+    transaction.place_table(layout.FRONT_LAYER_POSITIONS, "F.Cu")
+    transaction.place_table(layout.BACK_LAYER_POSITIONS, "B.Cu")
+    conflicts = transaction.validate()
+    data['table_conflicts'] = [c._asdict() for c in conflicts]
+    if conflicts:
+        summary.append(f"{layout.__name__} table: {len(conflicts)} conflict(s)")
+        summary.extend(PlacementConflict(conflicts).report())
+        return 'error', summary, data
+
+    if write:
+        Path(path).write_text(transaction.commit(), encoding='utf-8')
+        summary.append(f"{layout.__name__} table applied ({len(transaction)} footprints)")
+    else:
+        summary.append(f"{layout.__name__} table valid ({len(transaction)} footprints)")
+    return 'ok', summary, data
+
+
+OPERATIONS = {
+    'analyze': analyze_file,
+    'cleanup': cleanup_file,
+    'wires': wires_file,
+    'rules': rules_file,
+    'simplify': simplify_wiring_file,
+    'layout': layout_file,
+}
+
+
+def run_task(task):
+    """Worker entry point: run one operation on one file and return a result dict"""
+    op, path, write = task
+    started = time.perf_counter()
+    log = io.StringIO()
+    try:
+        with contextlib.redirect_stdout(log):
+            status, summary, data = OPERATIONS[op](path, write)
+    except Exception as e:
+        status, summary, data = 'error', [f"{type(e).__name__}: {e}"], {}
+    return {
+        'op': op,
+        'path': path,
+        'status': status,
+        'summary': summary,
+        'data': data,
+        'log': log.getvalue(),
+        'elapsed': time.perf_counter() - started,
+    }
+
+
+def expand_globs(patterns):
+    """Return sorted unique paths matching the patterns (plain paths allowed)"""
+    paths = []
+    for pattern in patterns:
+        matches = glob.glob(pattern, recursive=True) if glob.has_magic(pattern) else [pattern]
+        paths.extend(matches)
+    return sorted(set(paths))
+
+
+def build_tasks(paths, ops, write):
+    tasks = []
+    for path in paths:
+        suffix = Path(path).suffix
+        for op in DEFAULT_OPS.get(suffix, ()) + OPTIONAL_OPS.get(suffix, ()):
+            if (ops is None and op not in DEFAULT_OPS.get(suffix, ())) or (ops is not None and op not in ops):
+                continue
+            # Cleanup and rules only run where they have data unless asked explicitly
+            if ops is None and op == 'cleanup' and Path(path).stem not in CLEANUP_SIGNALS:
+                continue
+            if ops is None and op == 'rules' and not any(r.applies_to(path) for r in RULE_SETS):
+                continue
+            tasks.append((op, path, write))
+    return tasks
+
+
+def format_report(results, elapsed, jobs):
+    lines = ["=" * 80, "BATCH REPORT", "=" * 80]
+    for op in OPERATIONS:
+        group = [r for r in results if r['op'] == op]
+        if not group:
+            continue
+        lines.append("")
+        lines.append(f"{op.upper()} ({len(group)} files)")
+        lines.append("-" * 80)
+        for r in group:
+            lines.append(f"[{r['status'].upper():7}] {r['path']}  ({r['elapsed'] * 1000:.0f} ms)")
+            for line in r['summary']:
+                lines.append(f"          {line}")
+
+    counts = {}
+    for r in results:
+        counts[r['status']] = counts.get(r['status'], 0) + 1
+    lines.append("")
+    lines.append("=" * 80)
+    lines.append(f"{len(results)} tasks in {elapsed:.2f} s on {jobs} worker(s): " +
+                 ", ".join(f"{n} {status}" for status, n in sorted(counts.items())))
+    return "\n".join(lines)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run the KiCad scripts over many files")
+    parser.add_argument('patterns', nargs='+', help="files or globs (.kicad_sch / .kicad_pcb)")
+    parser.add_argument('--ops', help="comma-separated subset of: " + ", ".join(OPERATIONS))
+    parser.add_argument('--jobs', type=int, default=os.cpu_count() or 1, help="worker processes")
+    parser.add_argument('--write', action='store_true', help="let cleanup/layout modify files")
+    parser.add_argument('--json', help="also save the merged results to this JSON file")
+    args = parser.parse_args()
+
+    ops = None
+    if args.ops:
+        ops = set(args.ops.split(','))
+        unknown = ops - set(OPERATIONS)
+        if unknown:
+            parser.error(f"unknown operation(s): {', '.join(sorted(unknown))}")
+
+    paths = expand_globs(args.patterns)
+    tasks = build_tasks(paths, ops, args.write)
+    if not tasks:
+        print("No matching files")
+        return 1
+
+    jobs = max(1, min(args.jobs, len(tasks)))
+    started = time.perf_counter()
+    if jobs == 1:
+        results = [run_task(task) for task in tasks]
+    else:
+        with ProcessPoolExecutor(max_workers=jobs) as pool:
+            results = list(pool.map(run_task, tasks, chunksize=max(1, len(tasks) // (jobs * 4))))
+    elapsed = time.perf_counter() - started
+
+    print(format_report(results, elapsed, jobs))
+
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=2)
+        print(f"[OK] Results saved to: {args.json}")
+
+    return 1 if any(r['status'] == 'error' for r in results) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -10,8 +10,12 @@ This script filters out:
 
 import re
 import os
+import sys
 from pathlib import Path
 
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from kicad_tools.sexpr import parse, line_start
+
 # Define which labels/signals belong to each board
 POWER_HAT_SIGNALS = {
     # Power signals
@@ -74,8 +78,11 @@ def get_label_name(block):
     return None
 
 
-def extract_blocks(content):
+def extract_blocks(content, root=None):
     """Extract all schematic blocks by type."""
+    if root is None:
+        root = parse(content)
+
     blocks = {
         'header': '',
         'lib_symbols': '',
@@ -92,78 +99,38 @@ def extract_blocks(content):
         'footer': '',
     }
 
-    lines = content.split('\n')
-
-    # Extract header (everything before lib_symbols)
-    header_lines = []
-    i = 0
-    while i < len(lines) and not lines[i].strip().startswith('(lib_symbols'):
-        header_lines.append(lines[i])
-        i += 1
-    blocks['header'] = '\n'.join(header_lines)
-
-    # Extract lib_symbols section
-    if i < len(lines):
-        lib_start = i
-        paren_depth = lines[i].count('(') - lines[i].count(')')
-        lib_lines = [lines[i]]
-        i += 1
-        while i < len(lines) and paren_depth > 0:
-            lib_lines.append(lines[i])
-            paren_depth += lines[i].count('(') - lines[i].count(')')
-            i += 1
-        blocks['lib_symbols'] = '\n'.join(lib_lines)
-
-    # Now parse the rest
-    current_block = []
-    block_type = None
-    paren_depth = 0
-
     type_mapping = {
-        '\t(symbol': 'symbols',
-        '(wire': 'wires',
-        '(label': 'labels',
-        '(global_label': 'global_labels',
-        '(junction': 'junctions',
-        '(no_connect': 'no_connects',
-        '(bus ': 'bus',
-        '(bus_entry': 'bus_entry',
-        '(polyline': 'polyline',
-        '(text': 'text',
-        '(sheet_instances': 'footer',
+        'symbol': 'symbols',
+        'wire': 'wires',
+        'label': 'labels',
+        'global_label': 'global_labels',
+        'junction': 'junctions',
+        'no_connect': 'no_connects',
+        'bus': 'bus',
+        'bus_entry': 'bus_entry',
+        'polyline': 'polyline',
+        'text': 'text',
+        'text_box': 'text',
     }
 
-    while i < len(lines):
-        line = lines[i]
-
-        if block_type is None:
-            for prefix, btype in type_mapping.items():
-                if line.strip().startswith(prefix) or line.startswith(prefix):
-                    block_type = btype
-                    current_block = [line]
-                    paren_depth = line.count('(') - line.count(')')
-                    break
-        else:
-            current_block.append(line)
-            paren_depth += line.count('(') - line.count(')')
-            if paren_depth <= 0:
-                block_content = '\n'.join(current_block)
-                if block_type == 'footer':
-                    blocks['footer'] = block_content
-                else:
-                    blocks[block_type].append(block_content)
-                block_type = None
-                current_block = []
-
-        i += 1
-
-    # Handle closing paren
-    if ')' in lines[-1] and blocks['footer'] and not blocks['footer'].endswith(')'):
-        blocks['footer'] += '\n)'
+    # Extract header (everything before lib_symbols) and the lib_symbols section
+    lib = root.find('lib_symbols')
+    if lib is not None:
+        lib_line = line_start(content, lib.start)
+        blocks['header'] = content[:max(lib_line - 1, 0)]
+        blocks['lib_symbols'] = content[lib_line:lib.end]
+
+    for node in root.children():
+        block_type = type_mapping.get(node.tag)
+        block_start = line_start(content, node.start)
+        if node.tag == 'sheet_instances':
+            # Footer closes the root (kicad_sch ...) list as well
+            blocks['footer'] = content[block_start:node.end] + '\n)'
+        elif block_type:
+            blocks[block_type].append(content[block_start:node.end])
 
     return blocks
 
-
 def filter_labels_for_board(labels, allowed_signals, board_name):
     """Filter labels to only include those for allowed signals."""
     filtered = []
@@ -186,8 +153,12 @@ def filter_labels_for_board(labels, allowed_signals, board_name):
     return filtered
 
 
-def cleanup_schematic(filepath, allowed_signals, board_name):
-    """Clean up a schematic by removing unwanted labels."""
+def cleanup_schematic(filepath, allowed_signals, board_name, write=True):
+    """
+    Clean up a schematic by removing unwanted labels.
+
+    Returns a summary dict; with write=False the file is left untouched.
+    """
     print(f"\nCleaning up {board_name}...")
 
     content = read_schematic(filepath)
@@ -199,6 +170,14 @@ def cleanup_schematic(filepath, allowed_signals, board_name):
     print(f"  Found {len(blocks['wires'])} wires")
     print(f"  Found {len(blocks['no_connects'])} no-connects")
 
+    summary = {
+        'symbols': len(blocks['symbols']),
+        'wires': len(blocks['wires']),
+        'labels_before': len(blocks['labels']),
+        'global_labels_before': len(blocks['global_labels']),
+        'no_connects_removed': len(blocks['no_connects']),
+    }
+
     # Filter labels
     blocks['labels'] = filter_labels_for_board(blocks['labels'], allowed_signals, board_name)
     blocks['global_labels'] = filter_labels_for_board(blocks['global_labels'], allowed_signals, board_name)
@@ -211,6 +190,8 @@ def cleanup_schematic(filepath, allowed_signals, board_name):
 
     print(f"  Keeping {len(blocks['labels'])} labels")
     print(f"  Keeping {len(blocks['global_labels'])} global labels")
+    summary['labels_kept'] = len(blocks['labels'])
+    summary['global_labels_kept'] = len(blocks['global_labels'])
 
     # Reconstruct schematic
     new_content = blocks['header'] + '\n'
@@ -252,7 +233,10 @@ def cleanup_schematic(filepath, allowed_signals, board_name):
     if not new_content.strip().endswith(')'):
         new_content = new_content.strip() + '\n)\n'
 
-    write_schematic(filepath, new_content)
+    if write:
+        write_schematic(filepath, new_content)
+    summary['written'] = write
+    return summary
 
 
 def main():
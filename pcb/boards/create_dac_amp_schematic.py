@@ -13,20 +13,24 @@ Signal flow:
   Pi I2S → PCM5142 DAC → TPA3116D2 Amp → Speakers
 """
 
-import uuid
+import sys
 from pathlib import Path
 
-def generate_uuid():
-    return str(uuid.uuid4())
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from kicad_tools.uuids import UuidSource
+
+generate_uuid = UuidSource("dac-amp")
 
 def create_schematic():
     """Create the complete DAC/Amp schematic."""
 
+    generate_uuid.reset()
+
     sch = f'''(kicad_sch
 \t(version 20231120)
 \t(generator "python_script")
 \t(generator_version "8.0")
-\t(uuid "{generate_uuid()}")
+\t(uuid "{generate_uuid("sheet")}")
 \t(paper "A3")
 \t(title_block
 \t\t(title "SubaruDash DAC/Amp Module")
@@ -487,49 +491,49 @@ def create_schematic():
 \t\t(exclude_from_sim no)
 \t\t(at 50 20 0)
 \t\t(effects (font (size 5 5)))
-\t\t(uuid "{generate_uuid()}")
+\t\t(uuid "{generate_uuid("text", 50, 20)}")
 \t)
 \t(text "I2S Input from Pi"
 \t\t(exclude_from_sim no)
 \t\t(at 30 60 0)
 \t\t(effects (font (size 2 2)))
-\t\t(uuid "{generate_uuid()}")
+\t\t(uuid "{generate_uuid("text", 30, 60)}")
 \t)
 \t(text "PCM5142 Stereo DAC"
 \t\t(exclude_from_sim no)
 \t\t(at 80 60 0)
 \t\t(effects (font (size 2 2)))
-\t\t(uuid "{generate_uuid()}")
+\t\t(uuid "{generate_uuid("text", 80, 60)}")
 \t)
 \t(text "TPA3116D2 #1 (Front L/R)"
 \t\t(exclude_from_sim no)
 \t\t(at 160 60 0)
 \t\t(effects (font (size 2 2)))
-\t\t(uuid "{generate_uuid()}")
+\t\t(uuid "{generate_uuid("text", 160, 60)}")
 \t)
 \t(text "TPA3116D2 #2 (Rear L/R)"
 \t\t(exclude_from_sim no)
 \t\t(at 160 130 0)
 \t\t(effects (font (size 2 2)))
-\t\t(uuid "{generate_uuid()}")
+\t\t(uuid "{generate_uuid("text", 160, 130)}")
 \t)
 \t(text "Speaker Outputs"
 \t\t(exclude_from_sim no)
 \t\t(at 240 60 0)
 \t\t(effects (font (size 2 2)))
-\t\t(uuid "{generate_uuid()}")
+\t\t(uuid "{generate_uuid("text", 240, 60)}")
 \t)
 \t(text "Power Input"
 \t\t(exclude_from_sim no)
 \t\t(at 30 160 0)
 \t\t(effects (font (size 2 2)))
-\t\t(uuid "{generate_uuid()}")
+\t\t(uuid "{generate_uuid("text", 30, 160)}")
 \t)
 \t(text "3.3V Regulator"
 \t\t(exclude_from_sim no)
 \t\t(at 80 160 0)
 \t\t(effects (font (size 2 2)))
-\t\t(uuid "{generate_uuid()}")
+\t\t(uuid "{generate_uuid("text", 80, 160)}")
 \t)
 
 \t(symbol
@@ -540,7 +544,7 @@ def create_schematic():
 \t\t(in_bom yes)
 \t\t(on_board yes)
 \t\t(dnp no)
-\t\t(uuid "{generate_uuid()}")
+\t\t(uuid "{generate_uuid("symbol", "J1")}")
 \t\t(property "Reference" "J1"
 \t\t\t(at 35.56 71.12 0)
 \t\t\t(effects (font (size 1.27 1.27)))
@@ -557,12 +561,12 @@ def create_schematic():
 \t\t\t(at 35.56 82.55 0)
 \t\t\t(effects (font (size 1.27 1.27)) (hide yes))
 \t\t)
-\t\t(pin "1" (uuid "{generate_uuid()}"))
-\t\t(pin "2" (uuid "{generate_uuid()}"))
-\t\t(pin "3" (uuid "{generate_uuid()}"))
-\t\t(pin "4" (uuid "{generate_uuid()}"))
-\t\t(pin "5" (uuid "{generate_uuid()}"))
-\t\t(pin "6" (uuid "{generate_uuid()}"))
+\t\t(pin "1" (uuid "{generate_uuid("pin", "J1", "1")}"))
+\t\t(pin "2" (uuid "{generate_uuid("pin", "J1", "2")}"))
+\t\t(pin "3" (uuid "{generate_uuid("pin", "J1", "3")}"))
+\t\t(pin "4" (uuid "{generate_uuid("pin", "J1", "4")}"))
+\t\t(pin "5" (uuid "{generate_uuid("pin", "J1", "5")}"))
+\t\t(pin "6" (uuid "{generate_uuid("pin", "J1", "6")}"))
 \t\t(instances
 \t\t\t(project "dac-amp"
 \t\t\t\t(path "/" (reference "J1") (unit 1))
@@ -578,7 +582,7 @@ def create_schematic():
 \t\t(in_bom yes)
 \t\t(on_board yes)
 \t\t(dnp no)
-\t\t(uuid "{generate_uuid()}")
+\t\t(uuid "{generate_uuid("symbol", "U1")}")
 \t\t(property "Reference" "U1"
 \t\t\t(at 82.55 71.12 0)
 \t\t\t(effects (font (size 1.27 1.27)))
@@ -595,21 +599,21 @@ def create_schematic():
 \t\t\t(at 82.55 95.25 0)
 \t\t\t(effects (font (size 1.27 1.27)) (hide yes))
 \t\t)
-\t\t(pin "1" (uuid "{generate_uuid()}"))
-\t\t(pin "2" (uuid "{generate_uuid()}"))
-\t\t(pin "3" (uuid "{generate_uuid()}"))
-\t\t(pin "4" (uuid "{generate_uuid()}"))
-\t\t(pin "5" (uuid "{generate_uuid()}"))
-\t\t(pin "6" (uuid "{generate_uuid()}"))
-\t\t(pin "7" (uuid "{generate_uuid()}"))
-\t\t(pin "14" (uuid "{generate_uuid()}"))
-\t\t(pin "15" (uuid "{generate_uuid()}"))
-\t\t(pin "21" (uuid "{generate_uuid()}"))
-\t\t(pin "22" (uuid "{generate_uuid()}"))
-\t\t(pin "23" (uuid "{generate_uuid()}"))
-\t\t(pin "24" (uuid "{generate_uuid()}"))
-\t\t(pin "27" (uuid "{generate_uuid()}"))
-\t\t(pin "28" (uuid "{generate_uuid()}"))
+\t\t(pin "1" (uuid "{generate_uuid("pin", "U1", "1")}"))
+\t\t(pin "2" (uuid "{generate_uuid("pin", "U1", "2")}"))
+\t\t(pin "3" (uuid "{generate_uuid("pin", "U1", "3")}"))
+\t\t(pin "4" (uuid "{generate_uuid("pin", "U1", "4")}"))
+\t\t(pin "5" (uuid "{generate_uuid("pin", "U1", "5")}"))
+\t\t(pin "6" (uuid "{generate_uuid("pin", "U1", "6")}"))
+\t\t(pin "7" (uuid "{generate_uuid("pin", "U1", "7")}"))
+\t\t(pin "14" (uuid "{generate_uuid("pin", "U1", "14")}"))
+\t\t(pin "15" (uuid "{generate_uuid("pin", "U1", "15")}"))
+\t\t(pin "21" (uuid "{generate_uuid("pin", "U1", "21")}"))
+\t\t(pin "22" (uuid "{generate_uuid("pin", "U1", "22")}"))
+\t\t(pin "23" (uuid "{generate_uuid("pin", "U1", "23")}"))
+\t\t(pin "24" (uuid "{generate_uuid("pin", "U1", "24")}"))
+\t\t(pin "27" (uuid "{generate_uuid("pin", "U1", "27")}"))
+\t\t(pin "28" (uuid "{generate_uuid("pin", "U1", "28")}"))
 \t\t(instances
 \t\t\t(project "dac-amp"
 \t\t\t\t(path "/" (reference "U1") (unit 1))
@@ -625,7 +629,7 @@ def create_schematic():
 \t\t(in_bom yes)
 \t\t(on_board yes)
 \t\t(dnp no)
-\t\t(uuid "{generate_uuid()}")
+\t\t(uuid "{generate_uuid("symbol", "U2")}")
 \t\t(property "Reference" "U2"
 \t\t\t(at 165.1 66.04 0)
 \t\t\t(effects (font (size 1.27 1.27)))
@@ -642,21 +646,21 @@ def create_schematic():
 \t\t\t(at 165.1 95.25 0)
 \t\t\t(effects (font (size 1.27 1.27)) (hide yes))
 \t\t)
-\t\t(pin "1" (uuid "{generate_uuid()}"))
-\t\t(pin "2" (uuid "{generate_uuid()}"))
-\t\t(pin "4" (uuid "{generate_uuid()}"))
-\t\t(pin "5" (uuid "{generate_uuid()}"))
-\t\t(pin "6" (uuid "{generate_uuid()}"))
-\t\t(pin "7" (uuid "{generate_uuid()}"))
-\t\t(pin "16" (uuid "{generate_uuid()}"))
-\t\t(pin "17" (uuid "{generate_uuid()}"))
-\t\t(pin "18" (uuid "{generate_uuid()}"))
-\t\t(pin "19" (uuid "{generate_uuid()}"))
-\t\t(pin "24" (uuid "{generate_uuid()}"))
-\t\t(pin "25" (uuid "{generate_uuid()}"))
-\t\t(pin "28" (uuid "{generate_uuid()}"))
-\t\t(pin "29" (uuid "{generate_uuid()}"))
-\t\t(pin "33" (uuid "{generate_uuid()}"))
+\t\t(pin "1" (uuid "{generate_uuid("pin", "U2", "1")}"))
+\t\t(pin "2" (uuid "{generate_uuid("pin", "U2", "2")}"))
+\t\t(pin "4" (uuid "{generate_uuid("pin", "U2", "4")}"))
+\t\t(pin "5" (uuid "{generate_uuid("pin", "U2", "5")}"))
+\t\t(pin "6" (uuid "{generate_uuid("pin", "U2", "6")}"))
+\t\t(pin "7" (uuid "{generate_uuid("pin", "U2", "7")}"))
+\t\t(pin "16" (uuid "{generate_uuid("pin", "U2", "16")}"))
+\t\t(pin "17" (uuid "{generate_uuid("pin", "U2", "17")}"))
+\t\t(pin "18" (uuid "{generate_uuid("pin", "U2", "18")}"))
+\t\t(pin "19" (uuid "{generate_uuid("pin", "U2", "19")}"))
+\t\t(pin "24" (uuid "{generate_uuid("pin", "U2", "24")}"))
+\t\t(pin "25" (uuid "{generate_uuid("pin", "U2", "25")}"))
+\t\t(pin "28" (uuid "{generate_uuid("pin", "U2", "28")}"))
+\t\t(pin "29" (uuid "{generate_uuid("pin", "U2", "29")}"))
+\t\t(pin "33" (uuid "{generate_uuid("pin", "U2", "33")}"))
 \t\t(instances
 \t\t\t(project "dac-amp"
 \t\t\t\t(path "/" (reference "U2") (unit 1))
@@ -672,7 +676,7 @@ def create_schematic():
 \t\t(in_bom yes)
 \t\t(on_board yes)
 \t\t(dnp no)
-\t\t(uuid "{generate_uuid()}")
+\t\t(uuid "{generate_uuid("symbol", "U3")}")
 \t\t(property "Reference" "U3"
 \t\t\t(at 165.1 135.89 0)
 \t\t\t(effects (font (size 1.27 1.27)))
@@ -689,21 +693,21 @@ def create_schematic():
 \t\t\t(at 165.1 165.1 0)
 \t\t\t(effects (font (size 1.27 1.27)) (hide yes))
 \t\t)
-\t\t(pin "1" (uuid "{generate_uuid()}"))
-\t\t(pin "2" (uuid "{generate_uuid()}"))
-\t\t(pin "4" (uuid "{generate_uuid()}"))
-\t\t(pin "5" (uuid "{generate_uuid()}"))
-\t\t(pin "6" (uuid "{generate_uuid()}"))
-\t\t(pin "7" (uuid "{generate_uuid()}"))
-\t\t(pin "16" (uuid "{generate_uuid()}"))
-\t\t(pin "17" (uuid "{generate_uuid()}"))
-\t\t(pin "18" (uuid "{generate_uuid()}"))
-\t\t(pin "19" (uuid "{generate_uuid()}"))
-\t\t(pin "24" (uuid "{generate_uuid()}"))
-\t\t(pin "25" (uuid "{generate_uuid()}"))
-\t\t(pin "28" (uuid "{generate_uuid()}"))
-\t\t(pin "29" (uuid "{generate_uuid()}"))
-\t\t(pin "33" (uuid "{generate_uuid()}"))
+\t\t(pin "1" (uuid "{generate_uuid("pin", "U3", "1")}"))
+\t\t(pin "2" (uuid "{generate_uuid("pin", "U3", "2")}"))
+\t\t(pin "4" (uuid "{generate_uuid("pin", "U3", "4")}"))
+\t\t(pin "5" (uuid "{generate_uuid("pin", "U3", "5")}"))
+\t\t(pin "6" (uuid "{generate_uuid("pin", "U3", "6")}"))
+\t\t(pin "7" (uuid "{generate_uuid("pin", "U3", "7")}"))
+\t\t(pin "16" (uuid "{generate_uuid("pin", "U3", "16")}"))
+\t\t(pin "17" (uuid "{generate_uuid("pin", "U3", "17")}"))
+\t\t(pin "18" (uuid "{generate_uuid("pin", "U3", "18")}"))
+\t\t(pin "19" (uuid "{generate_uuid("pin", "U3", "19")}"))
+\t\t(pin "24" (uuid "{generate_uuid("pin", "U3", "24")}"))
+\t\t(pin "25" (uuid "{generate_uuid("pin", "U3", "25")}"))
+\t\t(pin "28" (uuid "{generate_uuid("pin", "U3", "28")}"))
+\t\t(pin "29" (uuid "{generate_uuid("pin", "U3", "29")}"))
+\t\t(pin "33" (uuid "{generate_uuid("pin", "U3", "33")}"))
 \t\t(instances
 \t\t\t(project "dac-amp"
 \t\t\t\t(path "/" (reference "U3") (unit 1))
@@ -719,7 +723,7 @@ def create_schematic():
 \t\t(in_bom yes)
 \t\t(on_board yes)
 \t\t(dnp no)
-\t\t(uuid "{generate_uuid()}")
+\t\t(uuid "{generate_uuid("symbol", "J2")}")
 \t\t(property "Reference" "J2"
 \t\t\t(at 35.56 170.18 0)
 \t\t\t(effects (font (size 1.27 1.27)))
@@ -736,8 +740,8 @@ def create_schematic():
 \t\t\t(at 35.56 177.8 0)
 \t\t\t(effects (font (size 1.27 1.27)) (hide yes))
 \t\t)
-\t\t(pin "1" (uuid "{generate_uuid()}"))
-\t\t(pin "2" (uuid "{generate_uuid()}"))
+\t\t(pin "1" (uuid "{generate_uuid("pin", "J2", "1")}"))
+\t\t(pin "2" (uuid "{generate_uuid("pin", "J2", "2")}"))
 \t\t(instances
 \t\t\t(project "dac-amp"
 \t\t\t\t(path "/" (reference "J2") (unit 1))
@@ -753,7 +757,7 @@ def create_schematic():
 \t\t(in_bom yes)
 \t\t(on_board yes)
 \t\t(dnp no)
-\t\t(uuid "{generate_uuid()}")
+\t\t(uuid "{generate_uuid("symbol", "U4")}")
 \t\t(property "Reference" "U4"
 \t\t\t(at 82.55 167.64 0)
 \t\t\t(effects (font (size 1.27 1.27)))
@@ -770,9 +774,9 @@ def create_schematic():
 \t\t\t(at 82.55 177.8 0)
 \t\t\t(effects (font (size 1.27 1.27)) (hide yes))
 \t\t)
-\t\t(pin "1" (uuid "{generate_uuid()}"))
-\t\t(pin "2" (uuid "{generate_uuid()}"))
-\t\t(pin "3" (uuid "{generate_uuid()}"))
+\t\t(pin "1" (uuid "{generate_uuid("pin", "U4", "1")}"))
+\t\t(pin "2" (uuid "{generate_uuid("pin", "U4", "2")}"))
+\t\t(pin "3" (uuid "{generate_uuid("pin", "U4", "3")}"))
 \t\t(instances
 \t\t\t(project "dac-amp"
 \t\t\t\t(path "/" (reference "U4") (unit 1))
@@ -788,7 +792,7 @@ def create_schematic():
 \t\t(in_bom yes)
 \t\t(on_board yes)
 \t\t(dnp no)
-\t\t(uuid "{generate_uuid()}")
+\t\t(uuid "{generate_uuid("symbol", "J3")}")
 \t\t(property "Reference" "J3"
 \t\t\t(at 240 72.39 0)
 \t\t\t(effects (font (size 1.27 1.27)))
@@ -805,8 +809,8 @@ def create_schematic():
 \t\t\t(at 240 80.01 0)
 \t\t\t(effects (font (size 1.27 1.27)) (hide yes))
 \t\t)
-\t\t(pin "1" (uuid "{generate_uuid()}"))
-\t\t(pin "2" (uuid "{generate_uuid()}"))
+\t\t(pin "1" (uuid "{generate_uuid("pin", "J3", "1")}"))
+\t\t(pin "2" (uuid "{generate_uuid("pin", "J3", "2")}"))
 \t\t(instances
 \t\t\t(project "dac-amp"
 \t\t\t\t(path "/" (reference "J3") (unit 1))
@@ -822,7 +826,7 @@ def create_schematic():
 \t\t(in_bom yes)
 \t\t(on_board yes)
 \t\t(dnp no)
-\t\t(uuid "{generate_uuid()}")
+\t\t(uuid "{generate_uuid("symbol", "J4")}")
 \t\t(property "Reference" "J4"
 \t\t\t(at 240 92.71 0)
 \t\t\t(effects (font (size 1.27 1.27)))
@@ -839,8 +843,8 @@ def create_schematic():
 \t\t\t(at 240 100.33 0)
 \t\t\t(effects (font (size 1.27 1.27)) (hide yes))
 \t\t)
-\t\t(pin "1" (uuid "{generate_uuid()}"))
-\t\t(pin "2" (uuid "{generate_uuid()}"))
+\t\t(pin "1" (uuid "{generate_uuid("pin", "J4", "1")}"))
+\t\t(pin "2" (uuid "{generate_uuid("pin", "J4", "2")}"))
 \t\t(instances
 \t\t\t(project "dac-amp"
 \t\t\t\t(path "/" (reference "J4") (unit 1))
@@ -856,7 +860,7 @@ def create_schematic():
 \t\t(in_bom yes)
 \t\t(on_board yes)
 \t\t(dnp no)
-\t\t(uuid "{generate_uuid()}")
+\t\t(uuid "{generate_uuid("symbol", "J5")}")
 \t\t(property "Reference" "J5"
 \t\t\t(at 240 142.24 0)
 \t\t\t(effects (font (size 1.27 1.27)))
@@ -873,8 +877,8 @@ def create_schematic():
 \t\t\t(at 240 149.86 0)
 \t\t\t(effects (font (size 1.27 1.27)) (hide yes))
 \t\t)
-\t\t(pin "1" (uuid "{generate_uuid()}"))
-\t\t(pin "2" (uuid "{generate_uuid()}"))
+\t\t(pin "1" (uuid "{generate_uuid("pin", "J5", "1")}"))
+\t\t(pin "2" (uuid "{generate_uuid("pin", "J5", "2")}"))
 \t\t(instances
 \t\t\t(project "dac-amp"
 \t\t\t\t(path "/" (reference "J5") (unit 1))
@@ -890,7 +894,7 @@ def create_schematic():
 \t\t(in_bom yes)
 \t\t(on_board yes)
 \t\t(dnp no)
-\t\t(uuid "{generate_uuid()}")
+\t\t(uuid "{generate_uuid("symbol", "J6")}")
 \t\t(property "Reference" "J6"
 \t\t\t(at 240 162.56 0)
 \t\t\t(effects (font (size 1.27 1.27)))
@@ -907,8 +911,8 @@ def create_schematic():
 \t\t\t(at 240 170.18 0)
 \t\t\t(effects (font (size 1.27 1.27)) (hide yes))
 \t\t)
-\t\t(pin "1" (uuid "{generate_uuid()}"))
-\t\t(pin "2" (uuid "{generate_uuid()}"))
+\t\t(pin "1" (uuid "{generate_uuid("pin", "J6", "1")}"))
+\t\t(pin "2" (uuid "{generate_uuid("pin", "J6", "2")}"))
 \t\t(instances
 \t\t\t(project "dac-amp"
 \t\t\t\t(path "/" (reference "J6") (unit 1))
@@ -920,7 +924,7 @@ def create_schematic():
 \t\t(shape input)
 \t\t(at 30.48 77.47 180)
 \t\t(effects (font (size 1.27 1.27)) (justify right))
-\t\t(uuid "{generate_uuid()}")
+\t\t(uuid "{generate_uuid("label", "I2S_BCK", 30.48, 77.47)}")
 \t\t(property "Intersheetrefs" "${{INTERSHEET_REFS}}"
 \t\t\t(at 0 0 0)
 \t\t\t(effects (font (size 1.27 1.27)) (hide yes))
@@ -930,7 +934,7 @@ def create_schematic():
 \t\t(shape input)
 \t\t(at 30.48 80.01 180)
 \t\t(effects (font (size 1.27 1.27)) (justify right))
-\t\t(uuid "{generate_uuid()}")
+\t\t(uuid "{generate_uuid("label", "I2S_LRCK", 30.48, 80.01)}")
 \t\t(property "Intersheetrefs" "${{INTERSHEET_REFS}}"
 \t\t\t(at 0 0 0)
 \t\t\t(effects (font (size 1.27 1.27)) (hide yes))
@@ -940,7 +944,7 @@ def create_schematic():
 \t\t(shape input)
 \t\t(at 30.48 82.55 180)
 \t\t(effects (font (size 1.27 1.27)) (justify right))
-\t\t(uuid "{generate_uuid()}")
+\t\t(uuid "{generate_uuid("label", "I2S_DIN", 30.48, 82.55)}")
 \t\t(property "Intersheetrefs" "${{INTERSHEET_REFS}}"
 \t\t\t(at 0 0 0)
 \t\t\t(effects (font (size 1.27 1.27)) (hide yes))
@@ -950,7 +954,7 @@ def create_schematic():
 \t\t(shape input)
 \t\t(at 30.48 85.09 180)
 \t\t(effects (font (size 1.27 1.27)) (justify right))
-\t\t(uuid "{generate_uuid()}")
+\t\t(uuid "{generate_uuid("label", "+3.3V", 30.48, 85.09)}")
 \t\t(property "Intersheetrefs" "${{INTERSHEET_REFS}}"
 \t\t\t(at 0 0 0)
 \t\t\t(effects (font (size 1.27 1.27)) (hide yes))
@@ -960,7 +964,7 @@ def create_schematic():
 \t\t(shape input)
 \t\t(at 30.48 87.63 180)
 \t\t(effects (font (size 1.27 1.27)) (justify right))
-\t\t(uuid "{generate_uuid()}")
+\t\t(uuid "{generate_uuid("label", "GND", 30.48, 87.63)}")
 \t\t(property "Intersheetrefs" "${{INTERSHEET_REFS}}"
 \t\t\t(at 0 0 0)
 \t\t\t(effects (font (size 1.27 1.27)) (hide yes))
@@ -970,7 +974,7 @@ def create_schematic():
 \t\t(shape input)
 \t\t(at 30.48 177.8 180)
 \t\t(effects (font (size 1.27 1.27)) (justify right))
-\t\t(uuid "{generate_uuid()}")
+\t\t(uuid "{generate_uuid("label", "+12V", 30.48, 177.8)}")
 \t\t(property "Intersheetrefs" "${{INTERSHEET_REFS}}"
 \t\t\t(at 0 0 0)
 \t\t\t(effects (font (size 1.27 1.27)) (hide yes))
@@ -980,7 +984,7 @@ def create_schematic():
 \t\t(shape input)
 \t\t(at 30.48 180.34 180)
 \t\t(effects (font (size 1.27 1.27)) (justify right))
-\t\t(uuid "{generate_uuid()}")
+\t\t(uuid "{generate_uuid("label", "GND", 30.48, 180.34)}")
 \t\t(property "Intersheetrefs" "${{INTERSHEET_REFS}}"
 \t\t\t(at 0 0 0)
 \t\t\t(effects (font (size 1.27 1.27)) (hide yes))
@@ -990,7 +994,7 @@ def create_schematic():
 \t\t(shape output)
 \t\t(at 97.79 85.09 0)
 \t\t(effects (font (size 1.27 1.27)) (justify left))
-\t\t(uuid "{generate_uuid()}")
+\t\t(uuid "{generate_uuid("label", "DAC_OUTL+", 97.79, 85.09)}")
 \t\t(property "Intersheetrefs" "${{INTERSHEET_REFS}}"
 \t\t\t(at 0 0 0)
 \t\t\t(effects (font (size 1.27 1.27)) (hide yes))
@@ -1000,7 +1004,7 @@ def create_schematic():
 \t\t(shape output)
 \t\t(at 97.79 87.63 0)
 \t\t(effects (font (size 1.27 1.27)) (justify left))
-\t\t(uuid "{generate_uuid()}")
+\t\t(uuid "{generate_uuid("label", "DAC_OUTL-", 97.79, 87.63)}")
 \t\t(property "Intersheetrefs" "${{INTERSHEET_REFS}}"
 \t\t\t(at 0 0 0)
 \t\t\t(effects (font (size 1.27 1.27)) (hide yes))
@@ -1010,7 +1014,7 @@ def create_schematic():
 \t\t(shape output)
 \t\t(at 97.79 92.71 0)
 \t\t(effects (font (size 1.27 1.27)) (justify left))
-\t\t(uuid "{generate_uuid()}")
+\t\t(uuid "{generate_uuid("label", "DAC_OUTR+", 97.79, 92.71)}")
 \t\t(property "Intersheetrefs" "${{INTERSHEET_REFS}}"
 \t\t\t(at 0 0 0)
 \t\t\t(effects (font (size 1.27 1.27)) (hide yes))
@@ -1020,7 +1024,7 @@ def create_schematic():
 \t\t(shape output)
 \t\t(at 97.79 95.25 0)
 \t\t(effects (font (size 1.27 1.27)) (justify left))
-\t\t(uuid "{generate_uuid()}")
+\t\t(uuid "{generate_uuid("label", "DAC_OUTR-", 97.79, 95.25)}")
 \t\t(property "Intersheetrefs" "${{INTERSHEET_REFS}}"
 \t\t\t(at 0 0 0)
 \t\t\t(effects (font (size 1.27 1.27)) (hide yes))
@@ -1030,7 +1034,7 @@ def create_schematic():
 \t\t(shape output)
 \t\t(at 234.95 80.01 180)
 \t\t(effects (font (size 1.27 1.27)) (justify right))
-\t\t(uuid "{generate_uuid()}")
+\t\t(uuid "{generate_uuid("label", "SPK_FL+", 234.95, 80.01)}")
 \t\t(property "Intersheetrefs" "${{INTERSHEET_REFS}}"
 \t\t\t(at 0 0 0)
 \t\t\t(effects (font (size 1.27 1.27)) (hide yes))
@@ -1040,7 +1044,7 @@ def create_schematic():
 \t\t(shape output)
 \t\t(at 234.95 82.55 180)
 \t\t(effects (font (size 1.27 1.27)) (justify right))
-\t\t(uuid "{generate_uuid()}")
+\t\t(uuid "{generate_uuid("label", "SPK_FL-", 234.95, 82.55)}")
 \t\t(property "Intersheetrefs" "${{INTERSHEET_REFS}}"
 \t\t\t(at 0 0 0)
 \t\t\t(effects (font (size 1.27 1.27)) (hide yes))
@@ -1050,7 +1054,7 @@ def create_schematic():
 \t\t(shape output)
 \t\t(at 234.95 100.33 180)
 \t\t(effects (font (size 1.27 1.27)) (justify right))
-\t\t(uuid "{generate_uuid()}")
+\t\t(uuid "{generate_uuid("label", "SPK_FR+", 234.95, 100.33)}")
 \t\t(property "Intersheetrefs" "${{INTERSHEET_REFS}}"
 \t\t\t(at 0 0 0)
 \t\t\t(effects (font (size 1.27 1.27)) (hide yes))
@@ -1060,7 +1064,7 @@ def create_schematic():
 \t\t(shape output)
 \t\t(at 234.95 102.87 180)
 \t\t(effects (font (size 1.27 1.27)) (justify right))
-\t\t(uuid "{generate_uuid()}")
+\t\t(uuid "{generate_uuid("label", "SPK_FR-", 234.95, 102.87)}")
 \t\t(property "Intersheetrefs" "${{INTERSHEET_REFS}}"
 \t\t\t(at 0 0 0)
 \t\t\t(effects (font (size 1.27 1.27)) (hide yes))
@@ -1070,7 +1074,7 @@ def create_schematic():
 \t\t(shape output)
 \t\t(at 234.95 149.86 180)
 \t\t(effects (font (size 1.27 1.27)) (justify right))
-\t\t(uuid "{generate_uuid()}")
+\t\t(uuid "{generate_uuid("label", "SPK_RL+", 234.95, 149.86)}")
 \t\t(property "Intersheetrefs" "${{INTERSHEET_REFS}}"
 \t\t\t(at 0 0 0)
 \t\t\t(effects (font (size 1.27 1.27)) (hide yes))
@@ -1080,7 +1084,7 @@ def create_schematic():
 \t\t(shape output)
 \t\t(at 234.95 152.4 180)
 \t\t(effects (font (size 1.27 1.27)) (justify right))
-\t\t(uuid "{generate_uuid()}")
+\t\t(uuid "{generate_uuid("label", "SPK_RL-", 234.95, 152.4)}")
 \t\t(property "Intersheetrefs" "${{INTERSHEET_REFS}}"
 \t\t\t(at 0 0 0)
 \t\t\t(effects (font (size 1.27 1.27)) (hide yes))
@@ -1090,7 +1094,7 @@ def create_schematic():
 \t\t(shape output)
 \t\t(at 234.95 170.18 180)
 \t\t(effects (font (size 1.27 1.27)) (justify right))
-\t\t(uuid "{generate_uuid()}")
+\t\t(uuid "{generate_uuid("label", "SPK_RR+", 234.95, 170.18)}")
 \t\t(property "Intersheetrefs" "${{INTERSHEET_REFS}}"
 \t\t\t(at 0 0 0)
 \t\t\t(effects (font (size 1.27 1.27)) (hide yes))
@@ -1100,7 +1104,7 @@ def create_schematic():
 \t\t(shape output)
 \t\t(at 234.95 172.72 180)
 \t\t(effects (font (size 1.27 1.27)) (justify right))
-\t\t(uuid "{generate_uuid()}")
+\t\t(uuid "{generate_uuid("label", "SPK_RR-", 234.95, 172.72)}")
 \t\t(property "Intersheetrefs" "${{INTERSHEET_REFS}}"
 \t\t\t(at 0 0 0)
 \t\t\t(effects (font (size 1.27 1.27)) (hide yes))
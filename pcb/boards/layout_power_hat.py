@@ -12,11 +12,15 @@ This script directly modifies the .kicad_pcb file.
 """
 
 import re
+import sys
 import shutil
-import uuid
 from pathlib import Path
 from datetime import datetime
 
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from kicad_tools.placement import PlacementTransaction, PlacementConflict
+from kicad_tools.uuids import UuidSource
+
 # Board dimensions (Raspberry Pi HAT standard)
 BOARD_WIDTH = 65.0
 BOARD_HEIGHT = 56.0
@@ -109,9 +113,7 @@ COMPONENT_POSITIONS = {
 }
 
 
-def generate_uuid():
-    """Generate a UUID for KiCad elements."""
-    return str(uuid.uuid4())
+generate_uuid = UuidSource("power-hat")
 
 
 def create_board_outline():
@@ -221,72 +223,8 @@ def create_mounting_hole(x, y):
 	)'''
 
 
-def update_footprint_position(content, reference, x, y, rotation):
-    """Update the position of a footprint by reference."""
-    # Pattern to find the footprint and its position
-    # We need to find the footprint block that contains this reference
-
-    # First, find all footprint blocks
-    footprint_pattern = r'(\(footprint "[^"]+"\s*\n\s*\(layer "[^"]+"\)\s*\n\s*\(uuid "[^"]+"\)\s*\n\s*)\(at ([0-9.]+) ([0-9.]+)(?:\s+([0-9.]+))?\)'
-
-    def replace_position(match):
-        # Check if this footprint has the reference we're looking for
-        # We need to look ahead in the content to find the Reference property
-        start_pos = match.start()
-        # Find the end of this footprint (matching parentheses)
-        # For simplicity, search for the Reference property nearby
-        search_area = content[start_pos:start_pos + 2000]
-        ref_match = re.search(r'\(property "Reference" "' + re.escape(reference) + '"', search_area)
-
-        if ref_match:
-            # This is the footprint we want to update
-            prefix = match.group(1)
-            rot_str = f" {rotation}" if rotation != 0 else ""
-            return f'{prefix}(at {x} {y}{rot_str})'
-        else:
-            # Not our footprint, return unchanged
-            return match.group(0)
-
-    # This approach is too fragile. Let's use a different method.
-    # Find the specific footprint by looking for the reference, then backtrack to find the (at ...) line
-
-    # Find the reference property
-    ref_pattern = rf'\(property "Reference" "{re.escape(reference)}"'
-    ref_match = re.search(ref_pattern, content)
-
-    if not ref_match:
-        print(f"  WARNING: {reference} not found in PCB")
-        return content
-
-    # Search backwards from the reference to find the (at x y) line
-    search_start = max(0, ref_match.start() - 500)
-    search_area = content[search_start:ref_match.start()]
-
-    # Find the last (at x y) or (at x y rot) in this area
-    at_pattern = r'\(at [0-9.]+ [0-9.]+(?:\s+[0-9.]+)?\)'
-    at_matches = list(re.finditer(at_pattern, search_area))
-
-    if not at_matches:
-        print(f"  WARNING: Could not find position for {reference}")
-        return content
-
-    # Get the last match (closest to the reference)
-    last_at = at_matches[-1]
-    actual_pos = search_start + last_at.start()
-    actual_end = search_start + last_at.end()
-
-    # Create new position string
-    rot_str = f" {rotation}" if rotation != 0 else ""
-    new_at = f"(at {x} {y}{rot_str})"
-
-    # Replace
-    content = content[:actual_pos] + new_at + content[actual_end:]
-    print(f"  Placed {reference} at ({x}, {y}) rot={rotation}°")
-
-    return content
-
-
 def main():
+    generate_uuid.reset()
     pcb_path = Path(r"C:\Users\eckma\projects\SubaruDash\pcb\boards\power-hat\power-hat.kicad_pcb")
 
     print("=" * 60)
@@ -302,10 +240,19 @@ def main():
     # Read PCB content
     content = pcb_path.read_text(encoding='utf-8')
 
-    # Update component positions
+    # Update component positions (whole table validated, then applied in one pass)
     print("\nPlacing components...")
-    for ref, (x, y, rot) in COMPONENT_POSITIONS.items():
-        content = update_footprint_position(content, ref, x, y, rot)
+    transaction = PlacementTransaction(content)
+    transaction.place_table(COMPONENT_POSITIONS)
+    try:
+        content = transaction.commit()
+    except PlacementConflict as e:
+        print(f"ERROR: {len(e.conflicts)} placement conflict(s), PCB not modified:")
+        for line in e.report():
+            print(f"  {line}")
+        return 1
+    for target, _ in transaction.applied:
+        print(f"  Placed {target.reference} at ({target.x}, {target.y}) rot={target.rotation}°")
 
     # Add board outline if not present
     if 'Edge.Cuts' not in content or 'gr_line' not in content:
@@ -354,7 +301,8 @@ def main():
     print("4. Add copper zones (GND pour on B.Cu)")
     print("5. Route traces")
     print("6. Run DRC")
+    return 0
 
 
 if __name__ == "__main__":
-    main()
+    sys.exit(main())
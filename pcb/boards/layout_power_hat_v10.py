@@ -12,13 +12,22 @@ Mounting holes at corners - need 5mm clearance:
 - H2: (61.5, 3.5) -> avoid X>57, Y<8
 - H3: (3.5, 52.5) -> avoid X<8, Y>48
 - H4: (61.5, 52.5) -> avoid X>57, Y>48
+
+Run with --watch to leave the PCB untouched and re-check the fan zone every
+time the board is saved in KiCad.
 """
 
-import re
+import sys
 import shutil
 from pathlib import Path
 from datetime import datetime
 
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from kicad_tools.placement import (
+    PlacementTransaction, PlacementConflict, RectKeepout, keepout_conflicts,
+)
+from kicad_tools.watch import watch, print_report
+
 BOARD_OFFSET_X = 95.78
 BOARD_OFFSET_Y = 54.0
 
@@ -26,11 +35,9 @@ BOARD_OFFSET_Y = 54.0
 FAN_ZONE_X_MIN, FAN_ZONE_X_MAX = 17.5, 47.5
 FAN_ZONE_Y_MIN, FAN_ZONE_Y_MAX = 17.0, 47.0
 
-def check_placement(x, y, ref):
-    if FAN_ZONE_X_MIN <= x <= FAN_ZONE_X_MAX and FAN_ZONE_Y_MIN <= y <= FAN_ZONE_Y_MAX:
-        print(f"  ERROR: {ref} IN FAN ZONE!")
-        return False
-    return True
+KEEPOUTS = [
+    RectKeepout("FAN ZONE", FAN_ZONE_X_MIN, FAN_ZONE_X_MAX, FAN_ZONE_Y_MIN, FAN_ZONE_Y_MAX),
+]
 
 # =============================================================================
 # FRONT LAYER - Through-hole components
@@ -110,71 +117,27 @@ BACK_LAYER_POSITIONS = {
 }
 
 
-def find_footprint_bounds(content, reference):
-    ref_pattern = rf'\(property "Reference" "{re.escape(reference)}"'
-    ref_match = re.search(ref_pattern, content)
-    if not ref_match:
-        return None, None, None
-
-    search_start = max(0, ref_match.start() - 3000)
-    search_area = content[search_start:ref_match.start()]
-    fp_matches = list(re.finditer(r'\(footprint ', search_area))
-    if not fp_matches:
-        return None, None, None
-
-    fp_start = search_start + fp_matches[-1].start()
-    depth = 0
-    fp_end = fp_start
-    for i, char in enumerate(content[fp_start:]):
-        if char == '(':
-            depth += 1
-        elif char == ')':
-            depth -= 1
-            if depth == 0:
-                fp_end = fp_start + i + 1
-                break
-
-    return fp_start, fp_end, content[fp_start:fp_end]
-
-
-def update_position(footprint_block, x, y, rotation):
-    rot_str = f" {rotation}" if rotation != 0 else ""
-    new_at = f"(at {x} {y}{rot_str})"
-
-    pattern = r'(\(layer "[^"]+"\)\s*\n\s*\(uuid "[^"]+"\)\s*\n\s*)\(at [0-9.-]+ [0-9.-]+(?:\s+[0-9.-]+)?\)'
-    new_block, count = re.subn(pattern, lambda m: m.group(1) + new_at, footprint_block, count=1)
-
-    if count == 0:
-        pattern2 = r'\(at [0-9.-]+ [0-9.-]+(?:\s+[0-9.-]+)?\)'
-        matches = list(re.finditer(pattern2, footprint_block))
-        if matches:
-            m = matches[0]
-            new_block = footprint_block[:m.start()] + new_at + footprint_block[m.end():]
-
-    return new_block
-
-
-def process_component(content, reference, rel_x, rel_y, rotation, layer_name):
-    if not check_placement(rel_x, rel_y, reference):
-        return content, False
-
-    abs_x = rel_x + BOARD_OFFSET_X
-    abs_y = rel_y + BOARD_OFFSET_Y
-
-    fp_start, fp_end, footprint_block = find_footprint_bounds(content, reference)
-    if fp_start is None:
-        print(f"  SKIP: {reference} not found")
-        return content, False
-
-    new_block = update_position(footprint_block, abs_x, abs_y, rotation)
-    content = content[:fp_start] + new_block + content[fp_end:]
-    print(f"  {reference:10} -> ({rel_x:5.1f}, {rel_y:5.1f}) [{layer_name}]")
-    return content, True
+def report_clearance(model, changes):
+    """Watch callback: board summary plus fan-zone check of current positions"""
+    print_report(model, changes)
+    # Fan mounting holes sit inside the zone by design; check the placed parts only
+    tables = set(FRONT_LAYER_POSITIONS) | set(BACK_LAYER_POSITIONS)
+    placed = {ref: pos for ref, pos in model.positions.items() if ref in tables}
+    conflicts = keepout_conflicts(placed, KEEPOUTS, (BOARD_OFFSET_X, BOARD_OFFSET_Y))
+    for c in conflicts:
+        print(f"  ERROR: {c.reference} at ({c.x:.1f}, {c.y:.1f}) {c.reason}")
+    if not conflicts:
+        print("  Fan zone clear")
 
 
 def main():
     pcb_path = Path(r"C:\Users\eckma\projects\SubaruDash\pcb\boards\power-hat\power-hat.kicad_pcb")
 
+    if '--watch' in sys.argv[1:]:
+        print(f"Watching {pcb_path.name} (Ctrl+C to stop)")
+        watch(pcb_path, report_clearance)
+        return 0
+
     print("=" * 70)
     print("Power HAT PCB Layout v10 - Mounting Hole Clearance Fix")
     print("=" * 70)
@@ -194,30 +157,43 @@ def main():
     - Components spread horizontally along bottom edge
     """)
 
-    print("-" * 70)
-    print("FRONT LAYER:")
-    print("-" * 70)
-    front_count = 0
-    for ref, (x, y, rot) in sorted(FRONT_LAYER_POSITIONS.items()):
-        content, updated = process_component(content, ref, x, y, rot, "F.Cu")
-        if updated:
-            front_count += 1
-
-    print("\n" + "-" * 70)
-    print("BACK LAYER:")
-    print("-" * 70)
-    back_count = 0
-    for ref, (x, y, rot) in sorted(BACK_LAYER_POSITIONS.items()):
-        content, updated = process_component(content, ref, x, y, rot, "B.Cu")
-        if updated:
-            back_count += 1
-
-    pcb_path.write_text(content, encoding='utf-8')
+    # Whole layout is validated up front and written in one pass
+    transaction = PlacementTransaction(content, offset=(BOARD_OFFSET_X, BOARD_OFFSET_Y),
+                                       keepouts=KEEPOUTS)
+    transaction.place_table(dict(sorted(FRONT_LAYER_POSITIONS.items())), "F.Cu")
+    transaction.place_table(dict(sorted(BACK_LAYER_POSITIONS.items())), "B.Cu")
+
+    try:
+        new_content = transaction.commit()
+    except PlacementConflict as e:
+        print(f"ERROR: {len(e.conflicts)} placement conflict(s), PCB not modified:")
+        for line in e.report():
+            print(f"  {line}")
+        return 1
+
+    front_count = back_count = 0
+    for layer_name, title in (("F.Cu", "FRONT LAYER:"), ("B.Cu", "BACK LAYER:")):
+        print("-" * 70)
+        print(title)
+        print("-" * 70)
+        for target, flipped in transaction.applied:
+            if target.layer != layer_name:
+                continue
+            note = " (flipped)" if flipped else ""
+            print(f"  {target.reference:10} -> ({target.x:5.1f}, {target.y:5.1f}) [{layer_name}]{note}")
+            if layer_name == "F.Cu":
+                front_count += 1
+            else:
+                back_count += 1
+        print()
+
+    pcb_path.write_text(new_content, encoding='utf-8')
 
     print("\n" + "=" * 70)
     print(f"Layout v10 complete: {front_count} front, {back_count} back")
     print("=" * 70)
+    return 0
 
 
 if __name__ == "__main__":
-    main()
+    sys.exit(main())
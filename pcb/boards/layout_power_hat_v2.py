@@ -11,11 +11,15 @@ Changes from v1:
 """
 
 import re
+import sys
 import shutil
-import uuid
 from pathlib import Path
 from datetime import datetime
 
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from kicad_tools.placement import PlacementTransaction, PlacementConflict
+from kicad_tools.uuids import UuidSource
+
 # Board dimensions (Raspberry Pi HAT standard)
 BOARD_WIDTH = 65.0
 BOARD_HEIGHT = 56.0
@@ -121,9 +125,7 @@ COMPONENT_POSITIONS = {
 }
 
 
-def generate_uuid():
-    """Generate a UUID for KiCad elements."""
-    return str(uuid.uuid4())
+generate_uuid = UuidSource("power-hat")
 
 
 def create_board_outline():
@@ -233,44 +235,6 @@ def create_mounting_hole(x, y, idx):
 	)'''
 
 
-def update_footprint_position(content, reference, x, y, rotation):
-    """Update the position of a footprint by reference."""
-    # Find the reference property
-    ref_pattern = rf'\(property "Reference" "{re.escape(reference)}"'
-    ref_match = re.search(ref_pattern, content)
-
-    if not ref_match:
-        print(f"  WARNING: {reference} not found in PCB")
-        return content
-
-    # Search backwards from the reference to find the (at x y) line
-    search_start = max(0, ref_match.start() - 500)
-    search_area = content[search_start:ref_match.start()]
-
-    # Find the last (at x y) or (at x y rot) in this area
-    at_pattern = r'\(at [0-9.]+ [0-9.]+(?:\s+[0-9.]+)?\)'
-    at_matches = list(re.finditer(at_pattern, search_area))
-
-    if not at_matches:
-        print(f"  WARNING: Could not find position for {reference}")
-        return content
-
-    # Get the last match (closest to the reference)
-    last_at = at_matches[-1]
-    actual_pos = search_start + last_at.start()
-    actual_end = search_start + last_at.end()
-
-    # Create new position string
-    rot_str = f" {rotation}" if rotation != 0 else ""
-    new_at = f"(at {x} {y}{rot_str})"
-
-    # Replace
-    content = content[:actual_pos] + new_at + content[actual_end:]
-    print(f"  {reference:12} -> ({x:5.1f}, {y:5.1f}) rot={rotation}°")
-
-    return content
-
-
 def remove_existing_mounting_holes(content):
     """Remove any existing mounting hole footprints."""
     # Pattern to match mounting hole footprints
@@ -287,6 +251,7 @@ def remove_existing_board_outline(content):
 
 
 def main():
+    generate_uuid.reset()
     pcb_path = Path(r"C:\Users\eckma\projects\SubaruDash\pcb\boards\power-hat\power-hat.kicad_pcb")
 
     print("=" * 60)
@@ -302,17 +267,26 @@ def main():
     # Read PCB content
     content = pcb_path.read_text(encoding='utf-8')
 
+    # Update component positions (whole table validated, then applied in one pass)
+    print("\nPlacing components:")
+    print("-" * 40)
+    transaction = PlacementTransaction(content)
+    transaction.place_table(dict(sorted(COMPONENT_POSITIONS.items())))
+    try:
+        content = transaction.commit()
+    except PlacementConflict as e:
+        print(f"ERROR: {len(e.conflicts)} placement conflict(s), PCB not modified:")
+        for line in e.report():
+            print(f"  {line}")
+        return 1
+    for target, _ in transaction.applied:
+        print(f"  {target.reference:12} -> ({target.x:5.1f}, {target.y:5.1f}) rot={target.rotation}°")
+
     # Remove existing board outline and mounting holes for clean slate
     print("\nCleaning existing layout elements...")
     content = remove_existing_board_outline(content)
     content = remove_existing_mounting_holes(content)
 
-    # Update component positions
-    print("\nPlacing components:")
-    print("-" * 40)
-    for ref, (x, y, rot) in sorted(COMPONENT_POSITIONS.items()):
-        content = update_footprint_position(content, ref, x, y, rot)
-
     # Add board outline
     print("\nAdding board outline...")
     outline = create_board_outline()
@@ -352,7 +326,8 @@ Next steps in KiCad:
   4. Route signal traces (0.3-0.5mm width)
   5. Run DRC
 """)
+    return 0
 
 
 if __name__ == "__main__":
-    main()
+    sys.exit(main())
@@ -22,12 +22,15 @@ Clearance zones (5mm radius around each M3 hole):
 - FH4: X 39.5-49.5, Y 39-49
 """
 
-import re
+import sys
 import shutil
-import uuid
 from pathlib import Path
 from datetime import datetime
 
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from kicad_tools.placement import PlacementTransaction, PlacementConflict, CircleKeepout
+from kicad_tools.uuids import UuidSource
+
 # Board dimensions (Raspberry Pi HAT standard)
 BOARD_WIDTH = 65.0
 BOARD_HEIGHT = 56.0
@@ -53,14 +56,11 @@ FAN_MOUNTING_HOLES = [
 # Fan hole clearance radius (for M3 screw head)
 FAN_HOLE_CLEARANCE = 5.0
 
-def check_fan_clearance(x, y, component_name):
-    """Check if component position conflicts with fan mounting holes."""
-    for i, (hx, hy) in enumerate(FAN_MOUNTING_HOLES, 1):
-        dist = ((x - hx)**2 + (y - hy)**2)**0.5
-        if dist < FAN_HOLE_CLEARANCE:
-            print(f"  WARNING: {component_name} at ({x}, {y}) conflicts with FH{i} at ({hx}, {hy}), distance={dist:.1f}mm")
-            return False
-    return True
+# Every placement is checked against these before the PCB is touched
+KEEPOUTS = [
+    CircleKeepout(f"FH{i}", hx, hy, FAN_HOLE_CLEARANCE)
+    for i, (hx, hy) in enumerate(FAN_MOUNTING_HOLES, 1)
+]
 
 # Component placements (x, y, rotation in degrees)
 # V4 layout with improved spacing around fan mounting holes
@@ -138,47 +138,11 @@ COMPONENT_POSITIONS = {
 }
 
 
-def generate_uuid():
-    """Generate a UUID for KiCad elements."""
-    return str(uuid.uuid4())
-
-
-def update_footprint_position(content, reference, x, y, rotation):
-    """Update the position of a footprint by reference."""
-    ref_pattern = rf'\(property "Reference" "{re.escape(reference)}"'
-    ref_match = re.search(ref_pattern, content)
-
-    if not ref_match:
-        print(f"  SKIP: {reference} not found in PCB")
-        return content
-
-    # Check fan clearance
-    check_fan_clearance(x, y, reference)
-
-    search_start = max(0, ref_match.start() - 500)
-    search_area = content[search_start:ref_match.start()]
-
-    at_pattern = r'\(at [0-9.]+ [0-9.]+(?:\s+[0-9.]+)?\)'
-    at_matches = list(re.finditer(at_pattern, search_area))
-
-    if not at_matches:
-        print(f"  WARNING: No position for {reference}")
-        return content
-
-    last_at = at_matches[-1]
-    actual_pos = search_start + last_at.start()
-    actual_end = search_start + last_at.end()
-
-    rot_str = f" {rotation}" if rotation != 0 else ""
-    new_at = f"(at {x} {y}{rot_str})"
-
-    content = content[:actual_pos] + new_at + content[actual_end:]
-    print(f"  {reference:10} -> ({x:5.1f}, {y:5.1f}) rot={rotation}")
-
-    return content
+generate_uuid = UuidSource("power-hat")
 
 
 def main():
+    generate_uuid.reset()
     pcb_path = Path(r"C:\Users\eckma\projects\SubaruDash\pcb\boards\power-hat\power-hat.kicad_pcb")
 
     print("=" * 60)
@@ -196,8 +160,17 @@ def main():
     # Update component positions
     print("\nPlacing components (v4 improved spacing):")
     print("-" * 50)
-    for ref, (x, y, rot) in sorted(COMPONENT_POSITIONS.items()):
-        content = update_footprint_position(content, ref, x, y, rot)
+    transaction = PlacementTransaction(content, keepouts=KEEPOUTS)
+    transaction.place_table(dict(sorted(COMPONENT_POSITIONS.items())))
+    try:
+        content = transaction.commit()
+    except PlacementConflict as e:
+        print(f"ERROR: {len(e.conflicts)} placement conflict(s), PCB not modified:")
+        for line in e.report():
+            print(f"  {line}")
+        return 1
+    for target, _ in transaction.applied:
+        print(f"  {target.reference:10} -> ({target.x:5.1f}, {target.y:5.1f}) rot={target.rotation}")
 
     # Write updated PCB
     pcb_path.write_text(content, encoding='utf-8')
@@ -228,7 +201,8 @@ Next steps in KiCad:
   3. Run DRC to check clearances
   4. Route traces
 """)
+    return 0
 
 
 if __name__ == "__main__":
-    main()
+    sys.exit(main())
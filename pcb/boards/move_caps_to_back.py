@@ -7,12 +7,18 @@ and changes their layer from F.Cu to B.Cu.
 """
 
 import re
+import sys
 import shutil
 from pathlib import Path
 from datetime import datetime
 
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from kicad_tools.sexpr import parse
+from kicad_tools.index import build_index
+from kicad_tools.edit import Editor
 
-def flip_footprint_to_back(content, reference):
+
+def flip_footprint_to_back(editor, index, reference):
     """
     Flip a footprint from F.Cu to B.Cu (front to back).
 
@@ -21,44 +27,19 @@ def flip_footprint_to_back(content, reference):
     - All F.* layers to B.* layers within the footprint
     """
     # Find the footprint block for this reference
-    ref_pattern = rf'\(property "Reference" "{re.escape(reference)}"'
-    ref_match = re.search(ref_pattern, content)
+    entry = index.get(reference)
 
-    if not ref_match:
+    if entry is None:
         print(f"  SKIP: {reference} not found")
-        return content, False
-
-    # Find the start of this footprint (search backwards for "(footprint")
-    search_start = max(0, ref_match.start() - 2000)
-    search_area = content[search_start:ref_match.start()]
-
-    # Find the last "(footprint" before the reference
-    fp_matches = list(re.finditer(r'\(footprint ', search_area))
-    if not fp_matches:
-        print(f"  WARNING: Could not find footprint start for {reference}")
-        return content, False
-
-    fp_start = search_start + fp_matches[-1].start()
-
-    # Find the end of this footprint by counting parentheses
-    depth = 0
-    fp_end = fp_start
-    for i, char in enumerate(content[fp_start:]):
-        if char == '(':
-            depth += 1
-        elif char == ')':
-            depth -= 1
-            if depth == 0:
-                fp_end = fp_start + i + 1
-                break
+        return False
 
     # Extract the footprint block
-    footprint_block = content[fp_start:fp_end]
+    footprint_block = entry.node.text(editor.content)
 
     # Check if already on back layer
-    if '(layer "B.Cu")' in footprint_block[:200]:
+    if entry.layer == "B.Cu":
         print(f"  SKIP: {reference} already on back layer")
-        return content, False
+        return False
 
     # Flip all layer references within this footprint
     new_block = footprint_block
@@ -87,11 +68,11 @@ def flip_footprint_to_back(content, reference):
     # Adhesive layers
     new_block = new_block.replace('"F.Adhes"', '"B.Adhes"')
 
-    # Replace the footprint block in content
-    content = content[:fp_start] + new_block + content[fp_end:]
+    # Queue the replacement; the file is rebuilt once in main()
+    editor.replace_node(entry.node, new_block)
 
     print(f"  {reference:10} -> B.Cu (flipped to back)")
-    return content, True
+    return True
 
 
 def main():
@@ -108,11 +89,12 @@ def main():
     print(f"\nBackup: {backup_path.name}")
 
     content = pcb_path.read_text(encoding='utf-8')
+    index = build_index(parse(content))
+    editor = Editor(content)
 
     # Find all capacitor references (C1, C2, C3, etc.)
-    cap_pattern = r'\(property "Reference" "(C[0-9]+)"'
-    cap_refs = re.findall(cap_pattern, content)
-    cap_refs = sorted(set(cap_refs), key=lambda x: int(re.search(r'\d+', x).group()))
+    cap_refs = [ref for ref in index if re.fullmatch(r'C[0-9]+', ref)]
+    cap_refs = sorted(cap_refs, key=lambda x: int(re.search(r'\d+', x).group()))
 
     print(f"\nFound {len(cap_refs)} capacitors: {', '.join(cap_refs)}")
     print("\nFlipping to back layer:")
@@ -120,12 +102,12 @@ def main():
 
     flipped_count = 0
     for ref in cap_refs:
-        content, flipped = flip_footprint_to_back(content, ref)
+        flipped = flip_footprint_to_back(editor, index, ref)
         if flipped:
             flipped_count += 1
 
     # Write updated PCB
-    pcb_path.write_text(content, encoding='utf-8')
+    pcb_path.write_text(editor.apply(), encoding='utf-8')
 
     print("\n" + "=" * 60)
     print(f"Done! Flipped {flipped_count} capacitors to back layer.")
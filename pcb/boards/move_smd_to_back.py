@@ -27,10 +27,16 @@ Fan mounting hole clearance zones (5mm radius):
 """
 
 import re
+import sys
 import shutil
 from pathlib import Path
 from datetime import datetime
 
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from kicad_tools.sexpr import parse
+from kicad_tools.index import build_index
+from kicad_tools.edit import Editor
+
 # Back-layer component positions (x, y, rotation)
 # Strategically placed under front-layer components
 BACK_LAYER_POSITIONS = {
@@ -81,39 +87,6 @@ def check_fan_clearance(x, y, ref):
     return True
 
 
-def find_footprint_bounds(content, reference):
-    """Find the start and end positions of a footprint block."""
-    ref_pattern = rf'\(property "Reference" "{re.escape(reference)}"'
-    ref_match = re.search(ref_pattern, content)
-
-    if not ref_match:
-        return None, None, None
-
-    # Search backwards for "(footprint"
-    search_start = max(0, ref_match.start() - 3000)
-    search_area = content[search_start:ref_match.start()]
-
-    fp_matches = list(re.finditer(r'\(footprint ', search_area))
-    if not fp_matches:
-        return None, None, None
-
-    fp_start = search_start + fp_matches[-1].start()
-
-    # Find end by counting parentheses
-    depth = 0
-    fp_end = fp_start
-    for i, char in enumerate(content[fp_start:]):
-        if char == '(':
-            depth += 1
-        elif char == ')':
-            depth -= 1
-            if depth == 0:
-                fp_end = fp_start + i + 1
-                break
-
-    return fp_start, fp_end, content[fp_start:fp_end]
-
-
 def flip_to_back_layer(footprint_block):
     """Convert all F.* layer references to B.* within a footprint."""
     block = footprint_block
@@ -181,16 +154,18 @@ def update_position(footprint_block, x, y, rotation):
     return new_block
 
 
-def process_component(content, reference, x, y, rotation):
+def process_component(editor, index, reference, x, y, rotation):
     """Move a component to back layer and update its position."""
-    fp_start, fp_end, footprint_block = find_footprint_bounds(content, reference)
+    entry = index.get(reference)
 
-    if fp_start is None:
+    if entry is None:
         print(f"  SKIP: {reference} not found in PCB")
-        return content, False
+        return False
+
+    footprint_block = entry.node.text(editor.content)
 
     # Check if already on back
-    already_back = '(layer "B.Cu")' in footprint_block[:200]
+    already_back = entry.layer == "B.Cu"
 
     # Check fan clearance
     check_fan_clearance(x, y, reference)
@@ -201,13 +176,13 @@ def process_component(content, reference, x, y, rotation):
     # Update position
     new_block = update_position(new_block, x, y, rotation)
 
-    # Replace in content
-    content = content[:fp_start] + new_block + content[fp_end:]
+    # Queue the replacement; the file is rebuilt once in main()
+    editor.replace_node(entry.node, new_block)
 
     status = "repositioned" if already_back else "flipped + positioned"
     print(f"  {reference:10} -> B.Cu ({x:5.1f}, {y:5.1f}) rot={rotation:3}  [{status}]")
 
-    return content, True
+    return True
 
 
 def main():
@@ -224,6 +199,8 @@ def main():
     print(f"\nBackup: {backup_path.name}")
 
     content = pcb_path.read_text(encoding='utf-8')
+    index = build_index(parse(content))
+    editor = Editor(content)
 
     print("\n" + "-" * 70)
     print("Strategic Back-Layer Placement:")
@@ -253,12 +230,12 @@ def main():
 
     moved_count = 0
     for ref, (x, y, rot) in sorted(BACK_LAYER_POSITIONS.items()):
-        content, moved = process_component(content, ref, x, y, rot)
+        moved = process_component(editor, index, ref, x, y, rot)
         if moved:
             moved_count += 1
 
     # Write updated PCB
-    pcb_path.write_text(content, encoding='utf-8')
+    pcb_path.write_text(editor.apply(), encoding='utf-8')
 
     print("\n" + "=" * 70)
     print(f"Done! Processed {moved_count} components to back layer.")
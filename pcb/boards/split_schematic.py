@@ -11,9 +11,15 @@ Usage: python split_schematic.py
 
 import re
 import os
-import uuid
+import sys
 from pathlib import Path
 
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from kicad_tools.sexpr import parse, line_start
+from kicad_tools.schematic import placed_symbols
+from kicad_tools.cache import load_cached
+from kicad_tools.uuids import UuidSource
+
 # Define which components go to which board
 POWER_HAT_COMPONENTS = {
     # ICs
@@ -68,45 +74,16 @@ CAN_HAT_COMPONENTS = {
 
 # J2 (Pi header) will be duplicated for both HATs
 
-def generate_uuid():
-    """Generate a new UUID for KiCad."""
-    return str(uuid.uuid4())
-
-def read_schematic(filepath):
-    """Read the schematic file."""
-    with open(filepath, 'r', encoding='utf-8') as f:
-        return f.read()
+generate_uuid = UuidSource("split-schematic")
 
-def extract_symbol_blocks(content):
+def extract_symbol_blocks(content, root=None):
     """Extract all symbol blocks from the schematic."""
-    symbols = []
-
-    # Use balanced parentheses approach
-    lines = content.split('\n')
-    in_symbol = False
-    current_symbol = []
-    paren_depth = 0
-
-    for i, line in enumerate(lines):
-        # Look for standalone (symbol line followed by (lib_id on next line
-        if line == '\t(symbol':
-            # Check if next line has lib_id (component instance, not library def)
-            if i + 1 < len(lines) and '(lib_id' in lines[i + 1]:
-                in_symbol = True
-                current_symbol = [line]
-                paren_depth = line.count('(') - line.count(')')
-                continue
-
-        if in_symbol:
-            current_symbol.append(line)
-            paren_depth += line.count('(') - line.count(')')
-            if paren_depth <= 0:
-                symbols.append('\n'.join(current_symbol))
-                in_symbol = False
-                current_symbol = []
-                paren_depth = 0
-
-    return symbols
+    if root is None:
+        root = parse(content)
+
+    # Placed components only - library definitions live inside (lib_symbols)
+    return [content[line_start(content, sym.start):sym.end]
+            for sym in placed_symbols(root)]
 
 def get_symbol_reference(symbol_block):
     """Extract the reference designator from a symbol block."""
@@ -116,8 +93,11 @@ def get_symbol_reference(symbol_block):
         return match.group(1)
     return None
 
-def extract_wires_and_labels(content):
+def extract_wires_and_labels(content, root=None):
     """Extract all wire and label elements."""
+    if root is None:
+        root = parse(content)
+
     elements = {
         'wires': [],
         'labels': [],
@@ -131,46 +111,34 @@ def extract_wires_and_labels(content):
         'text': [],
     }
 
-    lines = content.split('\n')
-    current_block = []
-    block_type = None
-    paren_depth = 0
-
     type_mapping = {
-        '(wire': 'wires',
-        '(label': 'labels',
-        '(global_label': 'global_labels',
-        '(junction': 'junctions',
-        '(no_connect': 'no_connects',
-        '(bus ': 'bus',
-        '(bus_entry': 'bus_entry',
-        '(polyline': 'polyline',
-        '(text': 'text',
+        'wire': 'wires',
+        'label': 'labels',
+        'global_label': 'global_labels',
+        'junction': 'junctions',
+        'no_connect': 'no_connects',
+        'bus': 'bus',
+        'bus_entry': 'bus_entry',
+        'polyline': 'polyline',
+        'text': 'text',
+        'text_box': 'text',
     }
 
-    for line in lines:
-        if block_type is None:
-            for prefix, btype in type_mapping.items():
-                if line.strip().startswith(prefix):
-                    block_type = btype
-                    current_block = [line]
-                    paren_depth = line.count('(') - line.count(')')
-                    break
-        else:
-            current_block.append(line)
-            paren_depth += line.count('(') - line.count(')')
-            if paren_depth <= 0:
-                elements[block_type].append('\n'.join(current_block))
-                block_type = None
-                current_block = []
+    # Only top-level elements - graphics inside lib_symbols are not sheet items
+    for node in root.children():
+        block_type = type_mapping.get(node.tag)
+        if block_type:
+            elements[block_type].append(content[line_start(content, node.start):node.end])
 
     return elements
 
-def extract_lib_symbols(content):
+def extract_lib_symbols(content, root=None):
     """Extract the lib_symbols section."""
-    match = re.search(r'(\(lib_symbols\n.*?\n\t\))\n', content, re.DOTALL)
-    if match:
-        return match.group(1)
+    if root is None:
+        root = parse(content)
+    section = root.find('lib_symbols')
+    if section is not None:
+        return section.text(content)
     return "(lib_symbols\n\t)"
 
 def create_schematic_header(title):
@@ -293,6 +261,7 @@ def write_schematic(filepath, title, lib_symbols, symbols, elements=None):
     print(f"Created: {filepath}")
 
 def main():
+    generate_uuid.reset()
     # Paths
     script_dir = Path(__file__).parent
     original_sch = script_dir.parent / "wrx-power-can-hat-MANUAL.kicad_sch"
@@ -307,20 +276,22 @@ def main():
 
     # Read original schematic
     print(f"\nReading: {original_sch}")
-    content = read_schematic(original_sch)
+    parsed = load_cached(original_sch)
+    content = parsed.content
+    root = parsed.root
 
     # Extract components
     print("Extracting symbols...")
-    symbols = extract_symbol_blocks(content)
+    symbols = extract_symbol_blocks(content, root)
     print(f"  Found {len(symbols)} symbols")
 
     # Extract lib_symbols
     print("Extracting library symbols...")
-    lib_symbols = extract_lib_symbols(content)
+    lib_symbols = extract_lib_symbols(content, root)
 
     # Extract wires and labels
     print("Extracting wires and labels...")
-    elements = extract_wires_and_labels(content)
+    elements = extract_wires_and_labels(content, root)
     print(f"  Wires: {len(elements['wires'])}")
     print(f"  Labels: {len(elements['labels'])}")
     print(f"  Global labels: {len(elements['global_labels'])}")
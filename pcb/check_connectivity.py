@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+"""
+Connectivity check of the schematic variants against the design tables
+Computes the nets each wrx-power-can-hat-*.kicad_sch actually draws
+(wires, junctions, labels, power symbols, pins) and compares them with the
+shared PIN_CONNECTIONS design table
+
+Usage (from pcb/):
+    python check_connectivity.py                 # the auto-wired variants
+    python check_connectivity.py -v wrx-power-can-hat-SAFE.kicad_sch
+"""
+
+import sys
+import time
+from pathlib import Path
+
+from kicad_tools.cache import load_cached
+from kicad_tools.model import SchematicModel
+from kicad_tools.netlist import build_netlist, compare
+from design_tables import PIN_CONNECTIONS
+
+PCB_DIR = Path(__file__).resolve().parent
+
+VARIANTS = ['AUTOWIRED', 'INTELLIGENT', 'PINTOPIN', 'PERFECT', 'SAFE', 'MANUAL', 'MAZE']
+
+
+def check_file(path, connections):
+    started = time.perf_counter()
+    root = load_cached(path, strict=False).root
+    model = SchematicModel.from_root(root)
+    netlist = build_netlist(model, root)
+    diff = compare(netlist, connections)
+    return netlist, diff, time.perf_counter() - started
+
+
+def print_details(netlist, diff):
+    for net, pieces in sorted(diff.opens.items()):
+        parts = " | ".join(", ".join(f"{r}.{p}" for r, p in piece) for piece in pieces)
+        print(f"    OPEN   {net}: {parts}")
+    for drawn, nets in sorted(diff.shorts.items()):
+        print(f"    SHORT  {drawn}: {', '.join(nets)}")
+    if diff.missing:
+        print(f"    MISSING on sheet: {', '.join(f'{r}.{p}' for r, p in diff.missing)}")
+    for ref, pin, drawn in diff.extra:
+        print(f"    EXTRA  {ref}.{pin} on {drawn}")
+    for name, names in netlist.conflicts:
+        print(f"    NAMES  {name} also labelled {', '.join(names[1:])}")
+
+
+def main():
+    verbose = '-v' in sys.argv
+    paths = [a for a in sys.argv[1:] if not a.startswith('-')]
+    if not paths:
+        paths = [PCB_DIR / f"wrx-power-can-hat-{v}.kicad_sch" for v in VARIANTS]
+        paths = [p for p in paths if p.exists()]
+
+    connections = PIN_CONNECTIONS
+    print(f"Design: {sum(len(m) for m in connections.values())} pins on "
+          f"{len({n for m in connections.values() for n in m.values()})} nets")
+    print()
+    print(f"{'File':45} {'nets ok':>9} {'open':>5} {'short':>6} {'missing':>8} {'extra':>6} {'ms':>6}")
+    print("-" * 90)
+    for path in paths:
+        netlist, diff, elapsed = check_file(path, connections)
+        print(f"{Path(path).name:45} {diff.matched:>4}/{diff.expected:<4} {len(diff.opens):>5} "
+              f"{len(diff.shorts):>6} {len(diff.missing):>8} {len(diff.extra):>6} {elapsed * 1000:>6.1f}")
+        if verbose:
+            print_details(netlist, diff)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
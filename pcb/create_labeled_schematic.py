@@ -3,90 +3,21 @@
 Create a clean schematic using global labels for all connections
 Removes problematic wires and replaces them with labels
 Adds No Connect flags to unused pins
+
+Pin locations are computed from the schematic itself (lib_symbols and
+instance transforms), so no ERC report is needed. Pass --erc FILE to take
+them from a KiCad ERC report instead.
 """
 
 import re
-import uuid
-
-def generate_uuid():
-    return str(uuid.uuid4())
-
-# Pin connections from design specification
-PIN_CONNECTIONS = {
-    "J1": {"4": "+12V", "7": "12V_IGN", "8": "GND"},
-    "F1": {"1": "+12V", "2": "12V_FUSED"},
-    "D1": {"1": "12V_FUSED", "2": "GND"},
-    "D2": {"1": "12V_FUSED", "2": "12V_SWITCHED"},
-    "Q1": {"1": "12V_FUSED", "2": "GATE_CTRL", "3": "12V_SWITCHED"},
-    "R1": {"1": "+12V", "2": "GND"},
-    "R2": {"1": "12V_FUSED", "2": "GATE_CTRL"},
-    "R3": {"1": "12V_SWITCHED", "2": "LED1_ANODE"},
-    "C1": {"1": "12V_FUSED", "2": "GND"},
-    "LED1": {"1": "LED1_ANODE", "2": "GND"},
-    "U1": {"1": "12V_SWITCHED", "2": "U1_SW", "3": "GND", "4": "U1_FB", "5": "12V_SWITCHED"},
-    "L1": {"1": "U1_SW", "2": "+5V"},
-    "D3": {"1": "GND", "2": "U1_SW"},
-    "C2": {"1": "12V_SWITCHED", "2": "GND"},
-    "C3": {"1": "+5V", "2": "GND"},
-    "R4": {"1": "+5V", "2": "U1_FB"},
-    "R5": {"1": "U1_FB", "2": "GND"},
-    "U2": {"1": "12V_IGN", "2": "GND", "3": "GND", "4": "IGN_DETECT"},
-    "R6": {"1": "12V_IGN", "2": "U2_LED"},
-    "R7": {"1": "IGN_DETECT", "2": "+3.3V"},
-    "C4": {"1": "IGN_DETECT", "2": "GND"},
-    "C5": {"1": "IGN_DETECT", "2": "GND"},
-    "U3": {"1": "RESET", "2": "TIMER_LED", "3": "HEARTBEAT_LED", "4": "GND",
-           "5": "IGN_DETECT", "6": "SHUTDOWN_REQ", "7": "GATE_CTRL", "8": "+3.3V"},
-    "C6": {"1": "+3.3V", "2": "GND"},
-    "R8": {"1": "RESET", "2": "+3.3V"},
-    "R9": {"1": "TIMER_LED", "2": "LED2_ANODE"},
-    "R14": {"1": "HEARTBEAT_LED", "2": "LED3_ANODE"},
-    "LED2": {"1": "LED2_ANODE", "2": "GND"},
-    "LED3": {"1": "LED3_ANODE", "2": "GND"},
-    "J3": {"1": "SPI_MISO", "2": "+3.3V", "3": "SPI_SCLK", "4": "SPI_MOSI", "5": "RESET", "6": "GND"},
-    "Q2": {"1": "GATE_CTRL", "2": "Q1_GATE", "3": "GND"},
-    "R10": {"1": "GATE_CTRL", "2": "Q2_GATE"},
-    "R11": {"1": "Q2_GATE", "2": "GND"},
-    "U4": {"1": "SPI_CE0", "2": "SPI_SCLK", "3": "SPI_MISO", "4": "SPI_MOSI",
-           "5": "GND", "6": "CAN_INT", "7": "XTAL2", "8": "XTAL1",
-           "9": "+3.3V", "10": "CAN_RX", "11": "CAN_TX"},
-    "U5": {"1": "CAN_TX", "2": "GND", "3": "+3.3V", "4": "CAN_RX", "5": "CANL", "6": "CANH"},
-    "Y1": {"1": "XTAL1", "2": "XTAL2"},
-    "C7": {"1": "+3.3V", "2": "GND"},
-    "C8": {"1": "+3.3V", "2": "GND"},
-    "C9": {"1": "XTAL1", "2": "GND"},
-    "C10": {"1": "XTAL2", "2": "GND"},
-    "R12": {"1": "CAN_INT", "2": "+3.3V"},
-    "R13": {"1": "CANH", "2": "CANL"},
-    "J4": {"6": "CANH", "14": "CANL", "4": "GND"},
-    "J5": {"1": "CANH", "2": "CANL"},
-    "JP1": {"1": "CANH", "2": "CANL"},
-    "Q3": {"1": "FAN_PWM", "2": "FAN-", "3": "GND"},
-    "D7": {"1": "FAN-", "2": "FAN+"},
-    "R15": {"1": "FAN_PWM", "2": "Q3_GATE"},
-    "J6": {"1": "FAN+", "2": "FAN-"},
-    "JP2": {"1": "+5V", "2": "FAN+", "3": "12V_SWITCHED"},
-    "U6": {"1": "GND", "2": "+3.3V", "3": "+5V"},
-    "C11": {"1": "+5V", "2": "GND"},
-    "C12": {"1": "+3.3V", "2": "GND"},
-    "J2": {"1": "+3.3V", "2": "+5V", "4": "+5V", "6": "GND", "9": "GND",
-           "19": "SPI_MOSI", "21": "SPI_MISO", "22": "CAN_INT", "23": "SPI_SCLK",
-           "24": "SPI_CE0", "37": "FAN_PWM", "12": "SHUTDOWN_REQ"},
-    "U7": {"1": "I2S_BCK", "2": "I2S_LRCK", "3": "I2S_DATA", "4": "+3.3V",
-           "5": "GND", "6": "AUDIO_L+", "7": "AUDIO_L-", "8": "AUDIO_R+", "9": "AUDIO_R-"},
-    "C13": {"1": "+3.3V", "2": "GND"},
-    "C14": {"1": "+3.3V", "2": "GND"},
-    "C15": {"1": "AUDIO_L+", "2": "AUDIO_L_OUT"},
-    "C16": {"1": "AUDIO_L-", "2": "AUDIO_L_OUT"},
-    "C17": {"1": "AUDIO_R+", "2": "AUDIO_R_OUT"},
-    "C18": {"1": "AUDIO_R-", "2": "AUDIO_R_OUT"},
-    "R16": {"1": "AUDIO_L+", "2": "AUDIO_L_OUT"},
-    "R17": {"1": "AUDIO_L-", "2": "AUDIO_L_OUT"},
-    "R18": {"1": "AUDIO_R+", "2": "AUDIO_R_OUT"},
-    "R19": {"1": "AUDIO_R-", "2": "AUDIO_R_OUT"},
-    "J7": {"1": "AUDIO_L_OUT", "2": "AUDIO_L_OUT", "3": "AUDIO_R_OUT",
-           "4": "AUDIO_R_OUT", "5": "GND", "6": "GND"},
-}
+import sys
+
+from kicad_tools.pins import pin_locations as schematic_pin_locations
+from kicad_tools.spatial import PointIndex
+from kicad_tools.uuids import UuidSource
+from design_tables import PIN_CONNECTIONS
+
+generate_uuid = UuidSource("wrx-power-can-hat-LABELS")
 
 def parse_erc_for_pin_locations(erc_file):
     """Extract pin locations from ERC report"""
@@ -105,6 +36,11 @@ def parse_erc_for_pin_locations(erc_file):
 
     return pin_locations
 
+def compute_pin_locations(schematic_file):
+    """Compute pin locations from the schematic's symbols (cached per file contents)"""
+    return {key: (loc.x_mils, loc.y_mils)
+            for key, loc in schematic_pin_locations(schematic_file).items()}
+
 def mils_to_mm(mils):
     """Convert mils to mm"""
     return mils * 0.0254
@@ -180,16 +116,20 @@ def remove_wires_and_junctions(content):
     return content
 
 def main():
+    generate_uuid.reset()
     input_file = "C:/Users/eckma/projects/SubaruDash/pcb/wrx-power-can-hat-PINTOPIN.kicad_sch"
-    erc_file = "C:/Users/eckma/projects/SubaruDash/pcb/ERC.rpt"
+    erc_file = sys.argv[sys.argv.index('--erc') + 1] if '--erc' in sys.argv[1:-1] else None
     output_file = "C:/Users/eckma/projects/SubaruDash/pcb/wrx-power-can-hat-LABELS.kicad_sch"
 
     print("Creating clean schematic with global labels...")
     print()
 
-    # Parse ERC to get pin locations
-    print("Step 1: Parsing pin locations from ERC report...")
-    pin_locations = parse_erc_for_pin_locations(erc_file)
+    if erc_file:
+        print("Step 1: Parsing pin locations from ERC report...")
+        pin_locations = parse_erc_for_pin_locations(erc_file)
+    else:
+        print("Step 1: Computing pin locations from symbol placements...")
+        pin_locations = compute_pin_locations(input_file)
     print(f"  Found {len(pin_locations)} pin locations")
 
     # Read schematic
@@ -252,17 +192,13 @@ def main():
         if locations:
             # Add one power symbol per unique power net location
             # (deduplicate close locations)
-            unique_locs = []
+            unique_locs = PointIndex(cell=100)
             for x, y in locations:
                 # Check if we already have a symbol close to this location
-                is_duplicate = False
-                for ux, uy in unique_locs:
-                    if abs(x - ux) < 100 and abs(y - uy) < 100:  # Within 100 mils
-                        is_duplicate = True
-                        break
+                is_duplicate = unique_locs.any_within_box(x, y, 100)  # Within 100 mils
 
                 if not is_duplicate:
-                    unique_locs.append((x, y))
+                    unique_locs.insert(x, y)
                     # Offset the power symbol slightly from the pin
                     offset_x = x + 50
                     offset_y = y
@@ -0,0 +1,160 @@
+#!/usr/bin/env python3
+"""
+Design tables for the WRX power / CAN HAT schematic
+Shared by the auto-wire, label and connectivity scripts
+"""
+
+# Component positions from generate_schematic.py
+COMPONENTS = {
+    "F1": (50, 50), "D1": (75, 50), "D2": (100, 50), "Q1": (125, 50),
+    "R1": (50, 75), "R2": (75, 75), "R3": (100, 75), "C1": (125, 75),
+    "LED1": (150, 75), "J1": (25, 50), "U1": (50, 125), "L1": (75, 125),
+    "D3": (100, 125), "C2": (50, 150), "C3": (75, 150), "R4": (100, 150),
+    "R5": (125, 150), "U2": (175, 50), "R6": (175, 75), "R7": (200, 75),
+    "C4": (225, 75), "C5": (250, 75), "U3": (175, 125), "C6": (175, 150),
+    "R8": (200, 150), "R9": (225, 150), "R14": (250, 150), "LED2": (200, 125),
+    "LED3": (225, 125), "J3": (250, 125), "Q2": (150, 50), "R10": (150, 75),
+    "R11": (175, 50), "U4": (50, 200), "U5": (100, 200), "Y1": (75, 225),
+    "C7": (50, 225), "C8": (100, 225), "C9": (125, 225), "C10": (150, 225),
+    "R12": (125, 200), "R13": (150, 200), "J4": (175, 200), "J5": (175, 225),
+    "JP1": (200, 225), "Q3": (225, 200), "D7": (250, 200), "R15": (225, 225),
+    "J6": (250, 225), "JP2": (275, 225), "U6": (50, 275), "C11": (75, 275),
+    "C12": (100, 275), "J2": (150, 275), "U7": (225, 275), "C13": (250, 275),
+    "C14": (275, 275), "C15": (225, 300), "C16": (250, 300), "C17": (275, 300),
+    "C18": (300, 300), "R16": (225, 325), "R17": (250, 325), "R18": (275, 325),
+    "R19": (300, 325), "J7": (325, 300),
+}
+
+# Detailed pin-to-net mapping from SCHEMATIC_DESIGN.md
+PIN_CONNECTIONS = {
+    # Section 1: Power Input
+    "J1": {"4": "+12V", "7": "12V_IGN", "8": "GND"},
+    "F1": {"1": "+12V", "2": "12V_FUSED"},
+    "D1": {"1": "12V_FUSED", "2": "GND"},
+    "D2": {"1": "12V_FUSED", "2": "12V_SWITCHED"},
+    "Q1": {"1": "12V_FUSED", "2": "GATE_CTRL", "3": "12V_SWITCHED"},
+    "R1": {"1": "+12V", "2": "GND"},
+    "R2": {"1": "12V_FUSED", "2": "GATE_CTRL"},
+    "R3": {"1": "12V_SWITCHED", "2": "LED1_ANODE"},
+    "C1": {"1": "12V_FUSED", "2": "GND"},
+    "LED1": {"1": "LED1_ANODE", "2": "GND"},
+
+    # Section 2: Buck Converter
+    "U1": {"1": "12V_SWITCHED", "2": "U1_SW", "3": "GND", "4": "U1_FB", "5": "12V_SWITCHED"},
+    "L1": {"1": "U1_SW", "2": "+5V"},
+    "D3": {"1": "GND", "2": "U1_SW"},
+    "C2": {"1": "12V_SWITCHED", "2": "GND"},
+    "C3": {"1": "+5V", "2": "GND"},
+    "R4": {"1": "+5V", "2": "U1_FB"},
+    "R5": {"1": "U1_FB", "2": "GND"},
+
+    # Section 3: Ignition Detection
+    "U2": {"1": "12V_IGN", "2": "GND", "3": "GND", "4": "IGN_DETECT"},
+    "R6": {"1": "12V_IGN", "2": "U2_LED"},
+    "R7": {"1": "IGN_DETECT", "2": "+3.3V"},
+    "C4": {"1": "IGN_DETECT", "2": "GND"},
+    "C5": {"1": "IGN_DETECT", "2": "GND"},
+
+    # Section 4: ATtiny85 Timer
+    "U3": {
+        "1": "RESET",
+        "2": "TIMER_LED",
+        "3": "HEARTBEAT_LED",
+        "4": "GND",
+        "5": "IGN_DETECT",
+        "6": "SHUTDOWN_REQ",
+        "7": "GATE_CTRL",
+        "8": "+3.3V"
+    },
+    "C6": {"1": "+3.3V", "2": "GND"},
+    "R8": {"1": "RESET", "2": "+3.3V"},
+    "R9": {"1": "TIMER_LED", "2": "LED2_ANODE"},
+    "R14": {"1": "HEARTBEAT_LED", "2": "LED3_ANODE"},
+    "LED2": {"1": "LED2_ANODE", "2": "GND"},
+    "LED3": {"1": "LED3_ANODE", "2": "GND"},
+    "J3": {"1": "SPI_MISO", "2": "+3.3V", "3": "SPI_SCLK", "4": "SPI_MOSI", "5": "RESET", "6": "GND"},
+
+    # Section 5: Gate Driver
+    "Q2": {"1": "GATE_CTRL", "2": "Q1_GATE", "3": "GND"},
+    "R10": {"1": "GATE_CTRL", "2": "Q2_GATE"},
+    "R11": {"1": "Q2_GATE", "2": "GND"},
+
+    # Section 6: CAN Interface
+    "U4": {
+        "1": "SPI_CE0", "2": "SPI_SCLK", "3": "SPI_MISO", "4": "SPI_MOSI",
+        "5": "GND", "6": "CAN_INT", "7": "XTAL2", "8": "XTAL1",
+        "9": "+3.3V", "10": "CAN_RX", "11": "CAN_TX"
+    },
+    "U5": {"1": "CAN_TX", "2": "GND", "3": "+3.3V", "4": "CAN_RX", "5": "CANL", "6": "CANH"},
+    "Y1": {"1": "XTAL1", "2": "XTAL2"},
+    "C7": {"1": "+3.3V", "2": "GND"},
+    "C8": {"1": "+3.3V", "2": "GND"},
+    "C9": {"1": "XTAL1", "2": "GND"},
+    "C10": {"1": "XTAL2", "2": "GND"},
+    "R12": {"1": "CAN_INT", "2": "+3.3V"},
+    "R13": {"1": "CANH", "2": "CANL"},
+    "J4": {"6": "CANH", "14": "CANL", "4": "GND"},
+    "J5": {"1": "CANH", "2": "CANL"},
+    "JP1": {"1": "CANH", "2": "CANL"},
+
+    # Section 7: Fan Control
+    "Q3": {"1": "FAN_PWM", "2": "FAN-", "3": "GND"},
+    "D7": {"1": "FAN-", "2": "FAN+"},
+    "R15": {"1": "FAN_PWM", "2": "Q3_GATE"},
+    "J6": {"1": "FAN+", "2": "FAN-"},
+    "JP2": {"1": "+5V", "2": "FAN+", "3": "12V_SWITCHED"},
+
+    # Section 9: 3.3V Regulator
+    "U6": {"1": "GND", "2": "+3.3V", "3": "+5V"},
+    "C11": {"1": "+5V", "2": "GND"},
+    "C12": {"1": "+3.3V", "2": "GND"},
+
+    # Section 10: GPIO Header (Pi connection)
+    "J2": {
+        "1": "+3.3V", "2": "+5V", "4": "+5V", "6": "GND", "9": "GND",
+        "19": "SPI_MOSI", "21": "SPI_MISO", "22": "CAN_INT", "23": "SPI_SCLK",
+        "24": "SPI_CE0", "37": "FAN_PWM", "12": "SHUTDOWN_REQ"
+    },
+
+    # Section 11: Audio DAC
+    "U7": {
+        "1": "I2S_BCK", "2": "I2S_LRCK", "3": "I2S_DATA", "4": "+3.3V",
+        "5": "GND", "6": "AUDIO_L+", "7": "AUDIO_L-", "8": "AUDIO_R+", "9": "AUDIO_R-"
+    },
+    "C13": {"1": "+3.3V", "2": "GND"},
+    "C14": {"1": "+3.3V", "2": "GND"},
+    "C15": {"1": "AUDIO_L+", "2": "AUDIO_L_OUT"},
+    "C16": {"1": "AUDIO_L-", "2": "AUDIO_L_OUT"},
+    "C17": {"1": "AUDIO_R+", "2": "AUDIO_R_OUT"},
+    "C18": {"1": "AUDIO_R-", "2": "AUDIO_R_OUT"},
+    "R16": {"1": "AUDIO_L+", "2": "AUDIO_L_OUT"},
+    "R17": {"1": "AUDIO_L-", "2": "AUDIO_L_OUT"},
+    "R18": {"1": "AUDIO_R+", "2": "AUDIO_R_OUT"},
+    "R19": {"1": "AUDIO_R-", "2": "AUDIO_R_OUT"},
+    "J7": {
+        "1": "AUDIO_L_OUT", "2": "AUDIO_L_OUT", "3": "AUDIO_R_OUT",
+        "4": "AUDIO_R_OUT", "5": "GND", "6": "GND"
+    },
+}
+
+# Nets labelled beside each part by auto_wire_safe.py (simplified subset)
+NETS = {
+    "GND": ["J1", "C1", "C2", "C3", "C6", "C7", "C8", "C9", "C10", "C11", "C12",
+            "U1", "U2", "U3", "U4", "U5", "J2", "J3"],
+    "+12V": ["J1", "F1", "D1", "Q1"],
+    "+5V": ["U1", "C3", "C7", "U3", "U4", "J2"],
+    "+3.3V": ["U5", "J2", "C6"],
+    "12V_FUSED": ["F1", "D1", "D2", "C1"],
+    "12V_SWITCHED": ["D2", "Q1", "U1", "LED1", "R3"],
+    "12V_IGN": ["J1", "R6", "U2"],
+    "IGN_DETECT": ["U2", "R7", "C4", "C5", "U3", "J2"],
+    "SPI_MOSI": ["J2", "U4"],
+    "SPI_MISO": ["J2", "U4"],
+    "SPI_SCLK": ["J2", "U4"],
+    "SPI_CE0": ["J2", "U4"],
+    "CAN_INT": ["U4", "J2", "R12"],
+    "CAN_TX": ["U4", "U5"],
+    "CAN_RX": ["U4", "U5"],
+    "CANH": ["U5", "J4", "J5", "R13", "JP1"],
+    "CANL": ["U5", "J4", "J5", "R13", "JP1"],
+}
@@ -4,14 +4,16 @@ KiCad Schematic Generator for WRX Power & CAN HAT
 Automatically generates component placement for the schematic.
 
 Usage:
-    python generate_schematic.py
+    python generate_schematic.py [--deterministic-uuids]
 
 Output:
     wrx-power-can-hat.kicad_sch (auto-generated schematic)
 """
 
-import uuid
 import datetime
+import os
+
+from kicad_tools.uuids import UuidSource
 
 # Component definitions from COMPONENT_REFERENCE.md
 COMPONENTS = {
@@ -113,9 +115,7 @@ POWER_SYMBOLS = [
     {"type": "+3.3V", "x": 25, "y": 250},
 ]
 
-def generate_uuid():
-    """Generate a UUID for KiCad components."""
-    return str(uuid.uuid4())
+generate_uuid = UuidSource("wrx-power-can-hat-AUTO")
 
 def mm_to_kicad(mm):
     """Convert millimeters to KiCad units (0.001mm)."""
@@ -123,7 +123,7 @@ def mm_to_kicad(mm):
 
 def create_symbol_instance(comp_data):
     """Generate S-expression for a symbol instance."""
-    uuid_str = generate_uuid()
+    uuid_str = generate_uuid("symbol", comp_data["ref"])
     x = mm_to_kicad(comp_data["x"])
     y = mm_to_kicad(comp_data["y"])
 
@@ -147,7 +147,7 @@ def create_symbol_instance(comp_data):
 
 def create_power_symbol(power_data):
     """Generate S-expression for a power symbol."""
-    uuid_str = generate_uuid()
+    uuid_str = generate_uuid("power", power_data["type"], power_data["x"], power_data["y"])
     x = mm_to_kicad(power_data["x"])
     y = mm_to_kicad(power_data["y"])
     pwr_type = power_data["type"]
@@ -167,11 +167,18 @@ def create_power_symbol(power_data):
 def generate_schematic():
     """Generate complete KiCad schematic file."""
 
-    timestamp = datetime.datetime.now().isoformat()
+    generate_uuid.reset()
+
+    if generate_uuid.deterministic:
+        # Same input, same bytes: take the date from SOURCE_DATE_EPOCH (or the epoch)
+        epoch = int(os.environ.get("SOURCE_DATE_EPOCH", "0"))
+        timestamp = datetime.datetime.fromtimestamp(epoch, datetime.timezone.utc).isoformat()
+    else:
+        timestamp = datetime.datetime.now().isoformat()
 
     header = f"""(kicad_sch (version 20230121) (generator generate_schematic.py)
 
-  (uuid {generate_uuid()})
+  (uuid {generate_uuid("sheet")})
 
   (paper "A3")
 
@@ -0,0 +1,53 @@
+"""
+Shared KiCad file tooling for the SubaruDash PCB scripts.
+
+The scripts in pcb/ and pcb/boards/ import from here instead of carrying
+their own regexes and paren-counting loops.
+
+Submodules are imported on first use of one of their names, so
+`python -m kicad_tools.<module>` does not load the module twice.
+"""
+
+import importlib
+
+_EXPORTS = {
+    'sexpr': ('Node', 'SExprError', 'parse', 'parse_all', 'load', 'quote'),
+    'edit': ('Editor', 'EditConflict'),
+    'index': ('RefIndex', 'build_index'),
+    'stream': ('ElementView', 'iter_elements'),
+    'cache': ('ParseCache', 'ParsedFile', 'FileSnapshot', 'load_cached'),
+    'placement': ('PlacementTransaction', 'PlacementConflict', 'RectKeepout', 'CircleKeepout'),
+    'watch': ('BoardModel', 'watch'),
+    'model': ('SchematicModel', 'PcbModel', 'build_model'),
+    'pins': ('PinPositions', 'place_pins', 'pin_locations'),
+    'router': ('MazeRouter',),
+    'spatial': ('PointIndex',),
+    'wirecheck': ('check_wires', 'check_file'),
+    'netlist': ('Netlist', 'build_netlist', 'compare'),
+    'steiner': ('route_tree',),
+    'channels': ('assign_tracks',),
+    'autowire': ('STRATEGIES', 'Sheet', 'Wiring', 'strategy'),
+    'simplify': ('simplify_wires', 'simplify_file'),
+    'diff': ('diff_files', 'snapshot'),
+    'rules': ('RuleSet', 'load_rules'),
+    'columnar': ('ColumnarFile', 'write_tables'),
+    'query': ('DesignIndex', 'load_index'),
+}
+
+# wirecheck.check_file is the exported check_file; rules has its own
+_ORIGIN = {name: module for module, names in _EXPORTS.items() for name in names}
+
+__all__ = sorted(_ORIGIN)
+
+
+def __getattr__(name):
+    module = _ORIGIN.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f".{module}", __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_ORIGIN))
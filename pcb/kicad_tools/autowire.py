@@ -0,0 +1,328 @@
+#!/usr/bin/env python3
+"""
+Pluggable auto-wiring engine for schematics
+
+A strategy takes a Sheet (parsed schematic, model and placed pins) and a
+{reference: {pin: net}} design table and returns a Wiring: wire segments
+tagged with their net, junctions, global labels and power symbols. The engine does
+everything else once: parsing through the cache, checking the result for
+cross-net contacts, rendering S-expressions and inserting them before
+(sheet_instances ...).
+
+    label     a global label on every connected pin, no wires
+    nearest-label
+              pin -> nearest existing label of the net, as an L (across, then
+              up or down to the label)
+    channel   pin -> nearest existing label of the net, along a routing
+              channel below the label (tracks shared by the left-edge algorithm)
+    pintopin  every pin of a net to the net's centroid (star)
+    mst       rectilinear minimum spanning tree per net
+    steiner   rectilinear Steiner tree (iterated 1-Steiner over the Hanan grid)
+    maze      A* maze router around symbols and other nets' wires
+
+New strategies register with @strategy('name'):
+
+    @strategy('direct')
+    def wire_direct(sheet, connections):
+        wiring = Wiring()
+        ...
+        return wiring
+
+    wiring = run('steiner', Sheet.load(path), PIN_CONNECTIONS)
+"""
+
+import time
+
+from .cache import load_cached
+from .channels import assign_tracks
+from .model import SchematicModel
+from .pins import place_pins
+from .router import MazeRouter
+from .schematic import global_label_positions
+from .simplify import simplify_wires
+from .spatial import PointIndex
+from .steiner import route_tree, star_tree, wire_length
+from .uuids import UuidSource
+from .wirecheck import Segment, check_wires, pin_points
+
+# Registered strategies: name -> function(sheet, connections) -> Wiring
+STRATEGIES = {}
+
+# Spacing of the routing channels used by the channel strategy
+CHANNEL_SPACING = 2.54
+
+
+def strategy(name):
+    """Decorator registering a wiring strategy under a name"""
+    def register(func):
+        STRATEGIES[name] = func
+        return func
+    return register
+
+
+class Sheet:
+    """A parsed schematic with its element model and placed pins"""
+
+    def __init__(self, content, root):
+        self.content = content
+        self.root = root
+        self.model = SchematicModel.from_root(root)
+        self.placed = place_pins(self.model)
+
+    @classmethod
+    def load(cls, filepath):
+        parsed = load_cached(filepath, strict=False)
+        return cls(parsed.content, parsed.root)
+
+
+class Wiring:
+    """Result of one strategy"""
+
+    def __init__(self, strategy=None):
+        self.strategy = strategy
+        self.segments = []    # [Segment(x1, y1, x2, y2, net)]
+        self.junctions = []   # [(x, y)]
+        self.labels = []      # [(net, x, y)] global labels
+        self.power_symbols = []  # [(net, x, y)] power:<net> symbols
+        self.failed = []      # [(net, reference, pin)] pins left unconnected
+        self.unplaced = []    # [(reference, pin)] not found on the sheet
+        self.elapsed = 0.0
+
+    @property
+    def length(self):
+        return wire_length(s[:4] for s in self.segments)
+
+    def add_tree(self, net, tree):
+        """Add the segments and junctions of a steiner.Tree (or router.Route)"""
+        self.segments += [Segment(x1, y1, x2, y2, net) for x1, y1, x2, y2 in tree.segments]
+        self.junctions += tree.junctions
+
+    def check(self, sheet, connections):
+        """Return wirecheck Findings of the generated wires against the sheet's pins"""
+        return check_wires(self.segments, pin_points(sheet.placed, connections))
+
+    def simplify(self, sheet):
+        """
+        Merge collinear runs and drop zero-length wires and redundant
+        junctions (kicad_tools.simplify). The sheet's pins, labels and wire
+        ends are kept as wire ends.
+        """
+        stops = [(label.x, label.y) for label in sheet.model.labels]
+        stops += [(wire.x1, wire.y1) for wire in sheet.model.wires]
+        stops += [(wire.x2, wire.y2) for wire in sheet.model.wires]
+        stops += [(x, y) for _, x, y in self.labels]
+        self.segments, self.junctions = simplify_wires(
+            self.segments, self.junctions, [(p.x, p.y) for p in sheet.placed], stops)
+
+    def summary(self):
+        return (f"{len(self.segments)} wires, {self.length:.1f} mm, {len(self.junctions)} junctions, "
+                f"{len(self.labels)} labels, {len(self.failed)} pin(s) unconnected")
+
+
+def run(name, sheet, connections):
+    """Run a registered strategy; returns its Wiring with elapsed time set"""
+    try:
+        func = STRATEGIES[name]
+    except KeyError:
+        raise ValueError(f"Unknown strategy {name!r} (known: {', '.join(STRATEGIES)})") from None
+    started = time.perf_counter()
+    wiring = func(sheet, connections)
+    wiring.elapsed = time.perf_counter() - started
+    wiring.strategy = name
+    return wiring
+
+
+def render(wiring, new_uuid=None, project=None):
+    """
+    Return the S-expression text for a Wiring (wires, then junctions, then
+    labels, then power symbols). UUIDs come from new_uuid, a
+    kicad_tools.uuids.UuidSource keyed by each element's net and position.
+    Power symbol instances are recorded under project.
+    """
+    new_uuid = new_uuid or UuidSource(f"autowire-{wiring.strategy}")
+    parts = ["\n"]
+    for x1, y1, x2, y2, net in wiring.segments:
+        parts.append(f"""\t(wire
+\t\t(pts
+\t\t\t(xy {x1} {y1})
+\t\t\t(xy {x2} {y2})
+\t\t)
+\t\t(stroke
+\t\t\t(width 0)
+\t\t\t(type default)
+\t\t)
+\t\t(uuid {new_uuid('wire', net, x1, y1, x2, y2)})
+\t)
+""")
+    parts.append("\n")
+    for x, y in wiring.junctions:
+        parts.append(f"""\t(junction (at {x} {y}) (diameter 0) (color 0 0 0 0)
+\t\t(uuid {new_uuid('junction', x, y)})
+\t)
+""")
+    for net, x, y in wiring.labels:
+        parts.append(f"""\t(global_label "{net}" (shape input) (at {x} {y} 0) (fields_autoplaced yes)
+\t\t(effects (font (size 1.27 1.27)) (justify left))
+\t\t(uuid {new_uuid('label', net, x, y)})
+\t\t(property "Intersheetrefs" "${{INTERSHEET_REFS}}" (at {x} {y} 0)
+\t\t\t(effects (font (size 1.27 1.27)) hide)
+\t\t)
+\t)
+""")
+    project = project or f"autowire-{wiring.strategy}"
+    for net, x, y in wiring.power_symbols:
+        # GND points down, the supply rails up
+        reference_y = y + 2.5 if net == "GND" else y - 2.5
+        parts.append(f"""\t(symbol (lib_id "power:{net}") (at {x} {y} 0) (unit 1)
+\t\t(exclude_from_sim no) (in_bom yes) (on_board yes) (dnp no)
+\t\t(uuid {new_uuid('power', net, x, y)})
+\t\t(property "Reference" "#PWR?" (at {x} {reference_y} 0)
+\t\t\t(effects (font (size 1.27 1.27)) hide))
+\t\t(property "Value" "{net}" (at {x} {y + 3} 0)
+\t\t\t(effects (font (size 1.27 1.27))))
+\t\t(property "Footprint" "" (at {x} {y} 0)
+\t\t\t(effects (font (size 1.27 1.27)) hide))
+\t\t(property "Datasheet" "" (at {x} {y} 0)
+\t\t\t(effects (font (size 1.27 1.27)) hide))
+\t\t(pin "1" (uuid {new_uuid('power-pin', net, x, y)}))
+\t\t(instances
+\t\t\t(project "{project}"
+\t\t\t\t(path "/rootsheet" (reference "#PWR?") (unit 1))
+\t\t\t)
+\t\t)
+\t)
+""")
+    return "".join(parts)
+
+
+def insert(content, additions):
+    """Insert text before (sheet_instances ...), or before the final paren"""
+    insertion_point = content.find("\t(sheet_instances")
+    if insertion_point == -1:
+        insertion_point = content.rfind(')')
+    return content[:insertion_point] + additions + content[insertion_point:]
+
+
+@strategy('label')
+def wire_labels(sheet, connections):
+    """Global label on every connected pin"""
+    wiring = Wiring()
+    nets, wiring.unplaced = sheet.placed.net_positions(connections)
+    for net, pins in nets.items():
+        wiring.labels += [(net, x, y) for _, _, x, y in pins]
+    return wiring
+
+
+def _label_runs(sheet, connections, wiring):
+    """
+    (net, pin x, pin y, label x, label y) for every pin of the table, to
+    the nearest existing global label of its net. Pins of nets without a
+    label go to wiring.failed.
+    """
+    nets, wiring.unplaced = sheet.placed.net_positions(connections)
+    label_index = {net: PointIndex(points=[(x, y, None) for x, y in positions])
+                   for net, positions in global_label_positions(sheet.root).items()}
+    runs = []
+    for net, pins in nets.items():
+        index = label_index.get(net)
+        for ref, pin, x, y in pins:
+            if not index:
+                wiring.failed.append((net, ref, pin))
+                continue
+            _, label_x, label_y, _ = index.nearest(x, y)[0]
+            runs.append((net, x, y, label_x, label_y))
+    return runs
+
+
+@strategy('nearest-label')
+def wire_nearest_label(sheet, connections):
+    """Each pin to the nearest existing global label of its net by an L"""
+    wiring = Wiring()
+    for net, x, y, label_x, label_y in _label_runs(sheet, connections, wiring):
+        if abs(x - label_x) > 0.01:
+            wiring.segments.append(Segment(x, y, label_x, y, net))
+        if abs(y - label_y) > 0.01:
+            wiring.segments.append(Segment(label_x, y, label_x, label_y, net))
+    return wiring
+
+
+@strategy('channel')
+def wire_channels(sheet, connections):
+    """Each pin to the nearest existing global label of its net via a routing channel"""
+    wiring = Wiring()
+    runs = _label_runs(sheet, connections, wiring)
+
+    # One track per (net, label); runs whose X spans overlap get different ones
+    spans = {}
+    for net, x, _, label_x, label_y in runs:
+        key = (net, label_x, label_y)
+        lo, hi = spans.get(key, (x, x))
+        spans[key] = (min(lo, x, label_x), max(hi, x, label_x))
+    tracks = assign_tracks(spans)
+
+    for net, x, y, label_x, label_y in runs:
+        channel_y = label_y + tracks[(net, label_x, label_y)] * CHANNEL_SPACING
+        if abs(y - channel_y) > 0.01:
+            wiring.segments.append(Segment(x, y, x, channel_y, net))
+            wiring.junctions.append((x, channel_y))
+        if abs(x - label_x) > 0.01:
+            wiring.segments.append(Segment(x, channel_y, label_x, channel_y, net))
+            if abs(channel_y - label_y) > 0.01:
+                wiring.junctions.append((label_x, channel_y))
+        if abs(channel_y - label_y) > 0.01:
+            wiring.segments.append(Segment(label_x, channel_y, label_x, label_y, net))
+    return wiring
+
+
+def _wire_trees(sheet, connections, build):
+    wiring = Wiring()
+    nets, wiring.unplaced = sheet.placed.net_positions(connections)
+    pin_nets = {(p.x, p.y): None for p in sheet.placed}
+    for net, pins in nets.items():
+        for _, _, x, y in pins:
+            pin_nets[(x, y)] = net
+    # Wires already on the sheet count as another net's
+    existing = [(w.x1, w.y1, w.x2, w.y2) for w in sheet.model.wires]
+    for net, pins in nets.items():
+        if len(pins) < 2:
+            continue
+        points = [(x, y) for _, _, x, y in pins]
+        avoid = [xy for xy, owner in pin_nets.items() if owner != net]
+        tree = build(points, avoid, existing + [s[:4] for s in wiring.segments])
+        wiring.add_tree(net, tree)
+        unconnected = set(getattr(tree, 'unconnected', ()))
+        wiring.failed += [(net, ref, pin) for ref, pin, x, y in pins
+                          if (round(x, 4), round(y, 4)) in unconnected]
+    return wiring
+
+
+@strategy('pintopin')
+def wire_star(sheet, connections):
+    """Every pin of a net to the net's centroid"""
+    return _wire_trees(sheet, connections, lambda points, avoid, drawn: star_tree(points))
+
+
+@strategy('mst')
+def wire_mst(sheet, connections):
+    """Rectilinear minimum spanning tree per net"""
+    return _wire_trees(sheet, connections,
+                       lambda points, avoid, drawn: route_tree(points, avoid, drawn, steiner=False))
+
+
+@strategy('steiner')
+def wire_steiner(sheet, connections):
+    """Rectilinear Steiner tree per net (iterated 1-Steiner)"""
+    return _wire_trees(sheet, connections,
+                       lambda points, avoid, drawn: route_tree(points, avoid, drawn))
+
+
+@strategy('maze')
+def wire_maze(sheet, connections):
+    """A* maze routing around symbol bodies and other nets' wires"""
+    wiring = Wiring()
+    result = MazeRouter(sheet.model, sheet.placed).route_all(connections)
+    for net, route in result.routes.items():
+        wiring.add_tree(net, route)
+    wiring.failed = result.failed
+    wiring.unplaced = result.unplaced
+    return wiring
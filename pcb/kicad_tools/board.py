@@ -0,0 +1,46 @@
+#!/usr/bin/env python3
+"""
+PCB (.kicad_pcb) helpers built on the shared S-expression tree
+"""
+
+import re
+
+
+def footprint_reference(footprint):
+    """Return a footprint's reference designator (KiCad 8+ property or legacy fp_text)"""
+    reference = footprint.property('Reference')
+    if reference is not None:
+        return reference
+    for text in footprint.children('fp_text'):
+        if len(text) > 2 and text[1] == 'reference':
+            return text[2]
+    return None
+
+
+def format_at(x, y, rotation=0):
+    """Format a footprint position the way the layout scripts write it"""
+    rot_str = f" {rotation}" if rotation != 0 else ""
+    return f"(at {x} {y}{rot_str})"
+
+
+_SIDE_PREFIX = re.compile(r'(?<![\w.])([FB])\.(?=[A-Za-z])')
+
+
+def flip_layer_name(name):
+    """Return the opposite-side name of a layer ("F.SilkS" <-> "B.SilkS")"""
+    return _SIDE_PREFIX.sub(lambda m: 'B.' if m.group(1) == 'F' else 'F.', name)
+
+
+def layer_flip_edits(footprint, source):
+    """
+    Yield (node, new_text) for every (layer ...) / (layers ...) inside a
+    footprint, with front and back layers swapped. Pass the pairs to
+    Editor.replace_node; "*.Cu" style wildcards are left alone.
+    """
+    for node in footprint.walk():
+        if node.tag not in ('layer', 'layers'):
+            continue
+        text = node.text(source)
+        flipped = flip_layer_name(text)
+        if flipped != text:
+            yield node, flipped
@@ -0,0 +1,255 @@
+#!/usr/bin/env python3
+"""
+Content-hash keyed on-disk parse cache
+
+Parsed trees and their reference indexes are stored as compressed pickles
+named after a hash of the file contents, so re-running the analysis,
+auto-wire and split scripts over an unchanged schematic skips tokenizing
+entirely. Results derived from a file (pin locations, rule checks, ...)
+can be stored next to them under a name with cached_result(). The cache
+directory is size-bounded; least recently used entries are evicted first.
+
+Cache location: pcb/.kicad_cache (override with KICAD_TOOLS_CACHE)
+
+Usage:
+    python -m kicad_tools.cache          # show cache statistics
+    python -m kicad_tools.cache --clear  # delete all entries
+"""
+
+import hashlib
+import os
+import pickle
+import sys
+import tempfile
+import zlib
+from pathlib import Path
+
+from .sexpr import parse
+from .index import build_index
+
+# Bump when Node/RefEntry layout changes so stale entries are ignored
+CACHE_VERSION = 1
+
+DEFAULT_CACHE_DIR = Path(__file__).resolve().parent.parent / ".kicad_cache"
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+
+
+class ParsedFile:
+    """A file's text together with its parse tree and reference index"""
+
+    __slots__ = ('path', 'digest', 'content', 'root', 'index')
+
+    def __init__(self, path, digest, content, root, index):
+        self.path = path
+        self.digest = digest
+        self.content = content
+        self.root = root
+        self.index = index
+
+    def __repr__(self):
+        return f"ParsedFile({str(self.path)!r}, digest={self.digest[:12]})"
+
+
+def content_digest(data):
+    """Hash file bytes into a cache key"""
+    return hashlib.blake2b(data, digest_size=20).hexdigest()
+
+
+class ParseCache:
+    """Directory of parsed trees keyed by content hash, with LRU eviction"""
+
+    def __init__(self, directory=None, max_bytes=DEFAULT_MAX_BYTES):
+        if directory is None:
+            directory = os.environ.get('KICAD_TOOLS_CACHE', DEFAULT_CACHE_DIR)
+        self.directory = Path(directory)
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+
+    def _entry_path(self, digest, strict):
+        mode = 's' if strict else 'l'
+        return self.directory / f"{digest}-v{CACHE_VERSION}{mode}.bin"
+
+    def _result_path(self, digest, name, version):
+        return self.directory / f"{digest}-{name}-v{CACHE_VERSION}.{version}.bin"
+
+    def _read(self, entry_path):
+        """Return (True, value) for a stored entry, or (False, None)"""
+        try:
+            with open(entry_path, 'rb') as f:
+                payload = f.read()
+            value = pickle.loads(zlib.decompress(payload))
+        except FileNotFoundError:
+            return False, None
+        except (OSError, zlib.error, pickle.UnpicklingError, EOFError, ValueError, TypeError):
+            # Corrupt or truncated entry - drop it and recompute
+            entry_path.unlink(missing_ok=True)
+            return False, None
+        # Touch for LRU ordering
+        os.utime(entry_path)
+        return True, value
+
+    def _write(self, entry_path, value):
+        self.directory.mkdir(parents=True, exist_ok=True)
+        payload = zlib.compress(pickle.dumps(value, pickle.HIGHEST_PROTOCOL), 6)
+        # Write atomically so concurrent runs never read half an entry
+        fd, tmp_name = tempfile.mkstemp(dir=self.directory, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                f.write(payload)
+            os.replace(tmp_name, entry_path)
+        except BaseException:
+            Path(tmp_name).unlink(missing_ok=True)
+            raise
+        self.evict()
+
+    def get(self, digest, strict=True):
+        """Return the cached (root, index) for a digest, or None"""
+        found, value = self._read(self._entry_path(digest, strict))
+        return value if found else None
+
+    def put(self, digest, root, index, strict=True):
+        """Store a parsed tree and index, then evict old entries if over budget"""
+        self._write(self._entry_path(digest, strict), (root, index))
+
+    def get_result(self, digest, name, version=1):
+        """Return (True, value) for a derived result stored under name, or (False, None)"""
+        return self._read(self._result_path(digest, name, version))
+
+    def put_result(self, digest, name, value, version=1):
+        """Store a picklable result derived from the file with this digest"""
+        self._write(self._result_path(digest, name, version), value)
+
+    def result_file(self, digest, name, version=1):
+        """
+        Path for a derived result that is not a pickle (e.g. a columnar
+        export). The caller writes it; it is evicted like any other entry.
+        """
+        return self._result_path(digest, name, version)
+
+    def load(self, filepath, strict=True):
+        """Read a file and return a ParsedFile, parsing only on a cache miss"""
+        return self.load_bytes(filepath, Path(filepath).read_bytes(), strict)
+
+    def load_bytes(self, filepath, data, strict=True):
+        """ParsedFile of contents already read from filepath"""
+        digest = content_digest(data)
+        content = data.decode('utf-8')
+
+        cached = self.get(digest, strict)
+        if cached is not None:
+            self.hits += 1
+            root, index = cached
+        else:
+            self.misses += 1
+            root = parse(content, strict=strict)
+            index = build_index(root)
+            self.put(digest, root, index, strict)
+
+        return ParsedFile(Path(filepath), digest, content, root, index)
+
+    def entries(self):
+        """Return [(path, size, mtime)] for every cache entry, oldest first"""
+        if not self.directory.is_dir():
+            return []
+        entries = []
+        for entry in self.directory.glob('*.bin'):
+            try:
+                st = entry.stat()
+            except FileNotFoundError:
+                continue
+            entries.append((entry, st.st_size, st.st_mtime))
+        entries.sort(key=lambda e: e[2])
+        return entries
+
+    def evict(self):
+        """Remove least recently used entries until the cache fits in max_bytes"""
+        entries = self.entries()
+        total = sum(size for _, size, _ in entries)
+        removed = 0
+        for entry, size, _ in entries:
+            if total <= self.max_bytes:
+                break
+            entry.unlink(missing_ok=True)
+            total -= size
+            removed += 1
+        return removed
+
+    def clear(self):
+        """Delete every cache entry"""
+        entries = self.entries()
+        for entry, _, _ in entries:
+            entry.unlink(missing_ok=True)
+        return len(entries)
+
+
+_default_cache = None
+
+
+def default_cache():
+    """Return the process-wide ParseCache"""
+    global _default_cache
+    if _default_cache is None:
+        _default_cache = ParseCache()
+    return _default_cache
+
+
+class FileSnapshot:
+    """
+    One read of a file: the content digest now, the parse (through the
+    cache) only when .root is first used. Several cached results taken from
+    one snapshot describe the same contents, and skip the parse when all of
+    them are hits.
+    """
+
+    def __init__(self, filepath, strict=False):
+        self.path = Path(filepath)
+        self.strict = strict
+        self._data = self.path.read_bytes()
+        self.digest = content_digest(self._data)
+        self._parsed = None
+
+    @property
+    def root(self):
+        if self._parsed is None:
+            self._parsed = default_cache().load_bytes(self.path, self._data, self.strict)
+        return self._parsed.root
+
+
+def load_cached(filepath, strict=True):
+    """Read and parse a KiCad file through the default on-disk cache"""
+    return default_cache().load(filepath, strict=strict)
+
+
+def cached_result(filepath, name, compute, version=1, strict=False):
+    """
+    Return compute(parsed_file) for a file, reusing the stored result while
+    the file's contents are unchanged. Bump `version` when compute changes.
+    """
+    cache = default_cache()
+    digest = content_digest(Path(filepath).read_bytes())
+    found, value = cache.get_result(digest, name, version)
+    if found:
+        cache.hits += 1
+        return value
+    value = compute(cache.load(filepath, strict=strict))
+    cache.put_result(digest, name, value, version)
+    return value
+
+
+def main():
+    cache = default_cache()
+    if '--clear' in sys.argv[1:]:
+        print(f"[OK] Removed {cache.clear()} cache entries from {cache.directory}")
+        return 0
+
+    entries = cache.entries()
+    total = sum(size for _, size, _ in entries)
+    print(f"Cache directory: {cache.directory}")
+    print(f"Entries: {len(entries)}")
+    print(f"Size: {total / 1024:.1f} KB of {cache.max_bytes / 1024 / 1024:.0f} MB")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,46 @@
+#!/usr/bin/env python3
+"""
+Track assignment for horizontal routing channels
+
+Each net that runs along a channel occupies an X interval. Two nets need
+different tracks only if their intervals overlap, so tracks are an
+interval-graph colouring, done optimally by the left-edge algorithm:
+take intervals by left end and put each on the lowest track whose last
+interval ends before it starts. The number of tracks equals the largest
+number of intervals over any single X, instead of one per net.
+
+    tracks = assign_tracks({'GND': (10.16, 200.66), 'CANH': (300.0, 350.0)})
+    # {'GND': 0, 'CANH': 0}
+"""
+
+from heapq import heappop, heappush
+
+
+def assign_tracks(spans, gap=0.0):
+    """
+    Assign {key: (x_min, x_max)} intervals to tracks 0, 1, ... so that
+    intervals on one track are at least `gap` apart (touching intervals
+    conflict). Returns {key: track}; ties resolve in key order.
+    """
+    order = sorted(spans, key=lambda k: (min(spans[k]), max(spans[k]), str(k)))
+    free = []       # track numbers whose last interval has been passed
+    busy = []       # (right end, track) of the last interval on each busy track
+    tracks = {}
+    count = 0
+    for key in order:
+        left, right = min(spans[key]), max(spans[key])
+        while busy and busy[0][0] + gap < left:
+            heappush(free, heappop(busy)[1])
+        if free:
+            track = heappop(free)
+        else:
+            track = count
+            count += 1
+        tracks[key] = track
+        heappush(busy, (right, track))
+    return tracks
+
+
+def track_count(tracks):
+    """Number of tracks used by an assign_tracks() result"""
+    return max(tracks.values()) + 1 if tracks else 0
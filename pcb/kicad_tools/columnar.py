@@ -0,0 +1,401 @@
+#!/usr/bin/env python3
+"""
+Columnar binary export of schematic data
+
+One file holds several tables (components, pins, labels, nets), each
+stored column by column:
+
+    b'KCOL' | u32 format version | u32 header length | JSON header | columns
+
+The header lists every table's row count and, per column, its type,
+offset and size. Numeric columns are raw array('d') / array('i') bytes,
+8-byte aligned, so the loader memory-maps the file and hands them out as
+memoryviews without copying or decoding. A string column is an array('I')
+of rows + 1 offsets followed by the UTF-8 text. Only the rows that are
+read get decoded.
+
+None is stored as a single NUL in string columns, as NaN in 'd' columns
+and as INT_NULL in 'i' columns; the header counts them per column
+('nulls') and rows() turns them back into None. Raw numeric columns show
+the NaN / INT_NULL values as they are.
+
+Numeric columns (and slices of them) stay valid as long as the caller
+holds them, even after close(): the file is unmapped at close() if no
+view is left, otherwise when the last one is dropped.
+
+    write_tables('schematic_data.kcol', schematic_tables(root))
+    with ColumnarFile('schematic_data.kcol') as data:
+        x = data['components']['x']            # memoryview of doubles
+        refs = data['components']['reference']
+        refs[3], len(refs)
+        for row in data.rows('pins', ('reference', 'number', 'net')):
+            ...
+
+cached_export() keeps one export per schematic content in the parse cache
+directory, so tools that only need these tables skip the parse entirely
+once the schematic has been exported.
+
+Usage (from pcb/):
+    python -m kicad_tools.columnar wrx-power-can-hat-MANUAL.kicad_sch out.kcol
+    python -m kicad_tools.columnar out.kcol [table [column ...]]
+"""
+
+import json
+import mmap
+import os
+import struct
+import sys
+import tempfile
+from array import array
+from pathlib import Path
+
+MAGIC = b'KCOL'
+FORMAT_VERSION = 2
+SUFFIX = '.kcol'
+
+# Column types: array typecode, or 'str'
+NUMERIC = {'d': float, 'i': int}
+INT_NULL = -2 ** 31
+_PREFIX = struct.Struct('<4sII')
+_NULL = '\x00'
+
+
+def _column_type(values):
+    present = [v for v in values if v is not None]
+    if not present:
+        return 'str'
+    if all(isinstance(v, int) and not isinstance(v, bool) for v in present):
+        if all(INT_NULL < v < 2 ** 31 for v in present):
+            return 'i'
+        return 'd'
+    if all(isinstance(v, (int, float)) and not isinstance(v, bool) for v in present):
+        return 'd'
+    return 'str'
+
+
+def _encode(kind, values):
+    if kind in NUMERIC:
+        null = INT_NULL if kind == 'i' else float('nan')
+        return array(kind, [null if v is None else v for v in values]).tobytes()
+    offsets = array('I', [0])
+    blob = bytearray()
+    for value in values:
+        blob += (_NULL if value is None else str(value)).encode('utf-8')
+        offsets.append(len(blob))
+    return offsets.tobytes() + bytes(blob)
+
+
+def write_tables(path, tables):
+    """
+    Write {table: {column: [values]}} to path. Column types are inferred:
+    all ints -> 'i', all numbers -> 'd', anything else -> 'str'.
+    """
+    header = {'byteorder': sys.byteorder, 'tables': {}}
+    blobs = []
+    offset = 0
+    for table, columns in tables.items():
+        rows = {len(values) for values in columns.values()}
+        if len(rows) > 1:
+            raise ValueError(f"Columns of table {table!r} differ in length: {sorted(rows)}")
+        entry = {'rows': rows.pop() if rows else 0, 'columns': {}}
+        for name, values in columns.items():
+            kind = _column_type(values)
+            data = _encode(kind, values)
+            entry['columns'][name] = {'type': kind, 'offset': offset, 'size': len(data),
+                                      'nulls': sum(1 for v in values if v is None)}
+            padding = -len(data) % 8
+            blobs.append(data + b'\0' * padding)
+            offset += len(data) + padding
+        header['tables'][table] = entry
+
+    header_bytes = json.dumps(header, separators=(',', ':')).encode('utf-8')
+    header_bytes += b' ' * (-(len(header_bytes) + _PREFIX.size) % 8)
+    with open(path, 'wb') as f:
+        f.write(_PREFIX.pack(MAGIC, FORMAT_VERSION, len(header_bytes)))
+        f.write(header_bytes)
+        for blob in blobs:
+            f.write(blob)
+
+
+class StringColumn:
+    """Lazily decoded string column backed by the mapped file"""
+
+    def __init__(self, buffer, offset, size, rows, swap=False):
+        self.rows = rows
+        self.offsets = buffer[offset:offset + 4 * (rows + 1)].cast('I')
+        if swap:
+            offsets = array('I', self.offsets)
+            offsets.byteswap()
+            self.offsets.release()
+            self.offsets = memoryview(offsets)
+        self.text = buffer[offset + 4 * (rows + 1):offset + size]
+
+    def __len__(self):
+        return self.rows
+
+    def __getitem__(self, row):
+        if row < 0:
+            row += self.rows
+        if not 0 <= row < self.rows:
+            raise IndexError(row)
+        value = bytes(self.text[self.offsets[row]:self.offsets[row + 1]]).decode('utf-8')
+        return None if value == _NULL else value
+
+    def __iter__(self):
+        for row in range(self.rows):
+            yield self[row]
+
+    def release(self):
+        self.offsets.release()
+        self.text.release()
+
+
+class ColumnTable:
+    """One table of a ColumnarFile; columns are decoded on first access"""
+
+    def __init__(self, owner, name, entry):
+        self.owner = owner
+        self.name = name
+        self.rows = entry['rows']
+        self.specs = entry['columns']
+        self._columns = {}
+
+    def __len__(self):
+        return self.rows
+
+    def __repr__(self):
+        return f"ColumnTable({self.name!r}, {self.rows} rows, columns={list(self.specs)})"
+
+    @property
+    def columns(self):
+        return list(self.specs)
+
+    def __getitem__(self, column):
+        if column not in self._columns:
+            self._columns[column] = self.owner._column(self.specs[column], self.rows)
+        return self._columns[column]
+
+
+class ColumnarFile:
+    """
+    Memory-mapped reader for files written by write_tables(). Numeric
+    columns are memoryviews into the mapping; they and their slices stay
+    readable after close() for as long as the caller keeps them.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._file = open(path, 'rb')
+        self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        self._buffer = memoryview(self._map)
+        magic, version, header_size = _PREFIX.unpack_from(self._map, 0)
+        if magic != MAGIC:
+            self.close()
+            raise ValueError(f"{path}: not a columnar file")
+        if version != FORMAT_VERSION:
+            self.close()
+            raise ValueError(f"{path}: format version {version}, expected {FORMAT_VERSION}")
+        start = _PREFIX.size
+        header = json.loads(bytes(self._map[start:start + header_size]).decode('utf-8'))
+        self._swap = header['byteorder'] != sys.byteorder
+        self._data = start + header_size
+        self.tables = {name: ColumnTable(self, name, entry) for name, entry in header['tables'].items()}
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def __getitem__(self, table):
+        return self.tables[table]
+
+    def __contains__(self, table):
+        return table in self.tables
+
+    def _column(self, spec, rows):
+        offset = self._data + spec['offset']
+        if self._buffer is None:
+            raise ValueError(f"{self.path}: file is closed")
+        if spec['type'] == 'str':
+            return StringColumn(self._buffer, offset, spec['size'], rows, self._swap)
+        if self._swap:
+            # Written on a machine of the other byte order: copy and swap
+            column = array(spec['type'])
+            column.frombytes(self._buffer[offset:offset + spec['size']])
+            column.byteswap()
+            return column
+        return self._buffer[offset:offset + spec['size']].cast(spec['type'])
+
+    def rows(self, table, columns=None):
+        """Yield {column: value} for every row, decoding only the named columns"""
+        table = self.tables[table]
+        names = list(columns or table.columns)
+        data = []
+        for name in names:
+            column, spec = table[name], table.specs[name]
+            if spec.get('nulls') and spec['type'] == 'd':
+                column = [None if v != v else v for v in column]
+            elif spec.get('nulls') and spec['type'] == 'i':
+                column = [None if v == INT_NULL else v for v in column]
+            data.append(column)
+        for row in range(table.rows):
+            yield {name: column[row] for name, column in zip(names, data)}
+
+    def close(self):
+        """
+        Drop the mapping. Views the caller still holds keep it alive until
+        they are released or garbage-collected.
+        """
+        for table in getattr(self, 'tables', {}).values():
+            table._columns.clear()
+        if getattr(self, '_buffer', None) is not None:
+            self._buffer.release()
+            self._buffer = None
+        if getattr(self, '_map', None) is not None:
+            try:
+                self._map.close()
+            except BufferError:
+                # Columns or slices of them are still exported; the map is
+                # unmapped when the last of them goes away
+                pass
+            self._map = None
+        self._file.close()
+
+
+def schematic_tables(root):
+    """
+    Build the components, pins, labels and nets tables of a parsed
+    schematic (element model + union-find netlist, one pass each).
+    """
+    from .model import SchematicModel
+    from .netlist import build_netlist
+    from .pins import place_pins
+    from .schematic import sheet_items
+
+    model = SchematicModel.from_root(root)
+    netlist = build_netlist(model, root)
+
+    components = {name: [] for name in ('reference', 'value', 'lib_id', 'footprint', 'x', 'y',
+                                        'rotation', 'unit', 'mirror', 'uuid')}
+    for node in sheet_items(root):
+        if node.tag != 'symbol' or node.get('lib_id') is None:
+            continue
+        at = node.floats('at') or (0.0, 0.0)
+        unit = node.get('unit')
+        row = {
+            'reference': node.property('Reference'),
+            'value': node.property('Value'),
+            'lib_id': node.get('lib_id'),
+            'footprint': node.property('Footprint'),
+            'x': float(at[0]),
+            'y': float(at[1]),
+            'rotation': float(at[2]) if len(at) > 2 else 0.0,
+            'unit': int(unit) if unit and unit.isdigit() else 1,
+            'mirror': node.get('mirror'),
+            'uuid': node.get('uuid'),
+        }
+        for name, value in row.items():
+            components[name].append(value)
+
+    pins = {name: [] for name in ('reference', 'number', 'name', 'electrical_type', 'net', 'x', 'y')}
+    for pin in place_pins(model):
+        pins['reference'].append(pin.reference)
+        pins['number'].append(pin.number)
+        pins['name'].append(pin.name)
+        pins['electrical_type'].append(pin.electrical_type)
+        pins['net'].append(netlist.pin_net.get((pin.reference, pin.number)))
+        pins['x'].append(float(pin.x))
+        pins['y'].append(float(pin.y))
+
+    labels = {name: [] for name in ('name', 'kind', 'x', 'y', 'rotation')}
+    for label in model.labels:
+        labels['name'].append(label.name)
+        labels['kind'].append(label.kind)
+        labels['x'].append(float(label.x))
+        labels['y'].append(float(label.y))
+        labels['rotation'].append(float(label.rotation))
+
+    nets = {'name': [], 'pins': [], 'names': []}
+    for name, members in netlist.nets.items():
+        nets['name'].append(name)
+        nets['pins'].append(len(members))
+        nets['names'].append(" ".join(netlist.names.get(name, ())))
+
+    return {'components': components, 'pins': pins, 'labels': labels, 'nets': nets}
+
+
+def export_schematic(schematic_path, out_path):
+    """Write the columnar tables of a .kicad_sch; returns the tables written"""
+    from .cache import load_cached
+
+    tables = schematic_tables(load_cached(schematic_path, strict=False).root)
+    write_tables(out_path, tables)
+    return tables
+
+
+def cached_export(schematic):
+    """
+    Path of the schematic's columnar export in the parse cache, written on
+    a miss. Pass a FileSnapshot (or ParsedFile) instead of a path to export
+    exactly those contents.
+    """
+    from .cache import FileSnapshot, default_cache
+
+    cache = default_cache()
+    if not hasattr(schematic, 'digest'):
+        schematic = FileSnapshot(schematic)
+    digest = schematic.digest
+    path = cache.result_file(digest, 'columnar', FORMAT_VERSION)
+    try:
+        # Touch for LRU ordering; eviction or another worker may have removed it
+        os.utime(path)
+        cache.hits += 1
+        return path
+    except FileNotFoundError:
+        pass
+
+    cache.misses += 1
+    cache.directory.mkdir(parents=True, exist_ok=True)
+    # Write atomically so concurrent runs never map half a file
+    fd, tmp_name = tempfile.mkstemp(dir=cache.directory, suffix='.tmp')
+    os.close(fd)
+    try:
+        write_tables(tmp_name, schematic_tables(schematic.root))
+        os.replace(tmp_name, path)
+    except BaseException:
+        Path(tmp_name).unlink(missing_ok=True)
+        raise
+    cache.evict()
+    return path
+
+
+def main():
+    args = sys.argv[1:]
+    if not args:
+        print(__doc__)
+        return 1
+    if args[0].endswith('.kicad_sch'):
+        if len(args) != 2:
+            print(__doc__)
+            return 1
+        tables = export_schematic(args[0], args[1])
+        print(f"{args[1]}: " + ", ".join(f"{name} {len(next(iter(cols.values()), []))}"
+                                          for name, cols in tables.items()))
+        return 0
+
+    with ColumnarFile(args[0]) as data:
+        if len(args) == 1:
+            for table in data.tables.values():
+                print(f"{table.name:12} {table.rows:6} rows  {', '.join(table.columns)}")
+            return 0
+        table = data[args[1]]
+        columns = args[2:] or table.columns
+        print("\t".join(columns))
+        for row in data.rows(args[1], columns):
+            print("\t".join("" if row[c] is None else str(row[c]) for c in columns))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
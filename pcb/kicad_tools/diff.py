@@ -0,0 +1,251 @@
+#!/usr/bin/env python3
+"""
+Structural diff between two revisions of a schematic
+
+Streams each file once (kicad_tools.stream) and reduces every element to
+a small Record keyed by a stable identity: the reference for placed
+symbols, the UUID for wires, labels, junctions and no-connects, the name
+for library symbols and the tag for one-off elements (title_block, ...).
+Elements whose UUID changed but whose geometry did not (regenerated
+files) are paired by coordinates in a second round. Matching is
+dictionary lookups only, so a diff is linear in the size of both files.
+
+Reported per kind: added, removed, moved (position, rotation or mirror)
+and changed (properties, lib_id, label text, anything else in the
+element's text).
+
+Usage (from pcb/):
+    python -m kicad_tools.diff wrx-power-can-hat-MANUAL-BACKUP9.kicad_sch wrx-power-can-hat-MANUAL.kicad_sch
+    python -m kicad_tools.diff wrx-power-can-hat-MANUAL-BACKUP{9,10,11,12}.kicad_sch wrx-power-can-hat-MANUAL.kicad_sch
+"""
+
+import hashlib
+import sys
+from collections import namedtuple
+
+from .stream import iter_elements
+
+# kind:     'symbol', 'wire', 'label', 'lib_symbol', 'title_block', ...
+# key:      stable identity within the file (reference, uuid, name or tag)
+# geometry: identity by coordinates, used when keys do not match
+# position: (x, y, rotation, mirror) or wire points; None if not placed
+# fields:   {name: value} compared for 'changed'
+# digest:   hash of the element text, catches any other change
+Record = namedtuple('Record', 'kind key geometry position fields digest')
+
+# One change: kind, 'added' | 'removed' | 'moved' | 'changed', the element's
+# key, a display name (reference, label text; '' for wires) and a description
+Change = namedtuple('Change', 'kind action key name detail')
+
+LABEL_TAGS = ('label', 'global_label', 'hierarchical_label')
+UUID_TAGS = LABEL_TAGS + ('wire', 'bus', 'junction', 'no_connect', 'bus_entry', 'text', 'sheet')
+
+# Significant digits of coordinates in geometry keys (KiCad IU = 100 nm)
+PRECISION = 4
+
+
+def _digest(raw):
+    return hashlib.blake2b(raw, digest_size=16).digest()
+
+
+def _xy(values):
+    return tuple(round(v, PRECISION) for v in values)
+
+
+def _symbol_record(node, raw):
+    at = node.floats('at') or (0.0, 0.0)
+    properties = node.properties()
+    reference = properties.get('Reference')
+    fields = dict(properties)
+    fields['lib_id'] = node.get('lib_id')
+    fields['unit'] = node.get('unit')
+    position = _xy(at[:2]) + (at[2] if len(at) > 2 else 0.0, node.get('mirror'))
+    return Record('symbol', reference or node.get('uuid'), (fields['lib_id'],) + position[:2],
+                  position, fields, _digest(raw)), node.get('uuid')
+
+
+def _element_record(node, raw):
+    tag = node.tag
+    if tag in ('wire', 'bus'):
+        pts = tuple(_xy(float(v) for v in xy[1:3]) for xy in (node.find('pts') or ()) if isinstance(xy, list))
+        geometry = tuple(sorted(pts))
+        return Record(tag, node.get('uuid'), geometry, pts, {}, _digest(raw))
+    at = node.floats('at')
+    position = _xy(at) if at is not None else None
+    if tag in LABEL_TAGS or tag == 'text':
+        name = node[1] if len(node) > 1 else None
+        fields = {'text': name, 'shape': node.get('shape')}
+        return Record(tag, node.get('uuid'), (name,) + (position or ())[:2], position, fields, _digest(raw))
+    if tag in UUID_TAGS:
+        return Record(tag, node.get('uuid'), (position or ())[:2], position, {}, _digest(raw))
+    return Record(tag, tag, tag, None, {}, _digest(raw))
+
+
+def snapshot(filepath):
+    """
+    Stream a schematic into {kind: [Record]} without keeping its tree.
+
+    Placed symbols whose reference is not unique in the file ('#PWR?',
+    unannotated 'R?') are keyed by UUID instead.
+    """
+    records = {}
+    symbol_uuids = {}
+    for view in iter_elements(filepath, strict=False):
+        node = view.node
+        if node.tag == 'lib_symbols':
+            # An unclosed lib_symbols (hand-edited files) also swallows sheet items
+            for child in node.children():
+                raw = bytes(view.buffer[child.start:child.end])
+                if child.tag == 'symbol' and child.get('lib_id') is None:
+                    name = child[1] if len(child) > 1 else None
+                    record = Record('lib_symbol', name, name, None, {}, _digest(raw))
+                elif child.tag == 'symbol':
+                    record, symbol_uuids[id(record)] = _symbol_record(child, raw)
+                else:
+                    record = _element_record(child, raw)
+                records.setdefault(record.kind, []).append(record)
+            continue
+        if node.tag == 'symbol' and node.get('lib_id') is not None:
+            record, symbol_uuids[id(record)] = _symbol_record(node, view.raw)
+        else:
+            record = _element_record(node, view.raw)
+        records.setdefault(record.kind, []).append(record)
+
+    symbols = records.get('symbol', [])
+    counts = {}
+    for record in symbols:
+        counts[record.key] = counts.get(record.key, 0) + 1
+    records['symbol'] = [r if r.key and counts[r.key] == 1 and not r.key.endswith('?')
+                         else r._replace(key=symbol_uuids[id(r)]) for r in symbols]
+    return records
+
+
+def _name(record):
+    if record.kind == 'symbol':
+        return record.fields.get('Reference') or record.key
+    if record.kind == 'lib_symbol':
+        return record.key
+    if 'text' in record.fields:
+        return repr(record.fields['text'])
+    return ''
+
+
+def _describe(record):
+    if record.kind == 'symbol':
+        return f"{record.fields.get('lib_id')} {record.fields.get('Value', '')} at {_position(record)}"
+    if record.position is not None:
+        return f"at {_position(record)}" if record.kind not in ('wire', 'bus') else _position(record)
+    return ""
+
+
+def _compare(kind, old, new):
+    changes = []
+    name = _name(new)
+    if old.position != new.position:
+        changes.append(Change(kind, 'moved', new.key, name, f"{_position(old)} -> {_position(new)}"))
+    for field in sorted(set(old.fields) | set(new.fields), key=str):
+        before, after = old.fields.get(field), new.fields.get(field)
+        if before != after:
+            detail = f"{field}: {before!r} -> {after!r}"
+            if kind != 'symbol' and new.position is not None:
+                detail += f" at {_position(new)}"
+            changes.append(Change(kind, 'changed', new.key, name, detail))
+    if not changes and old.digest != new.digest and old.kind not in UUID_TAGS + ('symbol',):
+        changes.append(Change(kind, 'changed', new.key, name, "contents differ"))
+    return changes
+
+
+def _position(record):
+    if record.kind in ('wire', 'bus'):
+        return " -> ".join(f"({x}, {y})" for x, y in record.position)
+    if record.position is None:
+        return "?"
+    text = f"({record.position[0]}, {record.position[1]})"
+    if record.kind != 'symbol':
+        return text
+    if record.position[2]:
+        text += f" rot {record.position[2]:g}"
+    if record.position[3]:
+        text += f" mirror {record.position[3]}"
+    return text
+
+
+def _pair(old_records, new_records, attribute):
+    """Pair records by one attribute; returns (pairs, unmatched old, unmatched new)"""
+    index = {}
+    for record in new_records:
+        value = getattr(record, attribute)
+        if value is not None:
+            index.setdefault(value, []).append(record)
+    pairs, old_left = [], []
+    for record in old_records:
+        candidates = index.get(getattr(record, attribute))
+        if candidates:
+            pairs.append((record, candidates.pop()))
+        else:
+            old_left.append(record)
+    paired = {id(new) for _, new in pairs}
+    return pairs, old_left, [r for r in new_records if id(r) not in paired]
+
+
+def diff_snapshots(old, new):
+    """Compare two snapshot() results; returns [Change] grouped by kind"""
+    changes = []
+    for kind in sorted(set(old) | set(new)):
+        pairs, old_left, new_left = _pair(old.get(kind, []), new.get(kind, []), 'key')
+        # Same geometry under a new UUID (regenerated element) is not a change
+        more, old_left, new_left = _pair(old_left, new_left, 'geometry')
+        for before, after in pairs + more:
+            changes += _compare(kind, before, after)
+        changes += [Change(kind, 'removed', r.key, _name(r), _describe(r)) for r in old_left]
+        changes += [Change(kind, 'added', r.key, _name(r), _describe(r)) for r in new_left]
+    return changes
+
+
+def diff_files(old_path, new_path):
+    """Structural diff of two schematic files; returns [Change]"""
+    return diff_snapshots(snapshot(old_path), snapshot(new_path))
+
+
+def format_changes(changes, limit=None):
+    """Summary line per kind followed by the individual changes"""
+    lines = []
+    by_kind = {}
+    for change in changes:
+        by_kind.setdefault(change.kind, []).append(change)
+    for kind, items in by_kind.items():
+        counts = {}
+        for change in items:
+            counts[change.action] = counts.get(change.action, 0) + 1
+        lines.append(f"  {kind}: " + ", ".join(f"{n} {action}" for action, n in sorted(counts.items())))
+        marks = {'added': '+', 'removed': '-', 'moved': '>', 'changed': '~'}
+        shown = items if limit is None else items[:limit]
+        for change in shown:
+            parts = (marks[change.action], change.name, change.detail)
+            lines.append("    " + " ".join(part for part in parts if part))
+        if len(shown) < len(items):
+            lines.append(f"    ... {len(items) - len(shown)} more")
+    return lines
+
+
+def main():
+    paths = [a for a in sys.argv[1:] if not a.startswith('--')]
+    if len(paths) < 2:
+        print(__doc__)
+        return 1
+    limit = None if '--all' in sys.argv else 20
+    # Consecutive pairs, each file streamed once
+    previous = snapshot(paths[0])
+    for old_path, new_path in zip(paths, paths[1:]):
+        current = snapshot(new_path)
+        changes = diff_snapshots(previous, current)
+        print(f"{old_path} -> {new_path}: {len(changes)} change(s)")
+        for line in format_changes(changes, limit):
+            print(line)
+        print()
+        previous = current
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
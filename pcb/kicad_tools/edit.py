@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+"""
+Splice-based, lossless edit engine for KiCad files
+
+Edits are collected as (start, end, replacement) ranges against the original
+text and applied in a single pass, so a run touching 50 footprints copies the
+file once instead of once per footprint. Bytes outside the edited ranges are
+carried over unchanged, which keeps KiCad diffs limited to what moved.
+
+Typical use:
+
+    content, root = load(pcb_path)
+    editor = Editor(content)
+    editor.replace_node(footprint.find('at'), '(at 10 20 90)')
+    pcb_path.write_text(editor.apply(), encoding='utf-8')
+"""
+
+
+class EditConflict(ValueError):
+    """Raised when two edits touch overlapping ranges of the original text"""
+
+
+class Editor:
+    """Collects byte-range replacements against one source text"""
+
+    def __init__(self, content):
+        self.content = content
+        self._edits = {}  # start -> (end, text)
+
+    def __len__(self):
+        return len(self._edits)
+
+    def replace(self, start, end, text):
+        """Replace content[start:end] with text (offsets refer to the original)"""
+        if not 0 <= start <= end <= len(self.content):
+            raise EditConflict(f"Edit range {start}:{end} is outside the file")
+        if start in self._edits:
+            old_end, old_text = self._edits[start]
+            if not (start == end == old_end):
+                raise EditConflict(f"Two edits start at offset {start}")
+            # Two inserts at the same offset are applied in call order
+            text = old_text + text
+        self._edits[start] = (end, text)
+
+    def replace_node(self, node, text):
+        """Replace a parsed node (from kicad_tools.sexpr) with new text"""
+        self.replace(node.start, node.end, text)
+
+    def insert(self, offset, text):
+        """Insert text at an offset of the original content"""
+        self.replace(offset, offset, text)
+
+    def delete(self, start, end):
+        """Remove content[start:end]"""
+        self.replace(start, end, '')
+
+    def apply(self):
+        """Return the edited text. The editor can keep collecting edits afterwards."""
+        pieces = []
+        pos = 0
+        for start in sorted(self._edits):
+            end, text = self._edits[start]
+            if start < pos:
+                raise EditConflict(f"Edit at offset {start} overlaps the previous edit ending at {pos}")
+            pieces.append(self.content[pos:start])
+            pieces.append(text)
+            pos = end
+        pieces.append(self.content[pos:])
+        return ''.join(pieces)
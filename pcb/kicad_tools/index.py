@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+"""
+Reference-designator index for footprints (.kicad_pcb) and symbols (.kicad_sch)
+
+Built once per parsed file in a single pass over the top-level elements, so
+scripts can look up "R7" in O(1) instead of regex-searching the file and
+walking parentheses backwards from the match.
+"""
+
+from collections import namedtuple
+
+from .board import footprint_reference
+
+# One pad of a footprint (x/y relative to the footprint origin) or one pin of
+# a placed symbol (no coordinates until lib_symbols are applied)
+Pad = namedtuple('Pad', 'number x y net')
+
+
+class RefEntry:
+    """Location and placement of one referenced element"""
+
+    __slots__ = ('reference', 'kind', 'start', 'end', 'layer', 'at',
+                 'rotation', 'value', 'pads', 'node')
+
+    def __init__(self, reference, kind, node, layer, at, rotation, value, pads):
+        self.reference = reference
+        self.kind = kind
+        self.start = node.start
+        self.end = node.end
+        self.layer = layer
+        self.at = at
+        self.rotation = rotation
+        self.value = value
+        self.pads = pads
+        self.node = node
+
+    def __repr__(self):
+        return (f"RefEntry({self.reference!r}, {self.kind}, span={self.start}:{self.end}, "
+                f"layer={self.layer!r}, at={self.at}, rot={self.rotation}, pads={len(self.pads)})")
+
+    @property
+    def span(self):
+        return (self.start, self.end)
+
+
+def _footprint_pads(footprint):
+    pads = []
+    for pad in footprint.children('pad'):
+        if len(pad) < 2:
+            continue
+        at = pad.floats('at') or (0.0, 0.0)
+        net = pad.find('net')
+        net_name = net[-1] if net is not None and len(net) > 1 else None
+        pads.append(Pad(pad[1], at[0], at[1], net_name))
+    return tuple(pads)
+
+
+def _entry_for(node):
+    """Build a RefEntry for a footprint or placed symbol node, or None"""
+    tag = node.tag
+    if tag == 'footprint':
+        reference = footprint_reference(node)
+        layer = node.get('layer')
+        value = node.property('Value')
+        pads = _footprint_pads(node)
+    elif tag == 'symbol' and node.find('lib_id') is not None:
+        reference = node.property('Reference')
+        layer = None
+        value = node.property('Value')
+        pads = tuple(Pad(pin[1], None, None, None) for pin in node.children('pin') if len(pin) > 1)
+    else:
+        return None
+    if reference is None:
+        return None
+
+    at = node.floats('at') or (0.0, 0.0)
+    rotation = at[2] if len(at) > 2 else 0.0
+    return RefEntry(reference, tag, node, layer, (at[0], at[1]), rotation, value, pads)
+
+
+class RefIndex:
+    """Mapping of reference designator -> RefEntry for one file"""
+
+    def __init__(self, root):
+        self.entries = {}
+        self.duplicates = []  # entries whose reference was already taken (e.g. "#PWR?")
+        for node in root.children():
+            entry = _entry_for(node)
+            if entry is None:
+                continue
+            if entry.reference in self.entries:
+                self.duplicates.append(entry)
+            else:
+                self.entries[entry.reference] = entry
+
+    def __len__(self):
+        return len(self.entries)
+
+    def __contains__(self, reference):
+        return reference in self.entries
+
+    def __getitem__(self, reference):
+        return self.entries[reference]
+
+    def __iter__(self):
+        return iter(self.entries)
+
+    def get(self, reference, default=None):
+        return self.entries.get(reference, default)
+
+    def items(self):
+        return self.entries.items()
+
+    def on_layer(self, layer):
+        """Return entries placed on one copper layer ("F.Cu" / "B.Cu")"""
+        return [entry for entry in self.entries.values() if entry.layer == layer]
+
+
+def build_index(root):
+    """Index every footprint and placed symbol of a parsed file by reference"""
+    return RefIndex(root)
@@ -0,0 +1,418 @@
+#!/usr/bin/env python3
+"""
+Compact element model for schematics and boards
+
+Each element kind (Symbol, Pin, Wire, Label, Junction, Footprint, Pad,
+Segment, Via) is stored column-wise in a Table: coordinates in array('d')
+columns, identity fields (reference, net, uuid, ...) in one list per field.
+Rows are read through small __slots__ views that hold only (table, row), so
+no per-element dict or float objects are kept. Geometry queries scan plain
+double arrays instead of chasing dicts of floats.
+
+    model = SchematicModel.from_root(root)
+    model.symbols['U1'].x
+    model.wires.column('x1')          # array('d') of every wire start X
+    model.pins_of('Device:R')         # library pins of one symbol
+"""
+
+from array import array
+
+from .board import footprint_reference
+from .schematic import lib_symbols, sheet_items
+
+
+def _column(name):
+    """Property that reads/writes one coordinate of this row in the table's column"""
+    def get(self):
+        return self.table.columns[name][self.row]
+
+    def set(self, value):
+        self.table.columns[name][self.row] = value
+
+    return property(get, set)
+
+
+def _field(name):
+    """Property that reads/writes one non-coordinate field of this row"""
+    def get(self):
+        return self.table.fields[name][self.row]
+
+    def set(self, value):
+        self.table.fields[name][self.row] = value
+
+    return property(get, set)
+
+
+class ElementMeta(type):
+    """Creates the column/field properties declared by COLUMNS and FIELDS"""
+
+    def __new__(mcs, name, bases, namespace):
+        for column in namespace.get('COLUMNS', ()):
+            namespace[column] = _column(column)
+        for field in namespace.get('FIELDS', ()):
+            namespace[field] = _field(field)
+        return super().__new__(mcs, name, bases, namespace)
+
+
+class Element(metaclass=ElementMeta):
+    """
+    Lightweight view of one row of a Table. Views hold only the table and
+    row number, so they are created on access and need not be kept.
+    """
+
+    __slots__ = ('table', 'row')
+    FIELDS = ()
+    COLUMNS = ()
+
+    def __init__(self, table, row):
+        self.table = table
+        self.row = row
+
+    def __eq__(self, other):
+        return type(other) is type(self) and other.table is self.table and other.row == self.row
+
+    def __hash__(self):
+        return hash((id(self.table), self.row))
+
+    def coords(self):
+        """Return this row's coordinates as a tuple in COLUMNS order"""
+        columns = self.table.columns
+        return tuple(columns[name][self.row] for name in self.COLUMNS)
+
+    def __repr__(self):
+        fields = ", ".join(f"{name}={getattr(self, name)!r}" for name in self.FIELDS)
+        coords = ", ".join(f"{name}={value:g}" for name, value in zip(self.COLUMNS, self.coords()))
+        return f"{type(self).__name__}({fields}, {coords})"
+
+
+class Symbol(Element):
+    """Placed schematic symbol instance"""
+
+    __slots__ = ()
+    FIELDS = ('reference', 'lib_id', 'value', 'unit', 'mirror', 'uuid')
+    COLUMNS = ('x', 'y', 'rotation')
+
+
+class Pin(Element):
+    """Library pin of a symbol definition, in library coordinates (Y up)"""
+
+    __slots__ = ()
+    FIELDS = ('lib_id', 'number', 'name', 'electrical_type', 'unit')
+    COLUMNS = ('x', 'y', 'rotation', 'length')
+
+
+class Wire(Element):
+    __slots__ = ()
+    FIELDS = ('uuid',)
+    COLUMNS = ('x1', 'y1', 'x2', 'y2')
+
+
+class Label(Element):
+    """Local, global or hierarchical label"""
+
+    __slots__ = ()
+    FIELDS = ('name', 'kind', 'shape', 'uuid')
+    COLUMNS = ('x', 'y', 'rotation')
+
+
+class Junction(Element):
+    __slots__ = ()
+    FIELDS = ('uuid',)
+    COLUMNS = ('x', 'y')
+
+
+class Footprint(Element):
+    __slots__ = ()
+    FIELDS = ('reference', 'lib_name', 'layer', 'value', 'uuid')
+    COLUMNS = ('x', 'y', 'rotation')
+
+
+class Pad(Element):
+    """Footprint pad; x/y relative to the footprint origin"""
+
+    __slots__ = ()
+    FIELDS = ('reference', 'number', 'net')
+    COLUMNS = ('x', 'y')
+
+
+class Segment(Element):
+    __slots__ = ()
+    FIELDS = ('layer', 'net', 'uuid')
+    COLUMNS = ('x1', 'y1', 'x2', 'y2', 'width')
+
+
+class Via(Element):
+    __slots__ = ()
+    FIELDS = ('net', 'uuid')
+    COLUMNS = ('x', 'y', 'size', 'drill')
+
+
+class Table:
+    """Rows of one element kind, stored column-wise"""
+
+    def __init__(self, cls):
+        self.cls = cls
+        self.columns = {name: array('d') for name in cls.COLUMNS}
+        self.fields = {name: [] for name in cls.FIELDS}
+        self.size = 0
+        self._by_key = None
+
+    def add(self, coords, **fields):
+        """Append a row: coords in the class's COLUMNS order, fields by name"""
+        for name, value in zip(self.cls.COLUMNS, coords):
+            self.columns[name].append(value)
+        for name in self.cls.FIELDS:
+            self.fields[name].append(fields.get(name))
+        self.size += 1
+        self._by_key = None
+        return self.cls(self, self.size - 1)
+
+    def __len__(self):
+        return self.size
+
+    def __iter__(self):
+        cls = self.cls
+        for row in range(self.size):
+            yield cls(self, row)
+
+    def __getitem__(self, key):
+        """Row by index, or by reference/name for keyed kinds (first match)"""
+        if isinstance(key, int):
+            if not -self.size <= key < self.size:
+                raise IndexError(key)
+            return self.cls(self, key % self.size)
+        if self._by_key is None:
+            field = 'reference' if 'reference' in self.fields else 'name'
+            self._by_key = {}
+            for row, value in enumerate(self.fields[field]):
+                self._by_key.setdefault(value, row)
+        return self.cls(self, self._by_key[key])
+
+    def get(self, key, default=None):
+        try:
+            return self[key]
+        except (KeyError, IndexError):
+            return default
+
+    def column(self, name):
+        """Return the array('d') holding one coordinate for every row"""
+        return self.columns[name]
+
+    def field(self, name):
+        """Return the list holding one field for every row"""
+        return self.fields[name]
+
+    def within(self, x_min, y_min, x_max, y_max, x='x', y='y'):
+        """Return rows whose (x, y) column pair lies inside the box (edges included)"""
+        xs, ys = self.columns[x], self.columns[y]
+        return [self.cls(self, i) for i in range(self.size)
+                if x_min <= xs[i] <= x_max and y_min <= ys[i] <= y_max]
+
+    def nbytes(self):
+        """Bytes used by the coordinate columns and field slots"""
+        return (sum(col.itemsize * len(col) for col in self.columns.values()) +
+                8 * self.size * len(self.fields))
+
+
+def _at(node):
+    at = node.floats('at') or (0.0, 0.0)
+    return at[0], at[1], (at[2] if len(at) > 2 else 0.0)
+
+
+def _pin_unit(unit_name):
+    """Unit number from a library sub-symbol name "Name_U_S" (0 = common to all units)"""
+    parts = unit_name.rsplit('_', 2)
+    if len(parts) == 3 and parts[1].isdigit():
+        return int(parts[1])
+    return 0
+
+
+class SchematicModel:
+    """Symbols, library pins, wires, labels and junctions of one schematic"""
+
+    def __init__(self):
+        self.symbols = Table(Symbol)
+        self.pins = Table(Pin)
+        self.wires = Table(Wire)
+        self.labels = Table(Label)
+        self.junctions = Table(Junction)
+        self._pins_by_lib = {}
+        self._bodies = {}
+
+    @classmethod
+    def from_root(cls, root):
+        model = cls()
+        for lib_id, definition in lib_symbols(root).items():
+            if definition.find('lib_id') is not None:
+                continue
+            model._add_lib_pins(lib_id, definition)
+            model._add_lib_body(lib_id, definition)
+
+        for node in sheet_items(root):
+            tag = node.tag
+            if tag == 'symbol':
+                if node.find('lib_id') is None:
+                    continue
+                mirror = node.get('mirror')
+                unit = node.get('unit')
+                model.symbols.add(
+                    _at(node),
+                    reference=node.property('Reference'),
+                    lib_id=node.get('lib_id'),
+                    value=node.property('Value'),
+                    unit=int(unit) if unit and unit.isdigit() else 1,
+                    mirror=mirror,
+                    uuid=node.get('uuid'))
+            elif tag == 'wire':
+                pts = node.find('pts')
+                xy = [(float(c[1]), float(c[2])) for c in pts.children('xy')] if pts is not None else []
+                if len(xy) >= 2:
+                    model.wires.add((xy[0][0], xy[0][1], xy[-1][0], xy[-1][1]), uuid=node.get('uuid'))
+            elif tag in ('label', 'global_label', 'hierarchical_label'):
+                if len(node) > 1:
+                    model.labels.add(_at(node), name=node[1], kind=tag,
+                                     shape=node.get('shape'), uuid=node.get('uuid'))
+            elif tag == 'junction':
+                x, y, _ = _at(node)
+                model.junctions.add((x, y), uuid=node.get('uuid'))
+        return model
+
+    def _add_lib_pins(self, lib_id, definition):
+        rows = []
+        units = [(0, definition)] + [(_pin_unit(sub[1]), sub) for sub in definition.children('symbol')
+                                      if len(sub) > 1]
+        for unit, holder in units:
+            for pin in holder.children('pin'):
+                number = pin.get('number')
+                if number is None:
+                    continue
+                x, y, rotation = _at(pin)
+                length = pin.floats('length')
+                rows.append(self.pins.add(
+                    (x, y, rotation, length[0] if length else 0.0),
+                    lib_id=lib_id, number=number, name=pin.get('name'),
+                    electrical_type=pin[1] if len(pin) > 1 else None, unit=unit).row)
+        if rows:
+            self._pins_by_lib[lib_id] = rows
+
+    def _add_lib_body(self, lib_id, definition):
+        boxes = {}
+        units = [(0, definition)] + [(_pin_unit(sub[1]), sub) for sub in definition.children('symbol')
+                                      if len(sub) > 1]
+        for unit, holder in units:
+            points = []
+            for graphic in holder.children():
+                tag = graphic.tag
+                if tag == 'rectangle':
+                    points += [graphic.floats('start'), graphic.floats('end')]
+                elif tag in ('polyline', 'bezier'):
+                    pts = graphic.find('pts')
+                    if pts is not None:
+                        points += [(float(c[1]), float(c[2])) for c in pts.children('xy')]
+                elif tag == 'arc':
+                    points += [graphic.floats('start'), graphic.floats('mid'), graphic.floats('end')]
+                elif tag == 'circle':
+                    center, radius = graphic.floats('center'), graphic.floats('radius')
+                    if center and radius:
+                        points += [(center[0] - radius[0], center[1] - radius[0]),
+                                   (center[0] + radius[0], center[1] + radius[0])]
+            points = [p for p in points if p]
+            if not points:
+                continue
+            xs = [p[0] for p in points]
+            ys = [p[1] for p in points]
+            box = boxes.get(unit)
+            if box is not None:
+                xs += [box[0], box[2]]
+                ys += [box[1], box[3]]
+            boxes[unit] = (min(xs), min(ys), max(xs), max(ys))
+        if boxes:
+            self._bodies[lib_id] = boxes
+
+    def body_of(self, lib_id, unit=None):
+        """
+        Bounding box (x_min, y_min, x_max, y_max) of a symbol's drawn body in
+        library coordinates (pins excluded), or None if it draws nothing.
+        """
+        boxes = self._bodies.get(lib_id)
+        if not boxes:
+            return None
+        chosen = [box for u, box in boxes.items() if unit is None or u in (0, unit)]
+        if not chosen:
+            return None
+        return (min(b[0] for b in chosen), min(b[1] for b in chosen),
+                max(b[2] for b in chosen), max(b[3] for b in chosen))
+
+    def pins_of(self, lib_id, unit=None):
+        """Library pins of one symbol, optionally only those used by one unit"""
+        pins = [Pin(self.pins, row) for row in self._pins_by_lib.get(lib_id, ())]
+        if unit is None:
+            return pins
+        return [pin for pin in pins if pin.unit in (0, unit)]
+
+    def nbytes(self):
+        return sum(t.nbytes() for t in (self.symbols, self.pins, self.wires, self.labels, self.junctions))
+
+
+class PcbModel:
+    """Footprints, pads, track segments and vias of one board"""
+
+    def __init__(self):
+        self.footprints = Table(Footprint)
+        self.pads = Table(Pad)
+        self.segments = Table(Segment)
+        self.vias = Table(Via)
+        self.net_names = {}
+
+    @classmethod
+    def from_root(cls, root):
+        model = cls()
+        for node in root.children('net'):
+            if len(node) > 2:
+                model.net_names[node[1]] = node[2]
+
+        for node in root.children():
+            tag = node.tag
+            if tag == 'footprint':
+                reference = footprint_reference(node)
+                model.footprints.add(
+                    _at(node), reference=reference,
+                    lib_name=node[1] if len(node) > 1 and isinstance(node[1], str) else None,
+                    layer=node.get('layer'), value=node.property('Value'), uuid=node.get('uuid'))
+                for pad in node.children('pad'):
+                    if len(pad) < 2:
+                        continue
+                    x, y, _ = _at(pad)
+                    model.pads.add((x, y), reference=reference, number=pad[1], net=model._net(pad))
+            elif tag in ('segment', 'arc'):
+                start = node.floats('start') or (0.0, 0.0)
+                end = node.floats('end') or (0.0, 0.0)
+                width = node.floats('width')
+                model.segments.add((start[0], start[1], end[0], end[1], width[0] if width else 0.0),
+                                   layer=node.get('layer'), net=model._net(node), uuid=node.get('uuid'))
+            elif tag == 'via':
+                x, y, _ = _at(node)
+                size = node.floats('size')
+                drill = node.floats('drill')
+                model.vias.add((x, y, size[0] if size else 0.0, drill[0] if drill else 0.0),
+                               net=model._net(node), uuid=node.get('uuid'))
+        return model
+
+    def _net(self, node):
+        """Net name of a pad/segment/via ((net N "name"), (net N) or (net "name"))"""
+        net = node.find('net')
+        if net is None or len(net) < 2:
+            return None
+        if len(net) > 2:
+            return net[2]
+        return self.net_names.get(net[1], net[1])
+
+    def nbytes(self):
+        return sum(t.nbytes() for t in (self.footprints, self.pads, self.segments, self.vias))
+
+
+def build_model(root):
+    """Build a SchematicModel or PcbModel depending on the root tag"""
+    if root.tag == 'kicad_pcb':
+        return PcbModel.from_root(root)
+    return SchematicModel.from_root(root)
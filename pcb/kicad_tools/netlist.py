@@ -0,0 +1,259 @@
+#!/usr/bin/env python3
+"""
+Union-find connectivity for schematics
+
+Computes the nets a .kicad_sch actually draws in one pass. Every wire end,
+pin, label, junction and power-symbol pin is a point keyed by its
+coordinate (rounded to KiCad's 0.1 um resolution). Points are merged with
+union-find along these connections:
+
+    wire           both ends
+    wire interior  any point lying on it (T-junctions, pins, labels, junctions)
+    global label   every global label with the same name
+    power symbol   every global label / power symbol with the same value
+    local label    every local (or hierarchical) label with the same name
+
+Plain wire crossings without a junction do not connect, as in KiCad.
+
+A net is named after its global labels and power symbols, then its local
+labels ("/NAME" if a global net already has that name). Nets without any
+get KiCad's "Net-(REF-PadN)" form.
+compare() checks the result against a {reference: {pin: net}} design
+table such as PIN_CONNECTIONS.
+
+    netlist = build_netlist(SchematicModel.from_root(root), root)
+    netlist.pin_net[('U1', '5')]
+    diff = compare(netlist, PIN_CONNECTIONS)
+"""
+
+from collections import namedtuple
+
+from .pins import orientation, place_pins, PRECISION
+from .schematic import lib_symbols
+from .wirecheck import incidences
+
+# Power symbols whose value is not a net name
+NON_NET_POWER = ('PWR_FLAG',)
+
+
+class UnionFind:
+    """Disjoint sets over hashable items (path halving, union by size)"""
+
+    def __init__(self):
+        self.parent = {}
+        self.size = {}
+
+    def find(self, item):
+        parent = self.parent
+        if item not in parent:
+            parent[item] = item
+            self.size[item] = 1
+            return item
+        while parent[item] != item:
+            parent[item] = parent[parent[item]]
+            item = parent[item]
+        return item
+
+    def union(self, a, b):
+        a, b = self.find(a), self.find(b)
+        if a == b:
+            return a
+        if self.size[a] < self.size[b]:
+            a, b = b, a
+        self.parent[b] = a
+        self.size[a] += self.size[b]
+        return a
+
+    def groups(self):
+        """Return {root: [items]}"""
+        result = {}
+        for item in self.parent:
+            result.setdefault(self.find(item), []).append(item)
+        return result
+
+
+class Netlist:
+    """
+    Nets of one schematic.
+
+    nets:      net name -> sorted [(reference, pin)]
+    pin_net:   (reference, pin) -> net name
+    names:     net name -> every label / power name found on it
+    conflicts: [(net name, [names])] nets carrying two or more different names
+    """
+
+    def __init__(self):
+        self.nets = {}
+        self.pin_net = {}
+        self.names = {}
+        self.conflicts = []
+
+    def __len__(self):
+        return len(self.nets)
+
+
+def _point(x, y):
+    return ('at', round(x, PRECISION), round(y, PRECISION))
+
+
+def power_pins(model, root):
+    """
+    Yield (x, y, value) for the pin of every placed power symbol. Symbols
+    whose library definition is missing are taken to have their pin at the
+    origin, as the standard power symbols do.
+    """
+    power_libs = {name for name, definition in lib_symbols(root).items()
+                  if definition.find('power') is not None}
+    for symbol in model.symbols:
+        lib_id = symbol.lib_id or ''
+        if not (lib_id in power_libs or lib_id.startswith('power:')):
+            continue
+        if symbol.value in NON_NET_POWER:
+            continue
+        pins = model.pins_of(lib_id, symbol.unit)
+        if not pins:
+            yield symbol.x, symbol.y, symbol.value
+            continue
+        a, b, c, d = orientation(symbol.rotation, symbol.mirror)
+        for pin in pins:
+            yield symbol.x + a * pin.x + b * pin.y, symbol.y + c * pin.x + d * pin.y, symbol.value
+
+
+def build_netlist(model, root):
+    """Compute the Netlist of a SchematicModel (root is used for power symbol detection)"""
+    uf = UnionFind()
+    union = uf.union
+
+    points = []       # (x, y) of everything that can sit on a wire
+    point_keys = []
+    for wire in model.wires:
+        union(_point(wire.x1, wire.y1), _point(wire.x2, wire.y2))
+        points += [(wire.x1, wire.y1), (wire.x2, wire.y2)]
+        point_keys += [_point(wire.x1, wire.y1), _point(wire.x2, wire.y2)]
+
+    for junction in model.junctions:
+        points.append((junction.x, junction.y))
+        point_keys.append(_point(junction.x, junction.y))
+
+    for label in model.labels:
+        key = _point(label.x, label.y)
+        scope = 'global' if label.kind == 'global_label' else 'local'
+        union(key, (scope, label.name))
+        points.append((label.x, label.y))
+        point_keys.append(key)
+
+    for x, y, value in power_pins(model, root):
+        key = _point(x, y)
+        union(key, ('global', value))
+        points.append((x, y))
+        point_keys.append(key)
+
+    placed = place_pins(model)
+    pin_keys = []
+    for pin in placed:
+        if pin.reference.startswith('#'):
+            continue
+        key = _point(pin.x, pin.y)
+        union(key, ('pin', pin.reference, pin.number))
+        points.append((pin.x, pin.y))
+        point_keys.append(key)
+        pin_keys.append(('pin', pin.reference, pin.number))
+
+    # Points on a wire's interior (or end) join that wire
+    wires = [(w.x1, w.y1, w.x2, w.y2) for w in model.wires]
+    wire_starts = [_point(w[0], w[1]) for w in wires]
+    for p, w, _ in incidences(wires, points):
+        union(point_keys[p], wire_starts[w])
+
+    for key in pin_keys:
+        uf.find(key)
+    groups = []
+    for members in uf.groups().values():
+        pins = sorted((m[1], m[2]) for m in members if m[0] == 'pin')
+        globals_ = sorted({m[1] for m in members if m[0] == 'global'})
+        locals_ = sorted({m[1] for m in members if m[0] == 'local'})
+        if pins or globals_ or locals_:
+            groups.append((pins, globals_, locals_))
+    # Globally named nets claim their names first
+    groups.sort(key=lambda g: (not g[1], g[1], g[2], g[0]))
+
+    netlist = Netlist()
+    for pins, globals_, locals_ in groups:
+        names = globals_ + [n for n in locals_ if n not in globals_]
+        if names:
+            name = names[0]
+        else:
+            name = f"Net-({pins[0][0]}-Pad{pins[0][1]})"
+        if name in netlist.nets and not globals_:
+            # A local label does not join a global label of the same name;
+            # KiCad shows it with the sheet prefix
+            name = f"/{name}"
+        netlist.nets[name] = pins
+        netlist.names[name] = names
+        if len(names) > 1:
+            netlist.conflicts.append((name, names))
+        for pin in pins:
+            netlist.pin_net[pin] = name
+    return netlist
+
+
+# Result of comparing drawn nets with a design table
+NetDiff = namedtuple('NetDiff', 'expected matched opens shorts missing extra renamed')
+
+
+def compare(netlist, connections):
+    """
+    Compare a Netlist with {reference: {pin: net}}.
+
+    expected: number of nets in the table
+    matched:  table nets drawn as exactly one net holding no other table net
+    opens:    {table net: [[pins of one drawn piece], ...]} for split nets
+    shorts:   {drawn net: [table nets merged into it]}
+    missing:  [(reference, pin)] in the table but not on the sheet
+    extra:    [(reference, pin, drawn net)] pins of table references that
+              should be unconnected but share a net with other pins
+    renamed:  {table net: drawn net name} for matched nets named differently
+    """
+    expected = {}
+    missing = []
+    for reference, pin_map in connections.items():
+        for number, net in pin_map.items():
+            expected.setdefault(net, [])
+            if (reference, number) in netlist.pin_net:
+                expected[net].append((reference, number))
+            else:
+                missing.append((reference, number))
+
+    drawn_to_expected = {}
+    for net, pins in expected.items():
+        for pin in pins:
+            drawn_to_expected.setdefault(netlist.pin_net[pin], set()).add(net)
+
+    opens = {}
+    shorts = {name: sorted(nets) for name, nets in drawn_to_expected.items() if len(nets) > 1}
+    renamed = {}
+    matched = 0
+    for net, pins in expected.items():
+        pieces = {}
+        for pin in pins:
+            pieces.setdefault(netlist.pin_net[pin], []).append(pin)
+        if len(pieces) > 1:
+            opens[net] = sorted(pieces.values())
+            continue
+        if not pieces:
+            continue
+        (drawn,) = pieces
+        if drawn in shorts:
+            continue
+        matched += 1
+        if drawn != net and net not in netlist.names.get(drawn, ()):
+            renamed[net] = drawn
+
+    extra = []
+    for (ref, number), drawn in netlist.pin_net.items():
+        pin_map = connections.get(ref)
+        if pin_map is not None and number not in pin_map and len(netlist.nets[drawn]) > 1:
+            extra.append((ref, number, drawn))
+    extra.sort()
+
+    return NetDiff(len(expected), matched, opens, shorts, sorted(missing), extra, renamed)
@@ -0,0 +1,255 @@
+#!/usr/bin/env python3
+"""
+Absolute pin positions for every placed symbol
+
+Library pins are stored in the symbol's own coordinates with Y pointing up;
+the sheet has Y pointing down. A placed symbol maps a library point (px, py)
+to the sheet by flipping Y, rotating by the instance's (at x y rotation)
+counter-clockwise as drawn, then applying (mirror x) / (mirror y):
+
+    sheet = at + M(mirror) . R(rotation) . (px, -py)
+
+place_pins() applies this to all pins of all symbols in one pass over the
+model's pin columns. Each distinct (rotation, mirror) pair is turned into a
+2x2 integer matrix once (exact for the usual multiples of 90 degrees), and
+results are rounded to KiCad's 0.1 um schematic resolution, so coordinates
+such as 104.14000000000001 never reach the written file.
+
+    placed = place_pins(SchematicModel.from_root(root))
+    placed.position('U1', '5')        # (x, y) on the sheet, or None
+    placed.outward('U1', '5')         # unit vector pointing away from the body
+
+pin_locations() does the same for a file, headlessly and without an ERC
+report, and keeps the result in the parse cache until the file changes:
+
+    pin_locations('wrx-power-can-hat-PINTOPIN.kicad_sch')[('U1', '5')]
+    # PinLocation(x_mm=..., y_mm=..., x_mils=..., y_mils=...)
+"""
+
+import math
+from array import array
+from collections import namedtuple
+
+from .cache import cached_result
+from .model import Element, SchematicModel, Table
+
+# Decimal places kept for sheet coordinates (KiCad schematic IU = 100 nm)
+PRECISION = 4
+
+MM_PER_MIL = 0.0254
+
+# Sheet position of one pin in millimetres and mils (as in KiCad's ERC report)
+PinLocation = namedtuple('PinLocation', 'x_mm y_mm x_mils y_mils')
+
+_QUARTER_TURNS = {0: (1, 0), 90: (0, 1), 180: (-1, 0), 270: (0, -1)}
+
+
+class PlacedPin(Element):
+    """Pin of a placed symbol in sheet coordinates; angle in KiCad degrees (Y up)"""
+
+    __slots__ = ()
+    FIELDS = ('reference', 'number', 'name', 'electrical_type', 'lib_id')
+    COLUMNS = ('x', 'y', 'angle')
+
+
+def orientation(rotation, mirror=None):
+    """
+    Return the (a, b, c, d) matrix taking library (px, py) to a sheet offset
+    (a*px + b*py, c*px + d*py) for one instance rotation and mirror flag.
+    """
+    turn = round(rotation) % 360
+    if turn in _QUARTER_TURNS and turn == rotation % 360:
+        cos_a, sin_a = _QUARTER_TURNS[turn]
+    else:
+        angle = math.radians(rotation)
+        cos_a, sin_a = math.cos(angle), math.sin(angle)
+    # R(rotation) applied to (px, -py) in sheet coordinates
+    a, b, c, d = cos_a, -sin_a, -sin_a, -cos_a
+    if mirror == 'x':
+        c, d = -c, -d
+    elif mirror == 'y':
+        a, b = -a, -b
+    return a, b, c, d
+
+
+class PinPositions(Table):
+    """PlacedPin rows with a (reference, pin number) lookup"""
+
+    def __init__(self):
+        super().__init__(PlacedPin)
+        self._rows = {}
+
+    def row_of(self, reference, number):
+        return self._rows.get((reference, number))
+
+    def pin(self, reference, number):
+        """Return the PlacedPin, or None if the symbol has no such pin"""
+        row = self._rows.get((reference, number))
+        return None if row is None else PlacedPin(self, row)
+
+    def position(self, reference, number):
+        """Return (x, y) of a pin on the sheet, or None"""
+        row = self._rows.get((reference, number))
+        if row is None:
+            return None
+        return self.columns['x'][row], self.columns['y'][row]
+
+    def outward(self, reference, number):
+        """
+        Return the unit (dx, dy) sheet vector pointing from the pin's
+        connection point away from the symbol body, or None.
+        """
+        row = self._rows.get((reference, number))
+        if row is None:
+            return None
+        dx, dy = _QUARTER_TURNS.get(round(self.columns['angle'][row]) % 360, (None, None))
+        if dx is None:
+            angle = math.radians(self.columns['angle'][row])
+            dx, dy = math.cos(angle), math.sin(angle)
+        # The pin angle points from the connection point into the body (Y up)
+        return -dx, dy
+
+    def of(self, reference):
+        """Return every placed pin of one reference, in library order"""
+        return [PlacedPin(self, row) for (ref, _), row in self._rows.items() if ref == reference]
+
+    def net_positions(self, connections):
+        """
+        Resolve {reference: {pin: net}} tables to pin positions.
+
+        Returns ({net: [(reference, pin, x, y), ...]}, [(reference, pin), ...
+        that could not be placed]), both in table order.
+        """
+        xs, ys = self.columns['x'], self.columns['y']
+        nets = {}
+        missing = []
+        for reference, pin_map in connections.items():
+            for number, net in pin_map.items():
+                row = self._rows.get((reference, number))
+                if row is None:
+                    missing.append((reference, number))
+                    continue
+                nets.setdefault(net, []).append((reference, number, xs[row], ys[row]))
+        return nets, missing
+
+
+def place_pins(model, references=None):
+    """
+    Compute sheet positions of the pins of every placed symbol in a
+    SchematicModel (or only of `references`). The first symbol with a given
+    reference wins; pins common to all units are placed with each unit.
+    """
+    placed = PinPositions()
+    pins = model.pins
+    px, py, pangle = pins.column('x'), pins.column('y'), pins.column('rotation')
+    numbers, names = pins.field('number'), pins.field('name')
+    types, units = pins.field('electrical_type'), pins.field('unit')
+
+    symbols = model.symbols
+    sx, sy, srot = symbols.column('x'), symbols.column('y'), symbols.column('rotation')
+    matrices = {}
+
+    out_x, out_y, out_angle = array('d'), array('d'), array('d')
+    out_fields = {name: placed.fields[name] for name in PlacedPin.FIELDS}
+    rows = placed._rows
+    seen_symbols = set()
+
+    for s in range(len(symbols)):
+        reference = symbols.field('reference')[s]
+        lib_id = symbols.field('lib_id')[s]
+        if reference is None or (references is not None and reference not in references):
+            continue
+        unit = symbols.field('unit')[s]
+        if (reference, unit) in seen_symbols:
+            continue
+        seen_symbols.add((reference, unit))
+
+        key = (srot[s], symbols.field('mirror')[s])
+        matrix = matrices.get(key)
+        if matrix is None:
+            matrix = matrices[key] = orientation(*key)
+        a, b, c, d = matrix
+        origin_x, origin_y = sx[s], sy[s]
+
+        for p in model._pins_by_lib.get(lib_id, ()):
+            if units[p] not in (0, unit) or (reference, numbers[p]) in rows:
+                continue
+            x, y = px[p], py[p]
+            rows[(reference, numbers[p])] = len(out_x)
+            out_x.append(round(origin_x + a * x + b * y, PRECISION))
+            out_y.append(round(origin_y + c * x + d * y, PRECISION))
+            # Pin direction (library Y up) through the same matrix, back to Y up
+            angle = math.radians(pangle[p])
+            dx, dy = math.cos(angle), math.sin(angle)
+            sheet_dx, sheet_dy = a * dx + b * dy, c * dx + d * dy
+            out_angle.append(round(math.degrees(math.atan2(-sheet_dy, sheet_dx)) % 360, 2) % 360)
+            out_fields['reference'].append(reference)
+            out_fields['number'].append(numbers[p])
+            out_fields['name'].append(names[p])
+            out_fields['electrical_type'].append(types[p])
+            out_fields['lib_id'].append(lib_id)
+
+    placed.columns['x'] = out_x
+    placed.columns['y'] = out_y
+    placed.columns['angle'] = out_angle
+    placed.size = len(out_x)
+    return placed
+
+
+def _pin_locations(parsed):
+    placed = place_pins(SchematicModel.from_root(parsed.root))
+    return {(pin.reference, pin.number): PinLocation(pin.x, pin.y,
+                                                     round(pin.x / MM_PER_MIL, 2),
+                                                     round(pin.y / MM_PER_MIL, 2))
+            for pin in placed}
+
+
+def pin_locations(filepath):
+    """
+    Return {(reference, pin): PinLocation} for every placed pin of a
+    .kicad_sch, power symbols included. Cached per file contents.
+    """
+    return cached_result(filepath, 'pin-locations', _pin_locations)
+
+
+def place_bodies(model, references=None):
+    """
+    Return [(reference, (x_min, y_min, x_max, y_max))] sheet boxes covering
+    each placed symbol's drawn body and the inner part of its pins. Pin
+    connection points lie outside the box whenever the pin has a length.
+    """
+    pins = model.pins
+    px, py = pins.column('x'), pins.column('y')
+    pangle, plength, units = pins.column('rotation'), pins.column('length'), pins.field('unit')
+    boxes = []
+    seen = set()
+    for symbol in model.symbols:
+        reference, unit = symbol.reference, symbol.unit
+        if reference is None or (references is not None and reference not in references):
+            continue
+        if (reference, unit) in seen:
+            continue
+        seen.add((reference, unit))
+
+        points = []
+        body = model.body_of(symbol.lib_id, unit)
+        if body is not None:
+            points += [(body[0], body[1]), (body[2], body[3])]
+        for p in model._pins_by_lib.get(symbol.lib_id, ()):
+            if units[p] in (0, unit):
+                angle = math.radians(pangle[p])
+                points.append((px[p] + plength[p] * math.cos(angle),
+                               py[p] + plength[p] * math.sin(angle)))
+        if not points:
+            continue
+
+        x_min, y_min = min(p[0] for p in points), min(p[1] for p in points)
+        x_max, y_max = max(p[0] for p in points), max(p[1] for p in points)
+        a, b, c, d = orientation(symbol.rotation, symbol.mirror)
+        corners = [(symbol.x + a * x + b * y, symbol.y + c * x + d * y)
+                   for x in (x_min, x_max) for y in (y_min, y_max)]
+        boxes.append((reference, (round(min(p[0] for p in corners), PRECISION),
+                                  round(min(p[1] for p in corners), PRECISION),
+                                  round(max(p[0] for p in corners), PRECISION),
+                                  round(max(p[1] for p in corners), PRECISION))))
+    return boxes
@@ -0,0 +1,203 @@
+#!/usr/bin/env python3
+"""
+Batch placement transactions for .kicad_pcb layout tables
+
+The layout scripts describe a board as tables of {reference: (x, y, rotation)}.
+A PlacementTransaction takes whole tables (optionally pinned to a copper
+layer), checks every target against the keepout zones before anything is
+touched, and then applies all moves and layer flips as splice edits over a
+single parse of the file. Conflicts are collected and raised together.
+"""
+
+import math
+from abc import ABC, abstractmethod
+from collections import namedtuple
+
+from .sexpr import parse
+from .board import format_at, layer_flip_edits
+from .index import build_index
+from .edit import Editor
+
+COPPER_LAYERS = ('F.Cu', 'B.Cu')
+
+# One queued move; layer None keeps the footprint on its current side
+Target = namedtuple('Target', 'reference x y rotation layer')
+
+# One reason a target cannot be applied
+Conflict = namedtuple('Conflict', 'reference x y reason')
+
+
+class PlacementConflict(ValueError):
+    """Raised by commit() with every conflict found during validation"""
+
+    def __init__(self, conflicts):
+        self.conflicts = list(conflicts)
+        super().__init__(f"{len(self.conflicts)} placement conflict(s)")
+
+    def report(self):
+        """Return one line per conflict, in table order"""
+        return [f"{c.reference:10} ({c.x:5.1f}, {c.y:5.1f}): {c.reason}" for c in self.conflicts]
+
+
+class Keepout(ABC):
+    """Region no component origin may be placed in (table coordinates)"""
+
+    def __init__(self, name, layers=None):
+        self.name = name
+        self.layers = layers  # None = applies to both sides
+
+    def applies_to(self, layer):
+        return self.layers is None or layer in self.layers
+
+    @abstractmethod
+    def contains(self, x, y):
+        """True if (x, y) lies in the region"""
+
+
+class RectKeepout(Keepout):
+    """Axis-aligned rectangle, edges included"""
+
+    def __init__(self, name, x_min, x_max, y_min, y_max, layers=None):
+        super().__init__(name, layers)
+        self.x_min = x_min
+        self.x_max = x_max
+        self.y_min = y_min
+        self.y_max = y_max
+
+    def contains(self, x, y):
+        return self.x_min <= x <= self.x_max and self.y_min <= y <= self.y_max
+
+    def __repr__(self):
+        return f"RectKeepout({self.name!r}, X {self.x_min}-{self.x_max}, Y {self.y_min}-{self.y_max})"
+
+
+class CircleKeepout(Keepout):
+    """Clearance radius around a point (e.g. a mounting hole)"""
+
+    def __init__(self, name, x, y, radius, layers=None):
+        super().__init__(name, layers)
+        self.x = x
+        self.y = y
+        self.radius = radius
+
+    def contains(self, x, y):
+        return math.hypot(x - self.x, y - self.y) < self.radius
+
+    def __repr__(self):
+        return f"CircleKeepout({self.name!r}, ({self.x}, {self.y}), r={self.radius})"
+
+
+def keepout_conflicts(positions, keepouts, offset=(0.0, 0.0)):
+    """
+    Check placed footprints against keepouts.
+
+    positions: {reference: (x, y, rotation, layer)} in board coordinates;
+    offset is subtracted to get table coordinates. Returns [Conflict].
+    """
+    off_x, off_y = offset
+    conflicts = []
+    for reference, (x, y, _, layer) in sorted(positions.items()):
+        rel_x, rel_y = x - off_x, y - off_y
+        for keepout in keepouts:
+            if keepout.applies_to(layer) and keepout.contains(rel_x, rel_y):
+                conflicts.append(Conflict(reference, rel_x, rel_y, f"inside keepout {keepout.name}"))
+    return conflicts
+
+
+class PlacementTransaction:
+    """
+    Queue placements for one board file and apply them in one pass.
+
+    Coordinates in the tables are relative to `offset`, which is added when
+    the (at ...) nodes are written. Keepouts use table coordinates.
+    """
+
+    def __init__(self, content, root=None, offset=(0.0, 0.0), keepouts=()):
+        if root is None:
+            root = parse(content)
+        self.content = content
+        self.root = root
+        self.index = build_index(root)
+        self.editor = Editor(content)
+        self.offset = offset
+        self.keepouts = list(keepouts)
+        self.targets = {}
+        self.applied = []  # (Target, flipped) after commit()
+        self._conflicts = []
+
+    def __len__(self):
+        return len(self.targets)
+
+    def place(self, reference, x, y, rotation=0, layer=None):
+        """Queue one footprint move (and flip, if layer names the other side)"""
+        target = Target(reference, x, y, rotation, layer)
+        if reference in self.targets:
+            self._conflicts.append(Conflict(reference, x, y, "placed more than once"))
+            return target
+        self.targets[reference] = target
+        return target
+
+    def place_table(self, table, layer=None):
+        """Queue every entry of a {reference: (x, y, rotation)} table"""
+        for reference, (x, y, rotation) in table.items():
+            self.place(reference, x, y, rotation, layer)
+
+    def validate(self):
+        """Return every Conflict for the queued targets without editing anything"""
+        conflicts = list(self._conflicts)
+        for target in self.targets.values():
+            reference, x, y = target.reference, target.x, target.y
+            entry = self.index.get(reference)
+            if entry is None or entry.kind != 'footprint':
+                conflicts.append(Conflict(reference, x, y, "footprint not found"))
+                continue
+            if entry.node.find('at') is None:
+                conflicts.append(Conflict(reference, x, y, "footprint has no (at ...) position"))
+                continue
+            layer = target.layer or entry.layer
+            if target.layer is not None and target.layer not in COPPER_LAYERS:
+                conflicts.append(Conflict(reference, x, y, f"unknown layer {target.layer!r}"))
+                continue
+            for keepout in self.keepouts:
+                if keepout.applies_to(layer) and keepout.contains(x, y):
+                    conflicts.append(Conflict(reference, x, y, f"inside keepout {keepout.name}"))
+        return conflicts
+
+    def commit(self):
+        """
+        Validate, then apply every queued placement and return the new text.
+
+        Raises PlacementConflict (listing all conflicts) without editing if
+        any target fails validation. Further edits can be queued on
+        self.editor before calling this.
+        """
+        conflicts = self.validate()
+        if conflicts:
+            raise PlacementConflict(conflicts)
+
+        off_x, off_y = self.offset
+        for target in self.targets.values():
+            entry = self.index[target.reference]
+            self.editor.replace_node(
+                entry.node.find('at'),
+                format_at(target.x + off_x, target.y + off_y, target.rotation))
+
+            flipped = target.layer is not None and target.layer != entry.layer
+            if flipped:
+                for node, text in layer_flip_edits(entry.node, self.content):
+                    self.editor.replace_node(node, text)
+            self.applied.append((target, flipped))
+
+        return self.editor.apply()
+
+
+def apply_placements(content, tables, offset=(0.0, 0.0), keepouts=()):
+    """
+    Apply [(table, layer), ...] to a board's text in one transaction.
+
+    Returns (new_content, transaction); raises PlacementConflict.
+    """
+    transaction = PlacementTransaction(content, offset=offset, keepouts=keepouts)
+    for table, layer in tables:
+        transaction.place_table(table, layer)
+    return transaction.commit(), transaction
@@ -0,0 +1,212 @@
+#!/usr/bin/env python3
+"""
+Indexed queries over a parsed schematic or board
+
+build_design_index() makes one pass over the element model and stores
+inverted indexes as plain dictionaries:
+
+    net        net name -> ((reference, pin or pad), ...); on schematics
+               every label / power name of a net is a key as well
+    lib_id     lib_id (schematic) or footprint name (board) -> (reference, ...)
+    value      value -> (reference, ...)
+    footprint  footprint name -> (reference, ...)
+    pads       reference -> ((pin or pad, net), ...)
+    part       reference -> (value, lib_id, footprint)
+
+load_index() caches the indexes per file content (kicad_tools.cache), so
+after the first run a query is a cache read plus dictionary lookups.
+
+    index = load_index("boards/can-hat/can-hat.kicad_sch")
+    index.pins_on("IGN_DETECT")
+    index.instances("Device:C")
+    index.lookup('value', "10k")
+    index.find('net', "SPI_*")
+
+Usage (from pcb/):
+    python -m kicad_tools.query wrx-power-can-hat-MANUAL.kicad_sch net IGN_DETECT
+    python -m kicad_tools.query boards/can-hat/can-hat.kicad_sch lib_id Device:C
+    python -m kicad_tools.query boards/can-hat/can-hat.kicad_pcb net GND
+    python -m kicad_tools.query boards/power-hat/power-hat.kicad_pcb pads U1
+    python -m kicad_tools.query boards/can-hat/can-hat.kicad_sch value '10*'
+    python -m kicad_tools.query boards/can-hat/can-hat.kicad_sch      # list indexes
+"""
+
+import fnmatch
+import sys
+
+from .cache import cached_result
+
+INDEXES = ('net', 'lib_id', 'value', 'footprint', 'pads', 'part')
+
+
+def _freeze(index):
+    return {key: tuple(sorted(set(items), key=str)) for key, items in index.items()}
+
+
+def _schematic_indexes(root):
+    from .model import SchematicModel
+    from .netlist import build_netlist
+
+    model = SchematicModel.from_root(root)
+    netlist = build_netlist(model, root)
+    footprints = {}
+    for node in root.walk():
+        if node.tag == 'symbol' and node.get('lib_id') is not None:
+            reference = node.property('Reference')
+            if reference and reference not in footprints:
+                footprints[reference] = node.property('Footprint')
+
+    indexes = {name: {} for name in INDEXES}
+    for symbol in model.symbols:
+        reference = symbol.reference
+        if not reference or reference in indexes['part']:
+            continue
+        footprint = footprints.get(reference) or None
+        indexes['part'][reference] = (symbol.value, symbol.lib_id, footprint)
+        indexes['lib_id'].setdefault(symbol.lib_id, []).append(reference)
+        if symbol.value is not None:
+            indexes['value'].setdefault(symbol.value, []).append(reference)
+        if footprint:
+            indexes['footprint'].setdefault(footprint, []).append(reference)
+
+    for net, members in netlist.nets.items():
+        indexes['net'][net] = list(members)
+        for name in netlist.names.get(net, ()):
+            indexes['net'].setdefault(name, []).extend(members)
+    for (reference, pin), net in netlist.pin_net.items():
+        indexes['pads'].setdefault(reference, []).append((pin, net))
+    return indexes
+
+
+def _board_indexes(root):
+    from .model import PcbModel
+
+    model = PcbModel.from_root(root)
+    indexes = {name: {} for name in INDEXES}
+    for footprint in model.footprints:
+        reference = footprint.reference
+        if not reference or reference in indexes['part']:
+            continue
+        indexes['part'][reference] = (footprint.value, footprint.lib_name, footprint.lib_name)
+        if footprint.lib_name:
+            indexes['lib_id'].setdefault(footprint.lib_name, []).append(reference)
+            indexes['footprint'].setdefault(footprint.lib_name, []).append(reference)
+        if footprint.value is not None:
+            indexes['value'].setdefault(footprint.value, []).append(reference)
+
+    for pad in model.pads:
+        # Unnumbered pads are mechanical (mounting holes, tabs)
+        if pad.reference is None or not pad.number:
+            continue
+        indexes['pads'].setdefault(pad.reference, []).append((pad.number, pad.net))
+        if pad.net:
+            indexes['net'].setdefault(pad.net, []).append((pad.reference, pad.number))
+    return indexes
+
+
+class DesignIndex:
+    """Inverted indexes of one schematic or board: {index: {key: tuple}}"""
+
+    def __init__(self, kind, indexes):
+        self.kind = kind
+        self.indexes = indexes
+
+    def __repr__(self):
+        sizes = ", ".join(f"{name}={len(keys)}" for name, keys in self.indexes.items())
+        return f"DesignIndex({self.kind}, {sizes})"
+
+    def lookup(self, index, key):
+        """Items stored under one key; () if there are none"""
+        return self.indexes[index].get(key, ())
+
+    def find(self, index, pattern):
+        """{key: items} for every key matching a glob pattern (case-sensitive)"""
+        keys = self.indexes[index]
+        if not any(c in pattern for c in '*?['):
+            return {pattern: keys[pattern]} if pattern in keys else {}
+        return {key: items for key, items in keys.items() if fnmatch.fnmatchcase(key, pattern)}
+
+    def keys(self, index):
+        return sorted(self.indexes[index], key=str)
+
+    def pins_on(self, net):
+        """(reference, pin) pairs on a net, by net or label name"""
+        return self.lookup('net', net)
+
+    def instances(self, lib_id):
+        return self.lookup('lib_id', lib_id)
+
+    def pads_of(self, reference):
+        """(pin or pad, net) pairs of one reference"""
+        return self.lookup('pads', reference)
+
+
+def build_design_index(root):
+    """Build a DesignIndex from a parsed .kicad_sch or .kicad_pcb"""
+    if root.tag == 'kicad_pcb':
+        kind, indexes = 'board', _board_indexes(root)
+    else:
+        kind, indexes = 'schematic', _schematic_indexes(root)
+    for name, keys in indexes.items():
+        if name != 'part':
+            indexes[name] = _freeze(keys)
+    return DesignIndex(kind, indexes)
+
+
+def _plain_index(parsed):
+    index = build_design_index(parsed.root)
+    return index.kind, index.indexes
+
+
+def load_index(filepath):
+    """DesignIndex of a file, cached per file content"""
+    # Only the kind and plain dictionaries are stored, so cached indexes do
+    # not depend on how this module was imported
+    kind, indexes = cached_result(filepath, 'query-index', _plain_index)
+    return DesignIndex(kind, indexes)
+
+
+def _format(item):
+    if isinstance(item, tuple):
+        return " ".join("-" if part is None else str(part) for part in item)
+    return str(item)
+
+
+def main():
+    args = sys.argv[1:]
+    if not args:
+        print(__doc__)
+        return 1
+    index = load_index(args[0])
+    if len(args) == 1:
+        for name in INDEXES:
+            print(f"{name:10} {len(index.indexes[name]):5} keys")
+        return 0
+    name = args[1]
+    if name not in INDEXES:
+        print(f"Unknown index {name!r}; one of: {', '.join(INDEXES)}")
+        return 1
+    if len(args) == 2:
+        for key in index.keys(name):
+            print(f"{key}\t{len(index.lookup(name, key)) if name != 'part' else _format(index.lookup(name, key))}")
+        return 0
+
+    found = 0
+    for pattern in args[2:]:
+        matches = index.find(name, pattern)
+        if not matches:
+            print(f"{pattern}: no match")
+        for key in sorted(matches, key=str):
+            items = matches[key]
+            found += 1
+            if name == 'part':
+                print(f"{key}: {_format(items)}")
+                continue
+            print(f"{key}: {len(items)}")
+            for item in items:
+                print(f"  {_format(item)}")
+    return 0 if found else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
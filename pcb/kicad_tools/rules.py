@@ -0,0 +1,313 @@
+#!/usr/bin/env python3
+"""
+Declarative design rules for schematics
+
+Rules are S-expression files (pcb/design_rules/*.design_rules) read with
+the shared parser:
+
+    (design_rules "wrx-power-can-hat"
+      (files "wrx-power-can-hat-*.kicad_sch")
+      (group "Power Supply"
+        (part U1 (value "TPS54560") (type "IC"))
+        (part J1 (pins 8) (description "ISO-A Power"))
+        (net "+3.3V")
+        (pin J1 8 "GND")
+        (forbid J1 "SPI_CE0")
+        (isolate "CAN_INT" "SPI_CE0")))
+
+    part     the reference must be placed; (value ...) must occur in its
+             value (case-insensitive), (pins N) must match its symbol's pin
+             count; (optional) reports a missing part as a warning
+    net      some net must carry this name (label, global label or power symbol)
+    pin      the pin must be on the net of that name
+    forbid   no pin of the reference may be on the net of that name
+    isolate  the two names must not be on one net
+
+(type ...) and (description ...) on a part are notes for whoever reads
+the rule file. They are kept in Rule.spec but neither checked nor shown.
+
+A RuleSet compiles the rules into dictionaries keyed the way the
+schematic facts are (reference, (reference, pin), net name), so checking
+is one lookup per rule after one pass over the schematic. check_file()
+caches the results per file content and rule-set digest.
+
+    rules = load_rules("design_rules/wrx-power-can-hat.design_rules")
+    for result in check_file("wrx-power-can-hat-MANUAL.kicad_sch", rules):
+        print(result.status, result.rule.subject, result.detail)
+
+Usage (from pcb/):
+    python -m kicad_tools.rules                      # every rule file on its boards
+    python -m kicad_tools.rules design_rules/can-hat.design_rules boards/can-hat/can-hat.kicad_sch
+"""
+
+import fnmatch
+import hashlib
+import sys
+from collections import namedtuple
+from pathlib import Path
+
+from .cache import cached_result, default_cache
+from .model import SchematicModel
+from .netlist import build_netlist
+from .sexpr import Node, SExprError, load
+
+RULES_DIR = Path(__file__).resolve().parent.parent / "design_rules"
+RULES_SUFFIX = ".design_rules"
+
+# kind:    'part', 'net', 'pin', 'forbid' or 'isolate'
+# group:   heading the rule is listed under
+# subject: reference, net name, (reference, pin) or (name, name)
+# spec:    {option: value} of the rule, e.g. {'value': '5A', 'pins': 8}
+Rule = namedtuple('Rule', 'kind group subject spec')
+
+# status: 'ok', 'missing', 'mismatch', 'violation' or 'warning'
+Result = namedtuple('Result', 'rule status detail')
+
+KINDS = ('part', 'net', 'pin', 'forbid', 'isolate')
+
+
+def _spec(node, start):
+    spec = {}
+    for item in node[start:]:
+        if isinstance(item, Node):
+            value = item[1] if len(item) > 1 else True
+            spec[item.tag] = int(value) if item.tag == 'pins' else value
+    return spec
+
+
+def _rule(node, group):
+    kind = node.tag
+    args = [item for item in node[1:] if not isinstance(item, Node)]
+    need = {'part': 1, 'net': 1, 'pin': 3, 'forbid': 2, 'isolate': 2}[kind]
+    if len(args) != need:
+        raise SExprError(f"({kind} ...) takes {need} argument(s), got {len(args)} at offset {node.start}")
+    if kind in ('part', 'net'):
+        subject = args[0]
+    elif kind == 'pin':
+        subject = (args[0], args[1])
+    else:
+        subject = tuple(args)
+    spec = _spec(node, 1)
+    if kind == 'pin':
+        spec['net'] = args[2]
+    return Rule(kind, group, subject, spec)
+
+
+class RuleSet:
+    """Compiled rules: one dictionary per rule kind, keyed like the facts"""
+
+    def __init__(self, rules, name='', files=(), digest=''):
+        self.rules = list(rules)
+        self.name = name
+        self.files = tuple(files)
+        self.digest = digest or hashlib.blake2b(repr(self.rules).encode('utf-8'), digest_size=8).hexdigest()
+        self.parts = {}       # reference -> [Rule]
+        self.nets = {}        # net name -> [Rule]
+        self.pins = {}        # (reference, pin) -> [Rule]
+        self.forbid = {}      # reference -> {net name: Rule}
+        self.isolate = []     # [Rule]
+        for rule in self.rules:
+            if rule.kind == 'part':
+                self.parts.setdefault(rule.subject, []).append(rule)
+            elif rule.kind == 'net':
+                self.nets.setdefault(rule.subject, []).append(rule)
+            elif rule.kind == 'pin':
+                self.pins.setdefault(rule.subject, []).append(rule)
+            elif rule.kind == 'forbid':
+                self.forbid.setdefault(rule.subject[0], {})[rule.subject[1]] = rule
+            else:
+                self.isolate.append(rule)
+
+    def __len__(self):
+        return len(self.rules)
+
+    def __repr__(self):
+        return f"RuleSet({self.name!r}, {len(self.rules)} rules)"
+
+    @classmethod
+    def from_root(cls, root, digest=''):
+        """Compile a parsed (design_rules ...) tree"""
+        if root.tag != 'design_rules':
+            raise SExprError(f"Expected (design_rules ...), got ({root.tag} ...)")
+        name = root[1] if len(root) > 1 and not isinstance(root[1], Node) else ''
+        rules, files = [], []
+        for node in root.children():
+            if node.tag == 'files':
+                files += node[1:]
+            elif node.tag == 'group':
+                group = node[1] if len(node) > 1 else ''
+                rules += [_rule(child, group) for child in node.children() if child.tag in KINDS]
+            elif node.tag in KINDS:
+                rules.append(_rule(node, ''))
+            else:
+                raise SExprError(f"Unknown rule ({node.tag} ...) at offset {node.start}")
+        return cls(rules, name, files, digest)
+
+    def applies_to(self, path):
+        """True if one of the (files ...) patterns matches the path"""
+        path = Path(path).resolve()
+        base = RULES_DIR.parent
+        return any(fnmatch.fnmatch(str(path), str(base / pattern)) for pattern in self.files)
+
+    def check(self, facts):
+        """Evaluate every rule against SchematicFacts; returns [Result] in rule order"""
+        results = {}
+
+        for reference, rules in self.parts.items():
+            part = facts.parts.get(reference)
+            for rule in rules:
+                if part is None:
+                    status = 'warning' if rule.spec.get('optional') else 'missing'
+                    results[id(rule)] = Result(rule, status, f"expected {rule.spec.get('value', '')}".strip())
+                    continue
+                value, lib_id, pin_count = part
+                expected = rule.spec.get('value')
+                if expected and expected.lower() not in (value or '').lower():
+                    results[id(rule)] = Result(rule, 'mismatch', f"value {value!r}, expected {expected!r}")
+                elif 'pins' in rule.spec and pin_count and pin_count != rule.spec['pins']:
+                    results[id(rule)] = Result(rule, 'mismatch', f"{pin_count} pins ({lib_id}), expected {rule.spec['pins']}")
+                else:
+                    results[id(rule)] = Result(rule, 'ok', value)
+
+        for name, rules in self.nets.items():
+            found = name in facts.net_of
+            for rule in rules:
+                results[id(rule)] = Result(rule, 'ok' if found else 'missing', "" if found else "no net of that name")
+
+        for key, rules in self.pins.items():
+            net = facts.pin_net.get(key)
+            for rule in rules:
+                if net is None:
+                    results[id(rule)] = Result(rule, 'missing', "pin not on the sheet")
+                elif facts.net_of.get(rule.spec['net']) == net:
+                    results[id(rule)] = Result(rule, 'ok', net)
+                else:
+                    results[id(rule)] = Result(rule, 'violation', f"on {net}, expected {rule.spec['net']}")
+
+        for reference, names in self.forbid.items():
+            on = {}
+            for net, pins in facts.ref_nets.get(reference, {}).items():
+                for name in facts.names.get(net, ()):
+                    on[name] = pins
+            for name, rule in names.items():
+                pins = on.get(name)
+                if pins:
+                    results[id(rule)] = Result(rule, 'violation', f"pin(s) {', '.join(pins)} on {name}")
+                else:
+                    results[id(rule)] = Result(rule, 'ok', "")
+
+        for rule in self.isolate:
+            a, b = (facts.net_of.get(name) for name in rule.subject)
+            if a is not None and a == b:
+                results[id(rule)] = Result(rule, 'violation', f"both on {a}")
+            else:
+                results[id(rule)] = Result(rule, 'ok', "")
+
+        return [results[id(rule)] for rule in self.rules]
+
+
+class SchematicFacts:
+    """What the rules look at in one schematic, as hashed lookups"""
+
+    def __init__(self, root):
+        model = SchematicModel.from_root(root)
+        netlist = build_netlist(model, root)
+        self.parts = {}       # reference -> (value, lib_id, pin count)
+        for symbol in model.symbols:
+            reference = symbol.reference
+            if not reference or reference.startswith('#') or reference in self.parts:
+                continue
+            pin_count = len({pin.number for pin in model.pins_of(symbol.lib_id)})
+            self.parts[reference] = (symbol.value, symbol.lib_id, pin_count)
+        self.pin_net = netlist.pin_net          # (reference, pin) -> net
+        self.names = netlist.names              # net -> [names]
+        self.net_of = {}                        # name -> net
+        for net, names in netlist.names.items():
+            for name in names:
+                self.net_of.setdefault(name, net)
+        self.ref_nets = {}                      # reference -> {net: [pins]}
+        for (reference, pin), net in netlist.pin_net.items():
+            self.ref_nets.setdefault(reference, {}).setdefault(net, []).append(pin)
+
+
+def load_rules(path):
+    """Read and compile one .design_rules file"""
+    content, root = load(path)
+    digest = hashlib.blake2b(content.encode('utf-8'), digest_size=8).hexdigest()
+    return RuleSet.from_root(root, digest=digest)
+
+
+def rule_files(directory=RULES_DIR):
+    return sorted(Path(directory).glob(f"*{RULES_SUFFIX}"))
+
+
+def _outcomes(rules, parsed):
+    # Only (status, detail) pairs are stored, so cached results do not
+    # depend on how this module was imported
+    return [(r.status, r.detail) for r in rules.check(SchematicFacts(parsed.root))]
+
+
+def check_file(filepath, rules):
+    """Results of a RuleSet on one schematic, cached per file content and rule set"""
+    outcomes = cached_result(filepath, f"design-rules-{rules.digest}",
+                             lambda parsed: _outcomes(rules, parsed), version=2)
+    return [Result(rule, status, detail) for rule, (status, detail) in zip(rules.rules, outcomes)]
+
+
+def check_parsed(parsed, rules):
+    """check_file() for a FileSnapshot or ParsedFile, sharing its cache entries"""
+    cache = default_cache()
+    name = f"design-rules-{rules.digest}"
+    found, outcomes = cache.get_result(parsed.digest, name, version=2)
+    if found:
+        cache.hits += 1
+    else:
+        outcomes = _outcomes(rules, parsed)
+        cache.put_result(parsed.digest, name, outcomes, version=2)
+    return [Result(rule, status, detail) for rule, (status, detail) in zip(rules.rules, outcomes)]
+
+
+def failures(results):
+    return [r for r in results if r.status != 'ok']
+
+
+def format_results(results, verbose=False):
+    marks = {'ok': '[OK]', 'missing': '[MISSING]', 'mismatch': '[MISMATCH]',
+             'violation': '[VIOLATION]', 'warning': '[WARN]'}
+    lines = []
+    group = None
+    for result in results:
+        if result.status == 'ok' and not verbose:
+            continue
+        rule = result.rule
+        if rule.group != group:
+            group = rule.group
+            lines.append(f"  {group or '(no group)'}:")
+        subject = rule.subject if isinstance(rule.subject, str) else " ".join(rule.subject)
+        lines.append(f"    {marks[result.status]:11} {rule.kind} {subject}: {result.detail}".rstrip(': '))
+    return lines
+
+
+def main():
+    verbose = '-v' in sys.argv
+    args = [a for a in sys.argv[1:] if not a.startswith('-')]
+    rule_paths = [a for a in args if a.endswith(RULES_SUFFIX)] or rule_files()
+    targets = [a for a in args if not a.endswith(RULES_SUFFIX)]
+    base = RULES_DIR.parent
+
+    failed = 0
+    for rule_path in rule_paths:
+        rules = load_rules(rule_path)
+        paths = targets or sorted({p for pattern in rules.files for p in base.glob(pattern)})
+        for path in paths:
+            results = check_file(path, rules)
+            bad = failures(results)
+            failed += len(bad)
+            print(f"{Path(path).name} [{rules.name}]: {len(results) - len(bad)}/{len(results)} rules pass")
+            for line in format_results(results, verbose):
+                print(line)
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
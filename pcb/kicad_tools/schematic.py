@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""
+Schematic (.kicad_sch) helpers built on the shared S-expression tree
+"""
+
+
+def lib_symbols(root):
+    """Return the top-level library symbol definitions as {name: node}"""
+    section = root.find('lib_symbols')
+    if section is None:
+        return {}
+    return {sym[1]: sym for sym in section.children('symbol') if len(sym) > 1}
+
+
+def lib_symbol_pins(root):
+    """
+    Extract pin offsets from the lib_symbols section.
+
+    Returns {symbol_name: {pin_number: (x, y, rotation)}} using the symbol's
+    own (library) coordinates. Symbols without pins are left out.
+    """
+    symbol_pins = {}
+    for name, sym in lib_symbols(root).items():
+        pins = {}
+        for pin in sym.walk('pin'):
+            at = pin.floats('at')
+            number = pin.get('number')
+            if at is None or number is None:
+                continue
+            x, y = at[0], at[1]
+            rotation = at[2] if len(at) > 2 else 0.0
+            pins[number] = (x, y, rotation)
+        if pins:
+            symbol_pins[name] = pins
+    return symbol_pins
+
+
+def placed_symbols(root):
+    """Iterate placed symbol instances (top-level symbols with a lib_id)"""
+    for sym in root.children('symbol'):
+        if sym.find('lib_id') is not None:
+            yield sym
+
+
+def symbol_instances(root):
+    """
+    Return placed components as {reference: {'lib_id', 'x', 'y', 'rotation'}}.
+
+    Later symbols with the same reference (e.g. "#PWR?") overwrite earlier ones.
+    """
+    instances = {}
+    for sym in placed_symbols(root):
+        reference = sym.property('Reference')
+        at = sym.floats('at')
+        if reference is None or at is None:
+            continue
+        instances[reference] = {
+            'lib_id': sym.get('lib_id'),
+            'x': at[0],
+            'y': at[1],
+            'rotation': at[2] if len(at) > 2 else 0.0,
+        }
+    return instances
+
+
+def global_label_positions(root):
+    """Return {net_name: [(x, y), ...]} for every global label"""
+    positions = {}
+    # walk() rather than children(): hand-edited files such as WIRED leave
+    # lib_symbols unclosed, which nests the sheet's labels inside it
+    for label in root.walk('global_label'):
+        at = label.floats('at')
+        if len(label) < 2 or at is None:
+            continue
+        positions.setdefault(label[1], []).append((at[0], at[1]))
+    return positions
+
+
+def sheet_items(root):
+    """
+    Iterate the sheet-level elements of a schematic (wires, labels, placed
+    symbols, junctions, ...), skipping library definitions.
+
+    Items that an unclosed (lib_symbols ...) swallowed in hand-edited files
+    such as WIRED are yielded as well.
+    """
+    for node in root.children():
+        if node.tag != 'lib_symbols':
+            yield node
+            continue
+        for item in node.children():
+            if item.tag == 'symbol' and item.find('lib_id') is None:
+                continue
+            yield item
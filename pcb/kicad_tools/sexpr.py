@@ -0,0 +1,209 @@
+#!/usr/bin/env python3
+"""
+Single-pass S-expression parser for KiCad files (.kicad_sch, .kicad_pcb, .kicad_sym)
+
+Tokenizes the whole file with one regex scan and builds a tree of Node lists.
+Every node records the start/end offsets of its parentheses in the parsed
+buffer, so callers can slice the original text (or splice edits into it)
+without searching for the element again.
+
+Offsets are indexes into whatever was parsed: character offsets for str,
+byte offsets for bytes/mmap.
+"""
+
+import re
+
+# One alternation per token kind; m.lastindex tells which one matched
+#   1 = "("   2 = ")"   3 = quoted string body   4 = bare atom   5 = stray quote
+_TOKEN_PATTERN = r'(\()|(\))|"((?:[^"\\]|\\.)*)"|([^\s()"]+)|(")'
+_TOKEN_STR = re.compile(_TOKEN_PATTERN, re.DOTALL)
+_TOKEN_BYTES = re.compile(_TOKEN_PATTERN.encode('ascii'), re.DOTALL)
+
+_ESCAPES = {'n': '\n', 't': '\t', 'r': '\r', '"': '"', '\\': '\\'}
+
+
+class SExprError(ValueError):
+    """Raised for unbalanced parentheses or unterminated strings"""
+
+
+class Node(list):
+    """
+    One parenthesized list. Items are child Nodes or atom strings.
+
+    node[0] is normally the tag ("symbol", "footprint", "at", ...).
+    node.start / node.end are the offsets of "(" and one past ")".
+    """
+
+    __slots__ = ('start', 'end')
+
+    def __init__(self, items=(), start=-1, end=-1):
+        super().__init__(items)
+        self.start = start
+        self.end = end
+
+    def __repr__(self):
+        return f"Node({self.tag!r}, {len(self)} items, span={self.start}:{self.end})"
+
+    def __reduce__(self):
+        # Compact pickling for the on-disk parse cache
+        return (Node, (list(self), self.start, self.end))
+
+    # list equality would compare items only; nodes are compared by identity
+    __eq__ = object.__eq__
+    __ne__ = object.__ne__
+    __hash__ = object.__hash__
+
+    @property
+    def tag(self):
+        if self and isinstance(self[0], str):
+            return self[0]
+        return None
+
+    @property
+    def span(self):
+        return (self.start, self.end)
+
+    def text(self, source):
+        """Return the original source text of this node"""
+        return source[self.start:self.end]
+
+    def children(self, tag=None):
+        """Iterate direct child nodes, optionally only those with a given tag"""
+        for item in self:
+            if isinstance(item, Node) and (tag is None or (item and item[0] == tag)):
+                yield item
+
+    def find(self, tag):
+        """Return the first direct child node with this tag, or None"""
+        for item in self:
+            if isinstance(item, Node) and item and item[0] == tag:
+                return item
+        return None
+
+    def get(self, tag, index=1, default=None):
+        """Return atom `index` of the first child `(tag ...)`, e.g. get('lib_id')"""
+        child = self.find(tag)
+        if child is None or len(child) <= index or isinstance(child[index], Node):
+            return default
+        return child[index]
+
+    def floats(self, tag):
+        """Return the numeric atoms of child `(tag ...)` as floats, e.g. floats('at')"""
+        child = self.find(tag)
+        if child is None:
+            return None
+        return tuple(float(v) for v in child[1:] if not isinstance(v, Node))
+
+    def property(self, name, default=None):
+        """Return the value of `(property "name" "value")`"""
+        for item in self:
+            if (isinstance(item, Node) and len(item) > 2
+                    and item[0] == 'property' and item[1] == name):
+                return item[2]
+        return default
+
+    def properties(self):
+        """Return all `(property ...)` children as a {name: value} dict"""
+        props = {}
+        for item in self:
+            if isinstance(item, Node) and len(item) > 2 and item[0] == 'property':
+                props[item[1]] = item[2]
+        return props
+
+    def walk(self, tag=None):
+        """Iterate all descendant nodes depth-first (document order)"""
+        stack = [iter(self)]
+        while stack:
+            for item in stack[-1]:
+                if isinstance(item, Node):
+                    if tag is None or (item and item[0] == tag):
+                        yield item
+                    stack.append(iter(item))
+                    break
+            else:
+                stack.pop()
+
+
+def _unescape(value):
+    """Undo KiCad string escaping (\\" \\\\ \\n)"""
+    return re.sub(r'\\(.)', lambda m: _ESCAPES.get(m.group(1), m.group(1)), value, flags=re.DOTALL)
+
+
+def quote(value):
+    """Quote a string for writing back into a KiCad file"""
+    return '"' + str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n') + '"'
+
+
+def parse_all(text, pos=0, endpos=None, strict=True):
+    """
+    Parse every top-level list in text[pos:endpos] and return them as a list.
+
+    With strict=False, lists left open at the end of the range are closed
+    there instead of raising (some generated files in this repo are missing
+    their final parenthesis).
+    """
+    if endpos is None:
+        endpos = len(text)
+    binary = not isinstance(text, str)
+    pattern = _TOKEN_BYTES if binary else _TOKEN_STR
+
+    forms = []
+    stack = []
+    node = None
+
+    for m in pattern.finditer(text, pos, endpos):
+        kind = m.lastindex
+        if kind == 1:
+            child = Node(start=m.start())
+            if node is None:
+                forms.append(child)
+            else:
+                node.append(child)
+            stack.append(node)
+            node = child
+        elif kind == 2:
+            if node is None:
+                raise SExprError(f"Unexpected ')' at offset {m.start()}")
+            node.end = m.end()
+            node = stack.pop()
+        elif kind == 5:
+            raise SExprError(f"Unterminated string at offset {m.start()}")
+        elif node is None:
+            raise SExprError(f"Atom outside of any list at offset {m.start()}")
+        else:
+            value = m.group(kind)
+            if binary:
+                value = value.decode('utf-8')
+            if kind == 3 and '\\' in value:
+                value = _unescape(value)
+            node.append(value)
+
+    if node is not None:
+        if strict:
+            raise SExprError(f"Unclosed '(' opened at offset {node.start}")
+        while node is not None:
+            node.end = endpos
+            node = stack.pop()
+
+    return forms
+
+
+def parse(text, strict=True):
+    """Parse a KiCad file's contents and return its root node"""
+    forms = parse_all(text, strict=strict)
+    if not forms:
+        raise SExprError("No S-expression found")
+    return forms[0]
+
+
+def load(filepath, strict=True):
+    """Read a KiCad file and return (content, root)"""
+    with open(filepath, 'r', encoding='utf-8') as f:
+        content = f.read()
+    return content, parse(content, strict=strict)
+
+
+def line_start(text, offset):
+    """Return the offset of the start of the line containing `offset`"""
+    newline = '\n' if isinstance(text, str) else b'\n'
+    return text.rfind(newline, 0, offset) + 1
@@ -0,0 +1,226 @@
+#!/usr/bin/env python3
+"""
+Wire-graph simplification for schematics
+
+Generated wiring tends to carry collinear pieces that could be one wire,
+zero-length wires, overlapping runs of the same net and a junction at
+every bend. simplify_wires() rebuilds the wire graph with endpoints hashed
+to KiCad's 0.1 um resolution:
+
+    - zero-length and duplicate wires are dropped
+    - collinear wires of a net on one line are merged into maximal runs
+    - a merged run is split again only where a former wire end is touched
+      by something else (another wire, a pin, a label)
+    - junctions are kept only at true 3+-way nodes: wire ends count one, a
+      wire passing through counts two, a pin counts one
+
+Connectivity is unchanged: wires touching end to end or overlapping were
+already connected, points on a wire's interior still lie on it, and no
+former tee becomes a plain crossing. Crossings without a junction stay
+unconnected.
+
+simplify_file() applies the pass to an existing .kicad_sch. Wires and
+junctions that survive unchanged keep their text and UUIDs, so the diff
+only shows what was merged or dropped.
+
+    python -m kicad_tools.simplify wrx-power-can-hat-INTELLIGENT.kicad_sch [--write]
+"""
+
+import sys
+
+from .wirecheck import Segment, incidences
+
+PRECISION = 4
+
+
+def _key(x, y):
+    return round(x, PRECISION), round(y, PRECISION)
+
+
+def simplify_wires(segments, junctions=(), pins=(), stops=()):
+    """
+    Simplify wires [(x1, y1, x2, y2[, net])] and junctions [(x, y)].
+
+    pins:  (x, y) connection points; they count toward a junction
+    stops: (x, y) other points that connect to wires (labels, no-connects)
+    Returns ([Segment], [(x, y)]).
+    """
+    lines = {}      # (net, axis, fixed) -> [(lo, hi)]
+    other = []      # diagonal wires, kept as they are
+    for segment in segments:
+        x1, y1 = _key(segment[0], segment[1])
+        x2, y2 = _key(segment[2], segment[3])
+        net = segment[4] if len(segment) > 4 else None
+        if (x1, y1) == (x2, y2):
+            continue
+        if y1 == y2:
+            lines.setdefault((net, 'h', y1), []).append((min(x1, x2), max(x1, x2)))
+        elif x1 == x2:
+            lines.setdefault((net, 'v', x1), []).append((min(y1, y2), max(y1, y2)))
+        else:
+            other.append(Segment(x1, y1, x2, y2, net))
+
+    runs = []       # (Segment, {former piece end strictly inside the run: covered})
+    for (net, axis, fixed), spans in sorted(lines.items(), key=lambda item: str(item[0])):
+        spans = sorted(set(spans))
+        group = [spans[0]]
+        hi = spans[0][1]
+        for a, b in spans[1:] + [(None, None)]:
+            if a is not None and a <= hi:
+                group.append((a, b))
+                hi = max(hi, b)
+                continue
+            lo = group[0][0]
+            # covered: the point already lay inside one of the original pieces
+            inner = {v: any(p < v < q for p, q in group)
+                     for piece in group for v in piece if lo < v < hi}
+            points = {((v, fixed) if axis == 'h' else (fixed, v)): covered
+                      for v, covered in inner.items()}
+            if axis == 'h':
+                runs.append((Segment(lo, fixed, hi, fixed, net), points))
+            else:
+                runs.append((Segment(fixed, lo, fixed, hi, net), points))
+            group, hi = [(a, b)], b
+
+    # A former piece end now inside a run stays an end if another wire
+    # touches it (a tee must not turn into a plain crossing), or if a pin
+    # or label sits there that no original piece passed through
+    pin_keys = {_key(x, y) for x, y in pins}
+    occupied = pin_keys | {_key(x, y) for x, y in stops}
+    all_wires = [run[:4] for run, _ in runs] + [s[:4] for s in other]
+    candidates = sorted({p for _, inner in runs for p in inner})
+    touching = {}
+    for n, _, _ in incidences(all_wires, candidates):
+        touching[candidates[n]] = touching.get(candidates[n], 0) + 1
+
+    result = []
+    for run, inner in runs:
+        cuts = sorted(p for p, covered in inner.items()
+                      if touching.get(p, 0) > 1 or (p in occupied and not covered))
+        x1, y1 = run.x1, run.y1
+        for x, y in cuts + [(run.x2, run.y2)]:
+            result.append(Segment(x1, y1, x, y, run.net))
+            x1, y1 = x, y
+    result += other
+
+    # Existing junctions stay where three or more wire ends, wire passes (two
+    # each) and pins meet. Merging only crosses points nothing else touches,
+    # so it never creates a node that needs a new junction.
+    junction_keys = {_key(x, y) for x, y in junctions}
+    degree = {}
+    for s in result:
+        for end in ((s.x1, s.y1), (s.x2, s.y2)):
+            degree[end] = degree.get(end, 0) + 1
+    points = sorted(set(degree) | junction_keys)
+    for n, _, where in incidences([s[:4] for s in result], points):
+        if where == 'interior':
+            degree[points[n]] = degree.get(points[n], 0) + 2
+    kept = sorted(p for p in junction_keys if degree.get(p, 0) + (p in pin_keys) >= 3)
+    return result, kept
+
+
+def _wire_points(node):
+    pts = node.find('pts')
+    if pts is None:
+        return None
+    xy = [p for p in pts.children('xy') if len(p) >= 3]
+    if len(xy) != 2:
+        return None
+    return float(xy[0][1]), float(xy[0][2]), float(xy[1][1]), float(xy[1][2])
+
+
+def _normalized(x1, y1, x2, y2):
+    a, b = _key(x1, y1), _key(x2, y2)
+    return min(a, b) + max(a, b)
+
+
+def simplify_file(filepath):
+    """
+    Simplify the wires and junctions of a .kicad_sch.
+
+    Returns (new content, stats) where stats counts wires and junctions
+    before and after.
+    """
+    from .autowire import Wiring, insert, render
+    from .cache import load_cached
+    from .edit import Editor
+    from .model import SchematicModel
+    from .pins import place_pins
+    from .sexpr import line_start
+
+    parsed = load_cached(filepath, strict=False)
+    content, root = parsed.content, parsed.root
+    model = SchematicModel.from_root(root)
+
+    wire_nodes, junction_nodes = [], []
+    for node in root.children():
+        if node.tag == 'wire' and _wire_points(node) is not None:
+            wire_nodes.append(node)
+        elif node.tag == 'junction' and node.floats('at') is not None:
+            junction_nodes.append(node)
+
+    stops = [(label.x, label.y) for label in model.labels]
+    stops += [tuple(n.floats('at')[:2]) for n in root.children('no_connect') if n.floats('at')]
+    pins = [(pin.x, pin.y) for pin in place_pins(model)]
+    segments, junctions = simplify_wires(
+        [_wire_points(n) for n in wire_nodes],
+        [tuple(n.floats('at')[:2]) for n in junction_nodes], pins, stops)
+
+    editor = Editor(content)
+
+    def delete(node):
+        end = node.end + 1 if content[node.end:node.end + 1] == '\n' else node.end
+        editor.delete(line_start(content, node.start), end)
+
+    # Keep the text of wires and junctions that survive as they are
+    wanted = {_normalized(*s[:4]) for s in segments}
+    kept_wires = set()
+    for node in wire_nodes:
+        key = _normalized(*_wire_points(node))
+        if key in wanted and key not in kept_wires:
+            kept_wires.add(key)
+        else:
+            delete(node)
+    wanted_junctions = set(junctions)
+    kept_junctions = set()
+    for node in junction_nodes:
+        key = _key(*node.floats('at')[:2])
+        if key in wanted_junctions and key not in kept_junctions:
+            kept_junctions.add(key)
+        else:
+            delete(node)
+
+    wiring = Wiring('simplify')
+    wiring.segments = [s for s in segments if _normalized(*s[:4]) not in kept_wires]
+    wiring.junctions = [j for j in junctions if j not in kept_junctions]
+    new_content = editor.apply()
+    if wiring.segments or wiring.junctions:
+        new_content = insert(new_content, render(wiring))
+
+    stats = {
+        'wires': (len(wire_nodes), len(segments)),
+        'junctions': (len(junction_nodes), len(junctions)),
+        'bytes': (len(content.encode('utf-8')), len(new_content.encode('utf-8'))),
+    }
+    return new_content, stats
+
+
+def main():
+    args = [a for a in sys.argv[1:] if not a.startswith('--')]
+    if not args:
+        print(__doc__)
+        return 1
+    for path in args:
+        new_content, stats = simplify_file(path)
+        print(f"{path}:")
+        for name, (before, after) in stats.items():
+            print(f"  {name:10} {before:>9} -> {after}")
+        if '--write' in sys.argv:
+            with open(path, 'w', encoding='utf-8') as f:
+                f.write(new_content)
+            print("  written")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,356 @@
+#!/usr/bin/env python3
+"""
+Rectilinear spanning / Steiner trees for wiring one net
+
+A net's pins are joined by a minimum spanning tree under the Manhattan
+distance (Prim, O(n^2) - nets here have at most a few dozen pins). With
+steiner=True, Steiner points are added first by the iterated 1-Steiner
+heuristic: every point of the Hanan grid (the crossings of the pins' X
+and Y lines) is tried, the one that shortens the spanning tree most is
+kept, and this repeats until no point helps. Because the spanning tree of
+the points plus one more uses only the old tree's edges and the new
+point's edges, each try is a Kruskal pass over 2n edges.
+
+Only clean edges are used: a straight run or an L that touches no other
+net's pin or wire end, runs along no other net's wire and has no corner
+on one. The tree is a minimum spanning forest (Kruskal) of the clean
+edges, so a pin that cannot be reached without touching another net is
+left unconnected instead of shorting the two nets. Each edge is drawn
+with its clean L sharing the most length with wire already drawn.
+Collinear wire of the net is then merged, and split again at every pin
+and branch point so all connections are end-to-end. Junctions go wherever
+three or more wire ends (a pin counting as one) meet.
+
+    tree = route_tree([(x, y), ...], avoid=foreign_pins)
+    tree.segments      # [(x1, y1, x2, y2)]
+    tree.junctions     # [(x, y)]
+    tree.unconnected   # [(x, y)] pins outside the largest wired piece
+    tree.length
+
+star_tree() is the older topology for comparison: every pin wired to the
+grid point nearest the net's centroid.
+"""
+
+from bisect import bisect_left, bisect_right
+
+from .wirecheck import incidences
+
+PRECISION = 4
+
+
+class Tree:
+    """Wiring of one net: axis-aligned segments and junction points"""
+
+    def __init__(self, segments=(), junctions=(), unconnected=()):
+        self.segments = list(segments)
+        self.junctions = list(junctions)
+        self.unconnected = list(unconnected)
+
+    @property
+    def length(self):
+        return wire_length(self.segments)
+
+
+def _key(x, y):
+    return round(x, PRECISION), round(y, PRECISION)
+
+
+def wire_length(segments):
+    """Total length of axis-aligned segments"""
+    return sum(abs(x2 - x1) + abs(y2 - y1) for x1, y1, x2, y2 in segments)
+
+
+def rectilinear_mst(points):
+    """
+    Return the edges [(i, j)] of a minimum spanning tree of [(x, y)] under
+    the Manhattan distance, in the order Prim's algorithm adds them.
+    """
+    count = len(points)
+    if count < 2:
+        return []
+    best = [None] * count       # (distance, tree vertex) for vertices outside the tree
+    in_tree = [False] * count
+    in_tree[0] = True
+    x0, y0 = points[0]
+    for i in range(1, count):
+        best[i] = (abs(points[i][0] - x0) + abs(points[i][1] - y0), 0)
+    edges = []
+    for _ in range(count - 1):
+        nxt = min((i for i in range(count) if not in_tree[i]), key=lambda i: (best[i][0], i))
+        edges.append((best[nxt][1], nxt))
+        in_tree[nxt] = True
+        nx, ny = points[nxt]
+        for i in range(count):
+            if not in_tree[i]:
+                dist = abs(points[i][0] - nx) + abs(points[i][1] - ny)
+                if dist < best[i][0]:
+                    best[i] = (dist, nxt)
+    return edges
+
+
+def _distance(a, b):
+    return abs(a[0] - b[0]) + abs(a[1] - b[1])
+
+
+def _kruskal(count, edges):
+    """Edges [(length, i, j)] of a minimum spanning forest over count vertices"""
+    parent = list(range(count))
+
+    def find(i):
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+
+    tree = []
+    for edge in sorted(edges):
+        a, b = find(edge[1]), find(edge[2])
+        if a != b:
+            parent[a] = b
+            tree.append(edge)
+    return tree
+
+
+def steiner_points(pins, blocked=()):
+    """
+    Iterated 1-Steiner: return the Hanan-grid points that, added to the
+    pins [(x, y)], shorten the rectilinear spanning tree. Points in
+    blocked are never used. Steiner points left with two or fewer tree
+    edges are dropped after each round, as they no longer save length.
+    """
+    pins = list(pins)
+    if len(pins) < 3:
+        return []
+    blocked = set(blocked) | set(pins)
+    candidates = [(x, y) for x in sorted({p[0] for p in pins})
+                  for y in sorted({p[1] for p in pins}) if (x, y) not in blocked]
+    added = []
+    while candidates:
+        points = pins + added
+        count = len(points)
+        base = [(_distance(points[i], points[j]), i, j) for i, j in rectilinear_mst(points)]
+        length = sum(edge[0] for edge in base)
+        best, best_gain = None, 1e-6
+        for candidate in candidates:
+            edges = base + [(_distance(candidate, p), count, k) for k, p in enumerate(points)]
+            gain = length - sum(edge[0] for edge in _kruskal(count + 1, edges))
+            if gain > best_gain:
+                best, best_gain = candidate, gain
+        if best is None:
+            break
+        added.append(best)
+        candidates.remove(best)
+
+        # Drop Steiner points of degree <= 2 (removing them costs nothing)
+        points = pins + added
+        degree = [0] * len(points)
+        for i, j in rectilinear_mst(points):
+            degree[i] += 1
+            degree[j] += 1
+        added = [p for k, p in enumerate(added) if degree[len(pins) + k] > 2]
+    return added
+
+
+def _shared(segment, lines):
+    """Length a segment shares with the drawn spans in lines {('h'|'v', fixed): [(lo, hi)]}"""
+    x1, y1, x2, y2 = segment
+    if y1 == y2:
+        spans, lo, hi = lines.get(('h', y1), ()), min(x1, x2), max(x1, x2)
+    else:
+        spans, lo, hi = lines.get(('v', x1), ()), min(y1, y2), max(y1, y2)
+    return sum(max(0.0, min(hi, b) - max(lo, a)) for a, b in spans)
+
+
+def _add(segment, lines):
+    x1, y1, x2, y2 = segment
+    if y1 == y2:
+        lines.setdefault(('h', y1), []).append((min(x1, x2), max(x1, x2)))
+    else:
+        lines.setdefault(('v', x1), []).append((min(y1, y2), max(y1, y2)))
+
+
+def _merged(lines):
+    """Yield segments for the union of the spans on each line"""
+    for (axis, fixed), spans in sorted(lines.items()):
+        spans.sort()
+        lo, hi = spans[0]
+        for a, b in spans[1:] + [(None, None)]:
+            if a is not None and a <= hi:
+                hi = max(hi, b)
+                continue
+            if hi > lo:
+                yield (lo, fixed, hi, fixed) if axis == 'h' else (fixed, lo, fixed, hi)
+            lo, hi = a, b
+
+
+def _hanan(points):
+    return [(x, y) for x in {p[0] for p in points} for y in {p[1] for p in points}]
+
+
+def _on_line(point, line, spans):
+    axis, fixed = line
+    along, across = (point[0], point[1]) if axis == 'h' else (point[1], point[0])
+    return across == fixed and any(lo <= along <= hi for lo, hi in spans)
+
+
+def _point_lines(points):
+    """{('h', y): sorted xs, ('v', x): sorted ys} of points, for _touches()"""
+    lines = {}
+    for x, y in points:
+        lines.setdefault(('h', y), []).append(x)
+        lines.setdefault(('v', x), []).append(y)
+    for values in lines.values():
+        values.sort()
+    return lines
+
+
+def _touches(leg, points):
+    """True if one of the points (as _point_lines()) lies on the leg, ends included"""
+    x1, y1, x2, y2 = leg
+    if y1 == y2:
+        values, lo, hi = points.get(('h', y1)), min(x1, x2), max(x1, x2)
+    else:
+        values, lo, hi = points.get(('v', x1)), min(y1, y2), max(y1, y2)
+    return bool(values) and bisect_left(values, lo) < bisect_right(values, hi)
+
+
+def _clean(legs, points, foreign):
+    """True if the legs touch no avoided point, share no foreign wire and have no corner on it"""
+    if any(_touches(leg, points) or _shared(leg, foreign) > 0 for leg in legs):
+        return False
+    for x, y in (leg[2:] for leg in legs[:-1]):
+        if _on_line((x, y), ('h', y), foreign.get(('h', y), ())):
+            return False
+        if _on_line((x, y), ('v', x), foreign.get(('v', x), ())):
+            return False
+    return True
+
+
+def _clean_edges(nodes, points, foreign):
+    """[(length, i, j, [legs, ...])] for every pair of nodes joined by a clean straight run or L"""
+    edges = []
+    for i, (ax, ay) in enumerate(nodes):
+        for j in range(i + 1, len(nodes)):
+            bx, by = nodes[j]
+            if ax == bx or ay == by:
+                shapes = [[(ax, ay, bx, by)]]
+            else:
+                shapes = [[(ax, ay, cx, cy), (cx, cy, bx, by)] for cx, cy in ((bx, ay), (ax, by))]
+            shapes = [legs for legs in shapes if _clean(legs, points, foreign)]
+            if shapes:
+                edges.append((abs(ax - bx) + abs(ay - by), i, j, shapes))
+    return edges
+
+
+def _forest(count, edges, keep):
+    """Kruskal over clean edges; Steiner nodes (index >= keep) left as leaves are dropped"""
+    tree = _kruskal(count, edges)
+    while True:
+        degree = [0] * count
+        for _, i, j, _ in tree:
+            degree[i] += 1
+            degree[j] += 1
+        leaves = {k for k in range(keep, count) if degree[k] == 1}
+        if not leaves:
+            return tree
+        tree = [edge for edge in tree if edge[1] not in leaves and edge[2] not in leaves]
+
+
+def route_tree(points, avoid=(), avoid_segments=(), steiner=True):
+    """
+    Wire [(x, y)] pin positions of one net as a rectilinear tree.
+
+    avoid:          (x, y) points the wire must not touch (other nets' pins)
+    avoid_segments: (x1, y1, x2, y2) wire of other nets not to touch the
+                    ends of, run along or put a corner on
+    steiner:        add Steiner points (steiner_points()) and choose each L
+                    to share as much wire as possible; otherwise a plain
+                    spanning tree with the horizontal-first L where both
+                    are clean
+    """
+    pins = list(dict.fromkeys(_key(x, y) for x, y in points))
+    pin_set = set(pins)
+    foreign = {}
+    wire_ends = []
+    for x1, y1, x2, y2 in avoid_segments:
+        (x1, y1), (x2, y2) = _key(x1, y1), _key(x2, y2)
+        if (x1 == x2) != (y1 == y2):
+            _add((x1, y1, x2, y2), foreign)
+            wire_ends += [(x1, y1), (x2, y2)]
+    avoid = [p for p in dict.fromkeys([_key(x, y) for x, y in avoid] + wire_ends) if p not in pin_set]
+    blocked = _point_lines(avoid)
+
+    nodes = pins
+    if steiner:
+        on_foreign = {p for p in _hanan(pins) if any(_on_line(p, line, spans)
+                                                     for line, spans in foreign.items())}
+        nodes = pins + steiner_points(pins, set(avoid) | on_foreign)
+
+    tree = _forest(len(nodes), _clean_edges(nodes, blocked, foreign), len(pins))
+
+    # Pins outside the largest wired piece stay unconnected
+    parent = list(range(len(nodes)))
+
+    def find(i):
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+
+    for _, i, j, _ in tree:
+        parent[find(i)] = find(j)
+    pieces = {}
+    for k in range(len(pins)):
+        pieces.setdefault(find(k), []).append(k)
+    largest = max(pieces.values(), key=len)
+    unconnected = [pins[k] for k in range(len(pins)) if k not in largest]
+
+    lines = {}
+    for _, _, _, shapes in tree:
+        if steiner and len(shapes) > 1:
+            shapes = sorted(shapes, key=lambda legs: -sum(_shared(leg, lines) for leg in legs))
+        for leg in shapes[0]:
+            _add(leg, lines)
+
+    merged = list(_merged(lines))
+
+    # Split at pins and at the ends of other segments lying on a segment's interior
+    nodes = pins + [p for s in merged for p in ((s[0], s[1]), (s[2], s[3]))]
+    nodes = list(dict.fromkeys(nodes))
+    cuts = {}
+    for n, s, where in incidences(merged, nodes):
+        if where == 'interior':
+            cuts.setdefault(s, set()).add(nodes[n])
+    segments = []
+    for s, (x1, y1, x2, y2) in enumerate(merged):
+        stops = sorted(cuts.get(s, ())) + [(x2, y2)]
+        for x, y in stops:
+            segments.append((x1, y1, x, y))
+            x1, y1 = x, y
+
+    ends = {}
+    for x1, y1, x2, y2 in segments:
+        for end in ((x1, y1), (x2, y2)):
+            ends[end] = ends.get(end, 0) + 1
+    junctions = [p for p, count in ends.items() if count + (p in pin_set) >= 3]
+    return Tree(segments, sorted(junctions), unconnected)
+
+
+def star_tree(points, grid=2.54):
+    """Wire every pin to the grid point nearest the net's centroid"""
+    center_x = round(sum(x for x, _ in points) / len(points) / grid) * grid
+    center_y = round(sum(y for _, y in points) / len(points) / grid) * grid
+
+    tree = Tree()
+    for pin_x, pin_y in points:
+        # Pin to the centre's X, then along to the centre
+        mid_x, mid_y = center_x, pin_y
+        if abs(pin_x - mid_x) > 0.01:
+            tree.segments.append((pin_x, pin_y, mid_x, mid_y))
+            if abs(mid_y - center_y) > 0.01:
+                tree.junctions.append((mid_x, mid_y))
+        if abs(mid_y - center_y) > 0.01:
+            tree.segments.append((mid_x, mid_y, center_x, center_y))
+    if len(points) > 2:
+        tree.junctions.append((center_x, center_y))
+    return tree
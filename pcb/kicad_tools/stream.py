@@ -0,0 +1,174 @@
+#!/usr/bin/env python3
+"""
+Streaming top-level element iterator for KiCad files
+
+Memory-maps the file and yields one top-level element (symbol, wire, label,
+footprint, segment, via, zone, ...) at a time as an ElementView. Only the
+element boundaries are found up front; an element is decoded or parsed into
+a Node tree when the caller asks for it, so a batch job over every
+schematic and board stays at roughly one element of memory per file.
+
+Usage:
+    python -m kicad_tools.stream wrx-power-can-hat-*.kicad_sch boards/*/*.kicad_pcb
+"""
+
+import mmap
+import re
+import sys
+from collections import Counter
+from pathlib import Path
+
+from .sexpr import SExprError, parse_all
+
+# Only parentheses and quoted strings affect nesting depth
+_STRUCTURE = re.compile(rb'[()]|"(?:[^"\\]|\\.)*"', re.DOTALL)
+_TAG = re.compile(rb'\(\s*([^\s()"]+)')
+
+# KiCad writes every top-level element on a new line indented by one tab
+_FORMATTED_START = re.compile(rb'\n\t\(')
+_STRING = re.compile(rb'"(?:[^"\\]|\\.)*"', re.DOTALL)
+
+
+class ElementView:
+    """
+    Lazily parsed view of one top-level element in a mapped file.
+
+    Valid only while the iterator that produced it is open; use .text or
+    .node to keep data beyond that.
+    """
+
+    __slots__ = ('buffer', 'tag', 'start', 'end', '_node')
+
+    def __init__(self, buffer, tag, start, end):
+        self.buffer = buffer
+        self.tag = tag
+        self.start = start
+        self.end = end
+        self._node = None
+
+    def __repr__(self):
+        return f"ElementView({self.tag!r}, span={self.start}:{self.end})"
+
+    def __len__(self):
+        return self.end - self.start
+
+    @property
+    def raw(self):
+        return bytes(self.buffer[self.start:self.end])
+
+    @property
+    def text(self):
+        return self.raw.decode('utf-8')
+
+    @property
+    def node(self):
+        """Parse this element on first access; node offsets are byte offsets in the file"""
+        if self._node is None:
+            self._node = parse_all(self.buffer, self.start, self.end, strict=False)[0]
+        return self._node
+
+
+def scan_elements(buffer, strict=True):
+    """
+    Yield (tag, start, end) for each child of the root list in a bytes-like buffer.
+
+    With strict=False an element left open at end of file is closed there.
+    """
+    depth = 0
+    start = -1
+    for m in _STRUCTURE.finditer(buffer):
+        char = buffer[m.start()]
+        if char == 0x28:  # (
+            depth += 1
+            if depth == 2:
+                start = m.start()
+        elif char == 0x29:  # )
+            depth -= 1
+            if depth == 1:
+                tag = _TAG.match(buffer, start)
+                yield (tag.group(1).decode('ascii') if tag else None), start, m.end()
+            elif depth < 0:
+                raise SExprError(f"Unexpected ')' at offset {m.start()}")
+    if depth >= 2:
+        if strict:
+            raise SExprError(f"Unclosed '(' opened at offset {start}")
+        tag = _TAG.match(buffer, start)
+        yield (tag.group(1).decode('ascii') if tag else None), start, len(buffer)
+
+
+def _balanced(buffer, start, end):
+    """True if buffer[start:end] opens and closes the same number of lists"""
+    opens = buffer.count(b'(', start, end)
+    closes = buffer.count(b')', start, end)
+    if buffer.find(b'"', start, end) == -1:
+        return opens == closes
+    # Parentheses inside quoted strings do not nest
+    strings = b''.join(_STRING.findall(buffer, start, end))
+    return opens - strings.count(b'(') == closes - strings.count(b')')
+
+
+def scan_formatted(buffer):
+    """
+    Fast path for scan_elements on files laid out the way KiCad saves them.
+
+    Splits at line starts of the form "\t(" and checks that each piece is
+    one balanced list. Returns the same (tag, start, end) list as
+    scan_elements, or None if the layout does not allow the shortcut
+    (callers then fall back to scan_elements).
+    """
+    starts = [m.start() + 2 for m in _FORMATTED_START.finditer(buffer)]
+    if not starts:
+        return None
+    root_end = buffer.rstrip().rfind(b')')
+    elements = []
+    for start, limit in zip(starts, starts[1:] + [root_end]):
+        end = start + len(buffer[start:limit].rstrip())
+        if buffer[end - 1] != 0x29 or not _balanced(buffer, start, end):
+            return None
+        tag = _TAG.match(buffer, start)
+        elements.append(((tag.group(1).decode('ascii') if tag else None), start, end))
+    return elements
+
+
+def iter_buffer(buffer, tags=None, strict=True):
+    """Yield ElementViews over an in-memory bytes buffer"""
+    for tag, start, end in scan_elements(buffer, strict=strict):
+        if tags is None or tag in tags:
+            yield ElementView(buffer, tag, start, end)
+
+
+def iter_elements(filepath, tags=None, strict=True):
+    """
+    Yield ElementViews for the top-level elements of a KiCad file.
+
+    tags: optional set of element tags to yield, e.g. {'wire', 'label'}.
+    The file stays mapped until the generator is exhausted or closed.
+    """
+    with open(filepath, 'rb') as f:
+        if f.seek(0, 2) == 0:
+            return
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            yield from iter_buffer(mm, tags=tags, strict=strict)
+
+
+def count_elements(filepath, strict=False):
+    """Return a Counter of top-level element tags without building a tree"""
+    return Counter(view.tag for view in iter_elements(filepath, strict=strict))
+
+
+def main():
+    if len(sys.argv) < 2:
+        print(__doc__)
+        return 1
+
+    for pattern in sys.argv[1:]:
+        paths = sorted(Path().glob(pattern)) if any(c in pattern for c in '*?[') else [Path(pattern)]
+        for path in paths:
+            counts = count_elements(path)
+            summary = ", ".join(f"{tag}={n}" for tag, n in counts.most_common())
+            print(f"{path}: {summary}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+"""
+UUIDs for generated KiCad elements
+
+By default every UUID is random (uuid4), as KiCad makes them. Deterministic
+mode is opt-in, with --deterministic-uuids on a generator's command line or
+KICAD_DETERMINISTIC_UUIDS=1 in the environment. In that mode each UUID is a
+uuid5 of the project namespace and the element's identity, e.g.
+('symbol', 'U1'). Re-running a generator on unchanged input then writes
+byte-identical output, which the parse cache and other content-hash
+consumers can skip.
+
+Callers that have no natural identity pass none. Their UUIDs are numbered
+in call order, which is stable as long as the generator is.
+
+Generator scripts bind one source per output project as their
+generate_uuid, and reset it at the start of each document so a second run
+in the same process numbers from zero again:
+
+    generate_uuid = UuidSource('wrx-power-can-hat-AUTO')
+    generate_uuid.reset()
+    generate_uuid('symbol', 'U1')
+    generate_uuid()
+"""
+
+import os
+import sys
+import uuid
+
+ENV_VAR = 'KICAD_DETERMINISTIC_UUIDS'
+FLAG = '--deterministic-uuids'
+
+# Root of every project namespace
+PROJECT_NAMESPACE = uuid.uuid5(uuid.NAMESPACE_URL, 'SubaruDash/pcb')
+
+
+def deterministic_requested(argv=None):
+    """True if the command line or environment asks for deterministic UUIDs"""
+    argv = sys.argv if argv is None else argv
+    return FLAG in argv or os.environ.get(ENV_VAR, '') not in ('', '0')
+
+
+class UuidSource:
+    """Callable returning UUID strings for one project (output file)"""
+
+    def __init__(self, project, deterministic=None):
+        self.namespace = uuid.uuid5(PROJECT_NAMESPACE, project)
+        self.deterministic = deterministic_requested() if deterministic is None else deterministic
+        self._seen = {}
+
+    def reset(self):
+        """Start a new document: forget the identities and call counts seen"""
+        self._seen = {}
+
+    def __call__(self, *identity):
+        if not self.deterministic:
+            return str(uuid.uuid4())
+        key = '/'.join(str(part) for part in identity)
+        # Repeated identities (and anonymous calls) are numbered in call order
+        count = self._seen.get(key, 0)
+        self._seen[key] = count + 1
+        if count or not identity:
+            key = f"{key}#{count}"
+        return str(uuid.uuid5(self.namespace, key))
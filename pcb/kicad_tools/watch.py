@@ -0,0 +1,277 @@
+#!/usr/bin/env python3
+"""
+Incremental re-parse of a KiCad file that is being edited
+
+BoardModel keeps one parsed Node per top-level element, keyed by a hash of
+the element's bytes. On refresh() only the element boundaries are rescanned;
+elements whose bytes are unchanged keep their parsed tree and index entries,
+and only added/changed elements are parsed. The reference, net and geometry
+indexes are updated from the difference, so checks re-run in milliseconds
+after each save instead of re-tokenizing the whole board.
+
+Node offsets inside an element are relative to the start of that element.
+
+Usage:
+    python -m kicad_tools.watch boards/power-hat/power-hat.kicad_pcb
+    python -m kicad_tools.watch boards/power-hat/power-hat.kicad_pcb --once
+"""
+
+import hashlib
+import os
+import sys
+import time
+from collections import defaultdict
+
+from .sexpr import parse_all
+from .stream import scan_elements, scan_formatted
+from .index import _entry_for
+
+TRACK_TAGS = ('segment', 'arc', 'via')
+
+
+class Element:
+    """One top-level element and its parsed tree"""
+
+    __slots__ = ('digest', 'tag', 'node')
+
+    def __init__(self, digest, tag, node):
+        self.digest = digest
+        self.tag = tag
+        self.node = node
+
+    def __repr__(self):
+        return f"Element({self.tag!r}, {self.digest.hex()[:8]})"
+
+
+class ChangeSet:
+    """Elements added and removed by one refresh()"""
+
+    __slots__ = ('added', 'removed', 'unchanged', 'elapsed')
+
+    def __init__(self, added, removed, unchanged, elapsed):
+        self.added = added
+        self.removed = removed
+        self.unchanged = unchanged
+        self.elapsed = elapsed
+
+    def __bool__(self):
+        return bool(self.added or self.removed)
+
+    def __repr__(self):
+        return (f"ChangeSet(+{len(self.added)} -{len(self.removed)} "
+                f"={self.unchanged}, {self.elapsed * 1000:.1f} ms)")
+
+
+def _digest(raw):
+    return hashlib.blake2b(raw, digest_size=16).digest()
+
+
+def _net_of(node):
+    """Net of a segment/via: a number in KiCad 8 files, a name in KiCad 9"""
+    net = node.find('net')
+    if net is None or len(net) < 2:
+        return None
+    return net[-1]
+
+
+class BoardModel:
+    """
+    Incrementally maintained view of a .kicad_pcb (or .kicad_sch) file.
+
+    refs:      reference -> RefEntry
+    net_names: net number -> net name (from the board's (net N "name") table)
+    net_pads:  net name -> {(reference, pad number)}
+    positions: reference -> (x, y, rotation, layer)
+    tracks:    Element -> (tag, net, layer, coordinates); net as written in the file
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.file_digest = None
+        self.elements = []
+        self.refs = {}
+        self.net_names = {}
+        self.net_pads = defaultdict(set)
+        self.positions = {}
+        self.tracks = {}
+
+    def refresh(self):
+        """Re-read the file and apply the difference; returns a ChangeSet or None"""
+        started = time.perf_counter()
+        with open(self.path, 'rb') as f:
+            buffer = f.read()
+        file_digest = _digest(buffer)
+        if file_digest == self.file_digest:
+            return None
+
+        pool = defaultdict(list)
+        for element in self.elements:
+            pool[element.digest].append(element)
+
+        elements = []
+        added = []
+        spans = scan_formatted(buffer)
+        if spans is None:
+            spans = scan_elements(buffer, strict=False)
+        for tag, start, end in spans:
+            raw = buffer[start:end]
+            digest = _digest(raw)
+            reused = pool.get(digest)
+            if reused:
+                elements.append(reused.pop())
+                continue
+            node = parse_all(raw, strict=False)[0]
+            element = Element(digest, tag, node)
+            elements.append(element)
+            added.append(element)
+
+        removed = [element for group in pool.values() for element in group]
+        forgotten = {self._forget(element) for element in removed} - {None}
+        for element in added:
+            self._learn(element)
+        # A duplicate reference is indexed once; if that one went, index the
+        # first remaining element with the same reference instead
+        orphans = forgotten - set(self.refs)
+        if orphans:
+            for element in elements:
+                if element.tag in ('footprint', 'symbol'):
+                    entry = _entry_for(element.node)
+                    if entry is not None and entry.reference in orphans:
+                        orphans.discard(entry.reference)
+                        self._learn(element)
+
+        self.elements = elements
+        self.file_digest = file_digest
+        return ChangeSet(added, removed, len(elements) - len(added),
+                         time.perf_counter() - started)
+
+    def _learn(self, element):
+        node = element.node
+        tag = element.tag
+        if tag == 'net' and len(node) > 2:
+            self.net_names[node[1]] = node[2]
+        elif tag in ('footprint', 'symbol'):
+            entry = _entry_for(node)
+            if entry is None or entry.reference in self.refs:
+                return
+            self.refs[entry.reference] = entry
+            self.positions[entry.reference] = (entry.at[0], entry.at[1], entry.rotation, entry.layer)
+            for pad in entry.pads:
+                if pad.net:
+                    self.net_pads[pad.net].add((entry.reference, pad.number))
+        elif tag in TRACK_TAGS:
+            if tag == 'via':
+                coords = node.floats('at') or ()
+            else:
+                coords = (node.floats('start') or ()) + (node.floats('end') or ())
+            self.tracks[element] = (tag, _net_of(node), node.get('layer'), coords)
+
+    def _forget(self, element):
+        """Drop an element from the indexes; returns the reference it unindexed, if any"""
+        node = element.node
+        tag = element.tag
+        if tag == 'net' and len(node) > 2:
+            if self.net_names.get(node[1]) == node[2]:
+                del self.net_names[node[1]]
+        elif tag in ('footprint', 'symbol'):
+            entry = _entry_for(node)
+            if entry is None:
+                return
+            current = self.refs.get(entry.reference)
+            if current is None or current.node is not node:
+                return
+            del self.refs[entry.reference]
+            del self.positions[entry.reference]
+            for pad in entry.pads:
+                pins = self.net_pads.get(pad.net)
+                if pins is not None:
+                    pins.discard((entry.reference, pad.number))
+                    if not pins:
+                        del self.net_pads[pad.net]
+            return entry.reference
+        elif tag in TRACK_TAGS:
+            self.tracks.pop(element, None)
+
+    def routed_nets(self):
+        """Return the set of net names that have at least one track or via"""
+        names = self.net_names
+        return {names.get(net, net) for _, net, _, _ in self.tracks.values() if net and net != '0'}
+
+    def summary(self):
+        """Return a short board report as a list of lines"""
+        layers = defaultdict(int)
+        for _, _, _, layer in self.positions.values():
+            layers[layer or '-'] += 1
+        counts = defaultdict(int)
+        for tag, _, _, _ in self.tracks.values():
+            counts[tag] += 1
+        routed = self.routed_nets()
+        multi_pin = [net for net, pins in self.net_pads.items() if len(pins) > 1]
+        unrouted = sorted(net for net in multi_pin if net not in routed)
+
+        lines = [
+            f"Components: {len(self.refs)} (" +
+            ", ".join(f"{layer} {n}" for layer, n in sorted(layers.items())) + ")",
+            f"Nets: {len(self.net_pads)} with pads, {len(routed)} routed",
+            f"Tracks: {counts['segment']} segments, {counts['arc']} arcs, {counts['via']} vias",
+        ]
+        if unrouted:
+            lines.append(f"Unrouted: {', '.join(unrouted)}")
+        return lines
+
+
+def watch(path, on_change, interval=0.5):
+    """
+    Poll a file and call on_change(model, changes) after every save.
+
+    The first call happens immediately with the initial full parse. Runs
+    until interrupted with Ctrl+C.
+    """
+    model = BoardModel(path)
+    on_change(model, model.refresh())
+    last_stat = None
+    try:
+        while True:
+            try:
+                st = os.stat(path)
+                stat_key = (st.st_mtime_ns, st.st_size)
+            except FileNotFoundError:
+                # KiCad replaces the file on save; try again next tick
+                stat_key = None
+            if stat_key is not None and stat_key != last_stat:
+                if last_stat is not None:
+                    changes = model.refresh()
+                    if changes is not None:
+                        on_change(model, changes)
+                last_stat = stat_key
+            time.sleep(interval)
+    except KeyboardInterrupt:
+        pass
+    return model
+
+
+def print_report(model, changes):
+    """Default on_change: print what changed and the board summary"""
+    print(f"\n[{time.strftime('%H:%M:%S')}] {model.path}: {changes}")
+    for line in model.summary():
+        print(f"  {line}")
+
+
+def main():
+    args = [a for a in sys.argv[1:] if not a.startswith('--')]
+    if not args:
+        print(__doc__)
+        return 1
+
+    if '--once' in sys.argv:
+        model = BoardModel(args[0])
+        print_report(model, model.refresh())
+        return 0
+
+    print(f"Watching {args[0]} (Ctrl+C to stop)")
+    watch(args[0], print_report)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
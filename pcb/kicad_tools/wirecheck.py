@@ -0,0 +1,274 @@
+#!/usr/bin/env python3
+"""
+Sweep-line short/overlap checker for axis-aligned schematic wires
+
+Finds every place where wiring of one net touches something of another:
+
+    overlap  two collinear wires share a stretch of length
+    touch    a wire end lies on another net's wire end
+    tee      a wire end lies on the interior of another net's wire
+             (KiCad connects these, with or without a junction dot)
+    pin      a wire passes through or ends on a pin of another net, or on
+             a pin that should stay unconnected
+
+With redundant=True (--redundant), collinear wires that share a stretch
+and are not known to be on different nets are listed as 'redundant'. They
+are not shorts; kicad_tools.simplify merges them.
+
+Plain crossings of a horizontal and a vertical wire do not connect in
+KiCad and are not reported.
+
+Horizontal and vertical wires are checked with two sweeps (over X and over
+Y). Each sweep keeps the active wires keyed by their fixed coordinate, so
+every wire end and pin is matched in O(log n) after sorting, and the whole
+check is O((n + p) log n + k) for n wires, p pins and k reported hits.
+Coordinates are compared after rounding to KiCad's 0.1 um resolution.
+
+A wire's net is whatever the caller knows: the auto-wire scripts pass the
+net each wire was generated for. For an existing file (check_file) nets
+come from labels sitting on a wire end, and wires without one are "?".
+
+    python -m kicad_tools.wirecheck wrx-power-can-hat-PINTOPIN.kicad_sch [--redundant]
+"""
+
+import sys
+from collections import namedtuple
+
+PRECISION = 4
+
+# One wire: end points and the net it was drawn for (None = unknown)
+Segment = namedtuple('Segment', 'x1 y1 x2 y2 net')
+
+# One pin or other connection point that wires must not hit unless nets match
+# (net '' = must stay unconnected, None = unknown)
+Point = namedtuple('Point', 'x y net name')
+
+# One problem: kind, where, the nets involved and what was hit
+Finding = namedtuple('Finding', 'kind x y nets items')
+
+KINDS = ('overlap', 'touch', 'tee', 'pin', 'redundant')
+
+
+def _key(value):
+    return round(value, PRECISION)
+
+
+def _conflict(a, b):
+    """True if nets a and b are known to differ (None = unknown never conflicts)"""
+    return a is not None and b is not None and a != b
+
+
+def incidences(segments, points):
+    """
+    Match points against axis-aligned segments with two sweeps.
+
+    segments: [(x1, y1, x2, y2)], points: [(x, y)]. Yields
+    (point index, segment index, 'end' | 'interior') for every point lying
+    on a segment (ends included). Diagonal and zero-length segments are
+    skipped.
+    """
+    horizontal, vertical = [], []
+    for i, (x1, y1, x2, y2) in enumerate(segments):
+        x1, y1, x2, y2 = _key(x1), _key(y1), _key(x2), _key(y2)
+        if y1 == y2 and x1 != x2:
+            horizontal.append((y1, min(x1, x2), max(x1, x2), i))
+        elif x1 == x2 and y1 != y2:
+            vertical.append((x1, min(y1, y2), max(y1, y2), i))
+    keyed = [(_key(x), _key(y), i) for i, (x, y) in enumerate(points)]
+
+    # Sweep over X for horizontal wires, over Y (coordinates swapped) for vertical
+    yield from _sweep(horizontal, keyed)
+    yield from _sweep(vertical, [(y, x, i) for x, y, i in keyed])
+
+
+def _sweep(lines, points):
+    # Event order at equal sweep position: add (0), query (1), remove (2),
+    # so points on either end are still matched
+    events = []
+    for fixed, lo, hi, i in lines:
+        events.append((lo, 0, fixed, i, hi))
+        events.append((hi, 2, fixed, i, lo))
+    for along, fixed, i in points:
+        events.append((along, 1, fixed, i, None))
+    events.sort(key=lambda e: (e[0], e[1]))
+
+    active = {}
+    for along, kind, fixed, i, other in events:
+        if kind == 0:
+            active.setdefault(fixed, {})[i] = (along, other)
+        elif kind == 2:
+            group = active.get(fixed)
+            if group is not None:
+                group.pop(i, None)
+                if not group:
+                    del active[fixed]
+        else:
+            for segment, (lo, hi) in active.get(fixed, {}).items():
+                yield i, segment, ('end' if along in (lo, hi) else 'interior')
+
+
+def overlaps(segments):
+    """
+    Yield (i, j, (x, y)) for every pair of collinear segments sharing a
+    stretch of positive length; (x, y) is where the shared stretch starts.
+    """
+    lines = {}
+    for i, (x1, y1, x2, y2) in enumerate(segments):
+        x1, y1, x2, y2 = _key(x1), _key(y1), _key(x2), _key(y2)
+        if y1 == y2 and x1 != x2:
+            lines.setdefault(('h', y1), []).append((min(x1, x2), max(x1, x2), i))
+        elif x1 == x2 and y1 != y2:
+            lines.setdefault(('v', x1), []).append((min(y1, y2), max(y1, y2), i))
+
+    for (axis, fixed), spans in lines.items():
+        if len(spans) < 2:
+            continue
+        spans.sort()
+        active = []  # (hi, i) of spans that may still overlap
+        for lo, hi, i in spans:
+            active = [(a_hi, j) for a_hi, j in active if a_hi > lo]
+            for _, j in active:
+                yield (j, i, (lo, fixed) if axis == 'h' else (fixed, lo))
+            active.append((hi, i))
+
+
+def check_wires(segments, pins=(), redundant=False):
+    """
+    Check Segments (and optional Points such as pins) for cross-net contacts.
+
+    With redundant=True, same-net or unknown-net overlaps are included as
+    'redundant' findings. Returns [Finding], sorted by kind and position.
+    """
+    segments = list(segments)
+    pins = list(pins)
+    findings = []
+
+    for i, j, (x, y) in overlaps([s[:4] for s in segments]):
+        a, b = segments[i].net, segments[j].net
+        if _conflict(a, b):
+            findings.append(Finding('overlap', x, y, (a, b), (i, j)))
+        elif redundant:
+            findings.append(Finding('redundant', x, y, (a, b), (i, j)))
+
+    # Every wire end is a query point, followed by the pins
+    ends = []
+    for i, s in enumerate(segments):
+        ends.append((s.x1, s.y1, i))
+        ends.append((s.x2, s.y2, i))
+    queries = [(x, y) for x, y, _ in ends] + [(p.x, p.y) for p in pins]
+
+    seen = set()
+    for q, segment, where in incidences([s[:4] for s in segments], queries):
+        target = segments[segment]
+        if q < len(ends):
+            x, y, owner = ends[q]
+            if owner == segment:
+                continue
+            net = segments[owner].net
+            if not _conflict(net, target.net):
+                continue
+            kind = 'touch' if where == 'end' else 'tee'
+            pair = (kind, min(owner, segment), max(owner, segment), _key(x), _key(y))
+            if pair in seen:
+                continue
+            seen.add(pair)
+            findings.append(Finding(kind, x, y, (net, target.net), (owner, segment)))
+        else:
+            pin = pins[q - len(ends)]
+            if pin.net == '' or _conflict(pin.net, target.net):
+                findings.append(Finding('pin', pin.x, pin.y, (target.net, pin.net or None),
+                                        (segment, pin.name)))
+
+    findings.sort(key=lambda f: (KINDS.index(f.kind), _key(f.y), _key(f.x)))
+    return findings
+
+
+def pin_points(placed, connections):
+    """
+    Points for every placed pin: net from a {reference: {pin: net}} table;
+    pins of listed references that are not in the table must stay
+    unconnected (''), pins of other references are unknown (None).
+    """
+    points = []
+    for pin in placed:
+        pin_map = connections.get(pin.reference)
+        if pin_map is None:
+            net = None
+        else:
+            net = pin_map.get(pin.number, '')
+        points.append(Point(pin.x, pin.y, net, f"{pin.reference} pin {pin.number}"))
+    return points
+
+
+def format_findings(findings, limit=20):
+    """Return report lines (at most `limit` findings, then a count of the rest)"""
+    lines = []
+    for f in findings[:limit]:
+        nets = " / ".join(n if n is not None else "?" for n in f.nets)
+        detail = f" ({f.items[1]})" if f.kind == 'pin' else ""
+        lines.append(f"{f.kind:8} at ({f.x:.2f}, {f.y:.2f})  {nets}{detail}")
+    if len(findings) > limit:
+        lines.append(f"... and {len(findings) - limit} more")
+    return lines
+
+
+def report(findings, label="wires"):
+    """Print a short summary of a check; returns the number of problems"""
+    problems = [f for f in findings if f.kind != 'redundant']
+    duplicates = len(findings) - len(problems)
+    if not problems:
+        print(f"[OK] Wire check: no shorts or overlaps in {label}")
+    else:
+        counts = {}
+        for f in problems:
+            counts[f.kind] = counts.get(f.kind, 0) + 1
+        print(f"[WARNING] Wire check: {len(problems)} problem(s) in {label}: " +
+              ", ".join(f"{counts[k]} {k}" for k in KINDS if k in counts))
+    if duplicates:
+        print(f"[INFO] {duplicates} redundant overlap(s) of one net (kicad_tools.simplify merges them)")
+    for line in format_findings(findings):
+        print(f"  {line}")
+    return len(problems)
+
+
+def check_file(filepath, connections=None, redundant=False):
+    """
+    Check the wires of an existing .kicad_sch.
+
+    Wire nets come from labels sitting on a wire end. With a
+    {reference: {pin: net}} table, placed pins are checked as well.
+    Returns [Finding].
+    """
+    from .cache import load_cached
+    from .model import SchematicModel
+    from .pins import place_pins
+
+    root = load_cached(filepath, strict=False).root
+    model = SchematicModel.from_root(root)
+    label_nets = {}
+    for label in model.labels:
+        label_nets.setdefault((_key(label.x), _key(label.y)), label.name)
+
+    segments = []
+    for wire in model.wires:
+        net = (label_nets.get((_key(wire.x1), _key(wire.y1))) or
+               label_nets.get((_key(wire.x2), _key(wire.y2))))
+        segments.append(Segment(wire.x1, wire.y1, wire.x2, wire.y2, net))
+
+    pins = pin_points(place_pins(model), connections) if connections else ()
+    return check_wires(segments, pins, redundant)
+
+
+def main():
+    args = [a for a in sys.argv[1:] if not a.startswith('--')]
+    if not args:
+        print(__doc__)
+        return 1
+    problems = 0
+    for path in args:
+        problems += report(check_file(path, redundant='--redundant' in sys.argv), path)
+    return 1 if problems else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
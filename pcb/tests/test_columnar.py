@@ -0,0 +1,53 @@
+#!/usr/bin/env python3
+"""
+Regression tests for kicad_tools.columnar
+
+Run from pcb/:
+    python -m unittest discover tests
+"""
+
+import math
+import os
+import tempfile
+import unittest
+
+from kicad_tools.columnar import INT_NULL, ColumnarFile, write_tables
+
+
+class ColumnarTest(unittest.TestCase):
+
+    def setUp(self):
+        fd, self.path = tempfile.mkstemp(suffix='.kcol')
+        os.close(fd)
+        write_tables(self.path, {'components': {
+            'reference': ['R1', 'C1', None],
+            'x': [1.0, 2.5, None],
+            'unit': [1, None, 3],
+        }})
+
+    def tearDown(self):
+        os.unlink(self.path)
+
+    def test_close_with_slice_held(self):
+        f = ColumnarFile(self.path)
+        x = f['components']['x']
+        head = x[0:2]
+        f.close()
+        self.assertEqual(list(head), [1.0, 2.5])
+        del x, head
+
+    def test_numeric_nulls_keep_type(self):
+        with ColumnarFile(self.path) as f:
+            specs = f['components'].specs
+            self.assertEqual(specs['x']['type'], 'd')
+            self.assertEqual(specs['unit']['type'], 'i')
+            self.assertTrue(math.isnan(f['components']['x'][2]))
+            self.assertEqual(f['components']['unit'][1], INT_NULL)
+            rows = list(f.rows('components'))
+        self.assertEqual([row['unit'] for row in rows], [1, None, 3])
+        self.assertEqual([row['x'] for row in rows], [1.0, 2.5, None])
+        self.assertEqual(rows[2]['reference'], None)
+
+
+if __name__ == '__main__':
+    unittest.main()